@@ -0,0 +1,322 @@
+"""
+Batch resume generation for many job descriptions.
+
+Job descriptions come from the tracker's MongoDB (filtered by status and/or job
+IDs) or from an NDJSON file with one {"id": ..., "description": ...} object per
+line. Resumes are generated in parallel; model calls across the whole batch
+share a token-bucket rate limit, and concurrent latexmk builds are capped at the
+CPU count. Every finished job is appended to a state file, so re-running the
+same command after a crash skips what is already done. With --write-back each
+resume is stored on its job as soon as it is done, and the state file records
+that too: a re-run first writes back any finished job a crash left out.
+
+    python batch.py --ndjson jobs.ndjson
+    python batch.py --mongo --status Applied --status Interview --workers 6 --rate 0.5
+    python batch.py --mongo --id 665f... --id 6660... --write-back
+
+Prints a throughput summary at the end: resumes per minute and p50/p95 per stage.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import generate
+from llm import RateLimitedLLMClient, TokenBucket
+
+DEFAULT_STATE_FILE = "batch_state.jsonl"
+# Stages reported in the summary, in pipeline order
+SUMMARY_STAGES = ["rank", "llm", "llm_skills", "llm_experience", "llm_projects", "compile_queue", "compile", "total"]
+
+
+def load_ndjson_jobs(path):
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            description = item.get("description")
+            if not description:
+                print(f"Warning: line {line_number} of {path} has no description, skipping it.")
+                continue
+            jobs.append({"id": str(item.get("id") or item.get("_id") or line_number), "description": description})
+    return jobs
+
+
+def _add_app_dir_to_path():
+    """Makes the API's modules (app/) importable."""
+    app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if app_dir not in sys.path:
+        sys.path.append(app_dir)
+
+
+def load_mongo_jobs(statuses=None, ids=None):
+    from bson import ObjectId
+    from pymongo import MongoClient
+
+    # The API's descriptions.py decodes the side collection the descriptions are stored in
+    _add_app_dir_to_path()
+    from descriptions import decode_description
+
+    # Jobs still carrying an inline description (not yet migrated) match the second clause
+    query = {"$or": [{"description_size": {"$gt": 0}}, {"description": {"$nin": [None, ""]}}]}
+    if statuses:
+        query["status"] = {"$in": statuses}
+    if ids:
+        query["_id"] = {"$in": [ObjectId(job_id) for job_id in ids]}
+    client = MongoClient(os.getenv("DATABASE_URL", "mongodb://localhost:27017/job_tracker"))
+    try:
+        db = client[os.getenv("MONGO_DB_NAME", "job_tracker")]
+        jobs = list(db["jobs"].find(query, {"description": 1}).sort("_id", 1))
+        stored = {
+            doc["_id"]: decode_description(doc)
+            for doc in db["job_descriptions"].find({"_id": {"$in": [job["_id"] for job in jobs if "description" not in job]}})
+        }
+        return [
+            {"id": str(job["_id"]), "description": job["description"] if "description" in job else stored.get(job["_id"], "")}
+            for job in jobs
+        ]
+    finally:
+        client.close()
+
+
+class ResumeWriteBack:
+    """
+    Moves each generated PDF into the API's artifact store and points its job at
+    the stored copy, as the API's background queue does; the API only serves
+    resumes from the store. Jobs are written one at a time as they finish, and
+    each write is journaled in `state` ("written_back"), so none is lost to a crash.
+    """
+
+    def __init__(self, state):
+        from pymongo import MongoClient
+
+        _add_app_dir_to_path()
+        import artifacts
+
+        self.state = state
+        self._artifacts = artifacts
+        self._client = MongoClient(os.getenv("DATABASE_URL", "mongodb://localhost:27017/job_tracker"))
+        self._jobs = self._client[os.getenv("MONGO_DB_NAME", "job_tracker")]["jobs"]
+
+    def write(self, record):
+        """Stores one finished job's resume. Returns whether the job was updated."""
+        from datetime import datetime
+
+        from bson import ObjectId
+
+        if record["status"] != "done" or record.get("written_back") or not ObjectId.is_valid(record["id"]):
+            return False
+        try:
+            artifact = self._artifacts.store_pdf(record["pdf_path"])
+        except FileNotFoundError:
+            print(f"Warning: {record['pdf_path']} no longer exists, not writing it back to job {record['id']}.")
+            return False
+        self._jobs.update_one(
+            {"_id": ObjectId(record["id"])}, {"$set": {"resume_path": artifact["path"], "updated_at": datetime.utcnow()}}
+        )
+        self.state.record({**record, "pdf_path": artifact["path"], "written_back": True})
+        # Last, so a crash before this point leaves the build PDF for the re-run to store
+        if record.get("output_folder"):
+            self._artifacts.prune_build_outputs(record["output_folder"])
+        return True
+
+    def replay(self):
+        """Writes back the jobs the journal has done but not yet written back. Returns how many."""
+        return sum(self.write(record) for record in list(self.state.records.values()))
+
+    def close(self):
+        self._client.close()
+
+
+class BatchState:
+    """
+    Append-only NDJSON journal of finished jobs. Each record is flushed and fsynced
+    as soon as its job finishes; a torn last line from a crash is ignored on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.records[record["id"]] = record
+
+    def is_done(self, job_id):
+        record = self.records.get(job_id)
+        return record is not None and record["status"] == "done"
+
+    def record(self, record):
+        with self.lock:
+            self.records[record["id"]] = record
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(results, elapsed):
+    done = [r for r in results if r["status"] == "done"]
+    failed = [r for r in results if r["status"] == "failed"]
+    lines = [
+        f"Resumes: {len(done)} done, {len(failed)} failed in {elapsed:.1f}s "
+        f"({len(done) / elapsed * 60 if elapsed > 0 else 0.0:.2f} resumes/min)",
+        f"{'stage':<16}{'p50 (s)':>10}{'p95 (s)':>10}",
+    ]
+    reports = [r["prompt_tokens"] for r in done if r.get("prompt_tokens")]
+    if reports:
+        before = sum(section["tokens_before"] for report in reports for section in report.values())
+        after = sum(section["tokens_after"] for report in reports for section in report.values())
+        lines.insert(1, f"Prompt data: ~{before} -> ~{after} tokens across the batch ({(1 - after / before) * 100 if before else 0.0:.0f}% saved)")
+    for stage in SUMMARY_STAGES:
+        values = [r["timings"][stage] for r in done if stage in r.get("timings", {})]
+        if values:
+            lines.append(f"{stage:<16}{percentile(values, 0.50):>10.2f}{percentile(values, 0.95):>10.2f}")
+    return "\n".join(lines)
+
+
+def run_batch(jobs, knowledge_bank_path, base_resume_path, output_base_folder, llm_client, state,
+              workers=4, latex_concurrency=None, on_done=None):
+    """
+    Generates a resume for every job not already marked done in `state`. Returns the
+    results of this run (one dict per attempted job) and the wall-clock time taken.
+    `on_done(record)` is called for every job done, right after it is journaled.
+    """
+    pending = [job for job in jobs if not state.is_done(job["id"])]
+    skipped = len(jobs) - len(pending)
+    if skipped:
+        print(f"Skipping {skipped} jobs already done according to {state.path}")
+
+    compile_lock = threading.BoundedSemaphore(latex_concurrency or os.cpu_count() or 1)
+    # Every worker thread gets its own warm build directory, so concurrent builds never share one
+    slots = threading.local()
+    slot_counter = iter(range(workers))
+    slot_lock = threading.Lock()
+
+    def build_slot():
+        if not hasattr(slots, "slot"):
+            with slot_lock:
+                slots.slot = next(slot_counter)
+        return slots.slot
+
+    def run(job):
+        try:
+            result = generate.generate_custom_resume_from_knowledge_bank(
+                job["description"],
+                knowledge_bank_path=knowledge_bank_path,
+                base_resume_path=base_resume_path,
+                output_base_folder=output_base_folder,
+                llm_client=llm_client,
+                compile_lock=compile_lock,
+                build_slot=build_slot(),
+            )
+        except Exception as e:
+            return {"id": job["id"], "status": "failed", "error": str(e)}
+        if result is None:
+            return {"id": job["id"], "status": "failed", "error": "could not load knowledge bank"}
+        record = {
+            "id": job["id"],
+            "status": "done" if result["pdf_path"] else "failed",
+            "output_folder": result["output_folder"],
+            "pdf_path": result["pdf_path"],
+            "sections": result["sections"],
+            "timings": result["timings"],
+            "prompt_tokens": result["prompt_tokens"],
+        }
+        if not result["pdf_path"]:
+            record["error"] = "LaTeX compilation failed"
+        return record
+
+    results = []
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run, job) for job in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            state.record(record)
+            results.append(record)
+            print(f"[{len(results)}/{len(pending)}] {record['id']}: {record['status']}")
+            if on_done and record["status"] == "done":
+                try:
+                    on_done(record)
+                except Exception as e:
+                    # Still journaled as done, so the next run retries it
+                    print(f"Warning: could not write back job {record['id']}, the next run will retry: {e}")
+    return results, time.monotonic() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ndjson", metavar="PATH", help="read job descriptions from an NDJSON file")
+    source.add_argument("--mongo", action="store_true", help="read job descriptions from the tracker's MongoDB")
+    parser.add_argument("--status", action="append", help="with --mongo, only jobs with this status (repeatable)")
+    parser.add_argument("--id", action="append", dest="ids", help="with --mongo, only this job ID (repeatable)")
+    parser.add_argument("--write-back", action="store_true", help="with --mongo, store resume_path on each job")
+    parser.add_argument("--knowledge-bank", default="knowledge_bank.json")
+    parser.add_argument("--templates", default=".", help="directory with the LaTeX templates")
+    parser.add_argument("--output", default="generated_resumes")
+    parser.add_argument("--state", default=DEFAULT_STATE_FILE, help="journal of finished jobs, used to resume")
+    parser.add_argument("--workers", type=int, default=4, help="resumes generated in parallel")
+    parser.add_argument("--rate", type=float, default=1.0, help="model calls per second across the batch")
+    parser.add_argument("--burst", type=float, default=None, help="model calls allowed in a burst (default: max(1, rate))")
+    parser.add_argument("--latex-concurrency", type=int, default=None, help="concurrent latexmk builds (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.ndjson:
+        jobs = load_ndjson_jobs(args.ndjson)
+    else:
+        jobs = load_mongo_jobs(statuses=args.status, ids=args.ids)
+    print(f"Loaded {len(jobs)} job descriptions")
+
+    try:
+        llm_client = generate.get_default_llm_client()
+    except RuntimeError:
+        print("Error: GOOGLE_API_KEY environment variable not set.")
+        exit(1)
+    llm_client = RateLimitedLLMClient(llm_client, TokenBucket(args.rate, args.burst))
+
+    state = BatchState(args.state)
+    write_back = ResumeWriteBack(state) if args.mongo and args.write_back else None
+    try:
+        if write_back:
+            replayed = write_back.replay()
+            if replayed:
+                print(f"Wrote back {replayed} resumes an earlier run had finished")
+        results, elapsed = run_batch(
+            jobs,
+            knowledge_bank_path=args.knowledge_bank,
+            base_resume_path=args.templates,
+            output_base_folder=args.output,
+            llm_client=llm_client,
+            state=state,
+            workers=args.workers,
+            latex_concurrency=args.latex_concurrency,
+            on_done=write_back.write if write_back else None,
+        )
+    finally:
+        if write_back:
+            write_back.close()
+    print(summarize(results, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,71 @@
-import google.generativeai as genai
 import os
 import json
+import random
 import re
-import subprocess
 import datetime
-import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from llm import GeminiClient
+from llm_cache import CachingLLMClient, LLMCache
+from latex_build import LatexBuildEngine
+from latex_validator import LatexValidator
+from ranking import compact_json, format_report, get_default_ranker
+from snapshot import SECTION_FILES, knowledge_banks, materialize_templates, template_texts, write_file_atomic
 
 # --- Configuration ---
-# IMPORTANT: Replace with your actual API key or set it as an environment variable
-# genai.configure(api_key="YOUR_GEMINI_API_KEY")
-# Or better, set it as an environment variable:
+# Set your Gemini API key as an environment variable:
 # export GOOGLE_API_KEY="YOUR_GEMINI_API_KEY"
-
-# Ensure API key is set
-try:
-    genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-except KeyError:
-    print("Error: GOOGLE_API_KEY environment variable not set.")
-    print("Please set it before running the script (e.g., export GOOGLE_API_KEY='your_key_here').")
-    exit(1)
+# Any other LLMClient (e.g. llm.FakeLLMClient for local testing) can be passed as `llm_client`.
+
+# Budget for one section, across all of its retries
+SECTION_TIMEOUT = float(os.getenv("RESUME_SECTION_TIMEOUT", "120"))
+# Extra attempts after the first one fails or comes back empty
+SECTION_RETRIES = int(os.getenv("RESUME_SECTION_RETRIES", "2"))
+# Base delay for exponential backoff between attempts, in seconds
+SECTION_RETRY_BACKOFF = float(os.getenv("RESUME_SECTION_RETRY_BACKOFF", "1.0"))
+# Set to 0 to always call the model instead of reusing cached section outputs (see llm_cache.py)
+USE_LLM_CACHE = os.getenv("RESUME_LLM_CACHE", "1") == "1"
+# Set to 0 to send whole knowledge-bank sections instead of the top-ranked entries (see ranking.py)
+USE_RANKING = os.getenv("RESUME_RANKING", "1") == "1"
+# Set to 0 to skip checking sections before compiling (see latex_validator.py)
+VALIDATE_SECTIONS = os.getenv("RESUME_VALIDATE", "1") == "1"
+# Re-requests allowed per section for output that fails validation, on top of SECTION_RETRIES
+VALIDATION_RETRIES = int(os.getenv("RESUME_VALIDATION_RETRIES", "1"))
+
+_default_llm_client = None
+# Shared by every resume this process generates, so its running byte total is kept
+# instead of rescanning the cache directory for each resume
+_default_llm_cache = None
+_default_llm_cache_lock = threading.Lock()
+
+def get_default_llm_client():
+    """The Gemini client, created on first use so importing this module needs no API key."""
+    global _default_llm_client
+    if _default_llm_client is None:
+        _default_llm_client = GeminiClient()
+    return _default_llm_client
+
+
+def get_default_llm_cache():
+    """The process-wide LLMCache (batch.py generates resumes from several threads)."""
+    global _default_llm_cache
+    with _default_llm_cache_lock:
+        if _default_llm_cache is None:
+            _default_llm_cache = LLMCache()
+        return _default_llm_cache
 
 
 # --- Helper Functions ---
 
 def load_knowledge_bank(file_path="knowledge_bank.json"):
-    """Loads the structured resume data directly from a JSON file."""
+    """
+    Loads the structured resume data directly from a JSON file. The parsed bank is
+    cached per process until the file changes, so treat it as read-only.
+    """
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = knowledge_banks.get(file_path)
         print(f"Knowledge bank loaded from {file_path}")
         return data
     except FileNotFoundError:
@@ -40,8 +78,7 @@ def load_knowledge_bank(file_path="knowledge_bank.json"):
 def read_original_latex_section(file_path):
     """Reads the raw content of an original LaTeX section file for example purposes."""
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
+        content = template_texts.get(file_path)
         # Escape any triple quotes within the content to prevent f-string issues
         content = content.replace('"""', '\\"\\"\\"')
         return content
@@ -49,53 +86,76 @@ def read_original_latex_section(file_path):
         return "" # Return empty string instead of printing warning if file just doesn't exist
 
 def write_latex_section(file_path, content):
-    """Writes content back to a LaTeX file."""
-    with open(file_path, 'w') as f:
-        f.write(content)
+    """Writes content back to a LaTeX file, replacing it rather than writing through a hardlink."""
+    write_file_atomic(file_path, content)
+
+_build_engine = None
 
-def compile_latex_to_pdf(output_folder):
-    """Compiles the LaTeX document to PDF using latexmk."""
+def get_build_engine():
+    """Shared build engine, so the precompiled preamble and warm build directory are reused."""
+    global _build_engine
+    if _build_engine is None:
+        _build_engine = LatexBuildEngine()
+    return _build_engine
+
+def compile_latex_to_pdf(output_folder, build_engine=None, slot=0):
+    """
+    Compiles the LaTeX document to PDF with the incremental build engine (see latex_build.py).
+    Returns the engine's result dict: ok, skipped, pdf_path and per-stage timings.
+    """
+    build_engine = build_engine or get_build_engine()
     try:
         print(f"Attempting to compile LaTeX in {output_folder} from resume.tex...")
-        # Clean up auxiliary files first for a clean build
-        subprocess.run(['latexmk', '-c'], cwd=output_folder, check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        # Compile using latexmk for robustness
-        result = subprocess.run(['latexmk', '-pdf', 'resume.tex'], cwd=output_folder, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print(f"Resume generated successfully: {output_folder}/resume.pdf")
-            return True
-        else:
-            print(f"Error compiling LaTeX (return code {result.returncode}) in {output_folder}:")
-            print("STDOUT:\n", result.stdout)
-            print("STDERR:\n", result.stderr)
-            print("Please ensure LaTeX distribution (e.g., TeX Live, MiKTeX) and latexmk are installed and in your PATH.")
-            return False
-    except FileNotFoundError:
-        print("latexmk command not found. Please install LaTeX and ensure latexmk is in your system's PATH.")
-        return False
+        result = build_engine.compile(output_folder, slot=slot)
     except Exception as e:
         print(f"An unexpected error occurred during LaTeX compilation: {e}")
-        return False
+        return {"ok": False, "skipped": False, "pdf_path": None, "timings": {}, "log": str(e)}
+
+    stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result["timings"].items())
+    if result["ok"]:
+        print(f"Resume generated successfully: {output_folder}/resume.pdf ({stages})")
+    elif result["log"] == "latexmk command not found":
+        print("latexmk command not found. Please install LaTeX and ensure latexmk is in your system's PATH.")
+    else:
+        print(f"Error compiling LaTeX in {output_folder} ({stages}):")
+        print(result["log"])
+        print("Please ensure LaTeX distribution (e.g., TeX Live, MiKTeX) and latexmk are installed and in your PATH.")
+    return result
 
 # --- Gemini Interaction Functions ---
 
-def get_gemini_response(prompt_text, model_name="gemini-1.5-flash", temperature=0.4):
-    """Sends a prompt to the Gemini API and returns the response text."""
+def get_gemini_response(prompt_text, model_name="gemini-1.5-flash", temperature=0.4, llm_client=None, timeout=None):
+    """Sends a prompt to the LLM (Gemini by default) and returns the response text."""
     try:
-        model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt_text, generation_config=genai.types.GenerationConfig(temperature=temperature))
-        return response.text
+        client = llm_client or get_default_llm_client()
+        return client.generate(prompt_text, model_name=model_name, temperature=temperature, timeout=timeout)
     except Exception as e:
         print(f"Error calling Gemini API: {e}")
         return ""
 
-def generate_skills_section_with_gemini(structured_skills_data, job_description, example_latex):
+def with_feedback(prompt, feedback):
+    """Adds the validator's errors from a previous attempt just above the output marker."""
+    if not feedback:
+        return prompt
+    marker = prompt.rfind("---OUTPUT NEW")
+    errors = "\n".join(f"    - {error}" for error in feedback)
+    block = f"---YOUR PREVIOUS OUTPUT HAD THESE LATEX ERRORS, FIX THEM---\n{errors}\n\n    "
+    return prompt[:marker] + block + prompt[marker:]
+
+def clean_gemini_output(text):
+    """Strips the markdown code fence Gemini often wraps LaTeX in."""
+    # This regex looks for an optional language specifier (like 'latex') after the first ```
+    match = re.search(r"```(?:[a-zA-Z0-9_+\-]+)?\s*(.*?)\s*```", text, re.DOTALL)
+    if match:
+        return match.group(1).strip()
+    return text.strip()
+
+def generate_skills_section_with_gemini(structured_skills_data, job_description, example_latex, llm_client=None, timeout=None, feedback=None):
     """
     Uses Gemini to generate a tailored skills section from structured data,
     providing an example of the desired LaTeX output.
     """
-    skills_json = json.dumps(structured_skills_data, indent=2)
+    skills_json = compact_json(structured_skills_data)
     
     # Corrected escaping for f-string literal backslashes
     prompt = f"""
@@ -134,14 +194,14 @@ def generate_skills_section_with_gemini(structured_skills_data, job_description,
     ---OUTPUT NEW SKILLS SECTION (LATEX ONLY)---
     """
     print("Generating skills section with Gemini...")
-    return get_gemini_response(prompt)
+    return get_gemini_response(with_feedback(prompt, feedback), llm_client=llm_client, timeout=timeout)
 
-def generate_experience_section_with_gemini(structured_experience_data, job_description, example_latex):
+def generate_experience_section_with_gemini(structured_experience_data, job_description, example_latex, llm_client=None, timeout=None, feedback=None):
     """
     Uses Gemini to generate a tailored experience section from structured data,
     providing an example of the desired LaTeX output.
     """
-    experience_json = json.dumps(structured_experience_data, indent=2)
+    experience_json = compact_json(structured_experience_data)
 
     # Corrected escaping for f-string literal backslashes
     prompt = f"""
@@ -181,14 +241,14 @@ def generate_experience_section_with_gemini(structured_experience_data, job_desc
     ---OUTPUT NEW EXPERIENCE SECTION (LATEX ONLY)---
     """
     print("Generating experience section with Gemini...")
-    return get_gemini_response(prompt)
+    return get_gemini_response(with_feedback(prompt, feedback), llm_client=llm_client, timeout=timeout)
 
-def generate_projects_section_with_gemini(structured_projects_data, job_description, example_latex):
+def generate_projects_section_with_gemini(structured_projects_data, job_description, example_latex, llm_client=None, timeout=None, feedback=None):
     """
     Uses Gemini to generate a tailored projects section from structured data,
     providing an example of the desired LaTeX output.
     """
-    projects_json = json.dumps(structured_projects_data, indent=2)
+    projects_json = compact_json(structured_projects_data)
 
     # Corrected escaping for f-string literal backslashes
     prompt = f"""
@@ -226,91 +286,222 @@ def generate_projects_section_with_gemini(structured_projects_data, job_descript
     ---OUTPUT NEW PROJECTS SECTION (LATEX ONLY)---
     """
     print("Generating projects section with Gemini...")
-    return get_gemini_response(prompt)
+    return get_gemini_response(with_feedback(prompt, feedback), llm_client=llm_client, timeout=timeout)
+
+
+# --- Concurrent Section Generation ---
 
+def generate_section_with_retry(section, generate_fn, args, llm_client, deadline, retries=SECTION_RETRIES, backoff=SECTION_RETRY_BACKOFF, validator=None, validation_retries=VALIDATION_RETRIES):
+    """
+    Calls one section generator until it returns non-empty LaTeX, backing off
+    exponentially (with jitter) between attempts. Returns None when the attempts
+    or the time until `deadline` run out.
+
+    With a validator, trivial escaping mistakes are fixed in place; output with
+    structural errors is re-requested right away with the errors added to the
+    prompt, at most validation_retries times, before giving up on the section.
+    """
+    attempt = 0
+    feedback = None
+    invalid = 0
+    while attempt <= retries:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        latex = clean_gemini_output(generate_fn(*args, llm_client=llm_client, timeout=remaining, feedback=feedback))
+        if latex and validator is not None:
+            result = validator.validate(latex)
+            if result.fixes:
+                print(f"Fixed {section} section: {'; '.join(result.fixes)}")
+            if result.ok:
+                return result.text
+            print(f"Generated {section} section is invalid LaTeX: {'; '.join(result.errors)}")
+            invalid += 1
+            if invalid > validation_retries:
+                return None
+            feedback = result.errors
+            continue
+        if latex:
+            return latex
+        if attempt < retries:
+            delay = min(backoff * (2 ** attempt) * random.uniform(0.5, 1.5), max(0, deadline - time.monotonic()))
+            print(f"Attempt {attempt + 1} for {section} section failed, retrying in {delay:.1f}s...")
+            time.sleep(delay)
+        attempt += 1
+    return None
+
+def generate_sections_concurrently(section_requests, llm_client=None, timeout=SECTION_TIMEOUT, retries=SECTION_RETRIES, backoff=SECTION_RETRY_BACKOFF, validator=None):
+    """
+    Runs the independent section prompts in parallel so end-to-end latency is the
+    slowest section rather than the sum of all three.
 
-def generate_custom_resume_from_knowledge_bank(job_description, knowledge_bank_path="knowledge_bank.json", base_resume_path=".", output_base_folder="generated_resumes"):
+    section_requests maps a section name to (generator function, positional args).
+    Returns ({section: cleaned LaTeX or None if it failed/timed out}, {section: seconds}).
+    """
+    llm_client = llm_client or get_default_llm_client()
+    start = time.monotonic()
+    deadline = start + timeout
+    results, timings = {}, {}
+
+    def run(section, generate_fn, args):
+        section_start = time.monotonic()
+        try:
+            return generate_section_with_retry(section, generate_fn, args, llm_client, deadline, retries, backoff, validator=validator)
+        finally:
+            timings[section] = time.monotonic() - section_start
+
+    pool = ThreadPoolExecutor(max_workers=len(section_requests), thread_name_prefix="resume-section")
+    futures = {section: pool.submit(run, section, fn, args) for section, (fn, args) in section_requests.items()}
+    for section, future in futures.items():
+        try:
+            # Small grace period on top of the deadline for the worker to notice it has passed
+            results[section] = future.result(timeout=max(0, deadline - time.monotonic()) + 1)
+        except FutureTimeoutError:
+            print(f"Warning: {section} section timed out after {timeout:.0f}s.")
+            results[section] = None
+            timings.setdefault(section, time.monotonic() - start)
+        except Exception as e:
+            print(f"Warning: {section} section failed: {e}")
+            results[section] = None
+    # Don't wait for a straggler that already missed its deadline
+    pool.shutdown(wait=False, cancel_futures=True)
+    return results, timings
+
+
+def generate_custom_resume_from_knowledge_bank(job_description, knowledge_bank_path="knowledge_bank.json", base_resume_path=".", output_base_folder="generated_resumes", llm_client=None, llm_cache=None, ranker=None, compile_lock=None, build_slot=0):
     """
     Generates a customized resume using Gemini AI based on the job description
     and a structured knowledge bank, providing LaTeX examples for formatting.
     All generated files are saved in a new timestamped subfolder.
+
+    Returns a dict with the output folder, the PDF path (None if compilation
+    failed), which sections were generated or fell back to the template,
+    per-stage timings in seconds and the estimated prompt tokens saved by ranking.
+    Returns None if the knowledge bank can't be loaded.
+
+    Only the knowledge-bank entries that rank highest against the job description
+    go into the prompts; pass ranker=False (or set RESUME_RANKING=0) to send everything.
+
+    Section outputs are cached on disk keyed on their prompt, so unchanged sections
+    are reused across runs; pass llm_cache=False (or set RESUME_LLM_CACHE=0) to bypass.
+    compile_lock, if given, is held around the LaTeX build to cap concurrent latexmk
+    processes; build_slot picks the build engine's warm directory.
     """
     print("--- Starting resume customization with Gemini AI (Knowledge Bank Method) ---")
+    run_start = time.monotonic()
+    timings = {}
+
+    # 1. Load Knowledge Bank (parsed once per process, see snapshot.py)
+    knowledge_bank = load_knowledge_bank(knowledge_bank_path)
+    if knowledge_bank is None:
+        print("Aborting resume generation due to missing/invalid knowledge bank.")
+        return
 
     # Create a unique output folder for this run
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
     output_folder = os.path.join(output_base_folder, f"resume_{timestamp}")
     os.makedirs(output_folder, exist_ok=True)
     print(f"Output will be saved to: {output_folder}")
 
-    # Copy original LaTeX template files to the new output folder
-    latex_template_files = ["resume.tex", "heading.tex", "education.tex", "custom-commands.tex", "skills.tex", "experience.tex", "projects.tex"]
-    for fname in latex_template_files:
-        src_path = os.path.join(base_resume_path, fname)
-        if os.path.exists(src_path):
-            shutil.copy(src_path, output_folder)
-        else:
-            print(f"Warning: Original LaTeX template file not found: {src_path}. This might affect compilation.")
-    print(f"Copied original LaTeX template files to {output_folder}")
-
-    # 1. Load Knowledge Bank (directly from JSON)
-    knowledge_bank = load_knowledge_bank(knowledge_bank_path)
-    if knowledge_bank is None:
-        print("Aborting resume generation due to missing/invalid knowledge bank.")
-        return
+    # Hardlink the unchanged LaTeX templates into the new output folder; the three
+    # section files are written below, from Gemini's output or the template.
+    missing = materialize_templates(base_resume_path, output_folder, skip=SECTION_FILES.values())
+    for fname in missing:
+        print(f"Warning: Original LaTeX template file not found: {os.path.join(base_resume_path, fname)}. This might affect compilation.")
+    print(f"Linked original LaTeX template files into {output_folder}")
 
     # Extract relevant structured data for each section
     structured_skills = knowledge_bank.get("skills", {})
     structured_experience = knowledge_bank.get("experience", [])
     structured_projects = knowledge_bank.get("projects", [])
-
-    # 2. Read Original LaTeX Sections for Example Context (from the copied files in output_folder)
-    original_skills_example = read_original_latex_section(os.path.join(output_folder, "skills.tex"))
-    original_experience_example = read_original_latex_section(os.path.join(output_folder, "experience.tex"))
-    original_projects_example = read_original_latex_section(os.path.join(output_folder, "projects.tex"))
-
-
-    # 3. Generate New Sections using Gemini, passing the examples
-    new_skills_latex = generate_skills_section_with_gemini(structured_skills, job_description, original_skills_example)
-    new_experience_latex = generate_experience_section_with_gemini(structured_experience, job_description, original_experience_example)
-    new_projects_latex = generate_projects_section_with_gemini(structured_projects, job_description, original_projects_example)
-
-    # 4. Handle Gemini's Output (e.g., stripping markdown code blocks if present)
-    def clean_gemini_output(text):
-        # This regex looks for an optional language specifier (like 'latex') after the first ```
-        match = re.search(r"```(?:[a-zA-Z0-9_+\-]+)?\s*(.*?)\s*```", text, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-        return text.strip()
-
-    new_skills_latex = clean_gemini_output(new_skills_latex)
-    new_experience_latex = clean_gemini_output(new_experience_latex)
-    new_projects_latex = clean_gemini_output(new_projects_latex)
-
-    # 5. Validate Gemini's output and write to files in the new output folder
-    # If Gemini returns empty, it means it didn't find relevant content, or an error occurred.
-    # For now, we'll write empty if Gemini decides so, leading to an empty section.
-    if not new_skills_latex.strip():
-        print("Warning: Gemini returned empty content for skills. This section will be empty in resume.")
-    if not new_experience_latex.strip():
-        print("Warning: Gemini returned empty content for experience. This section will be empty in resume.")
-    if not new_projects_latex.strip():
-        print("Warning: Gemini returned empty content for projects. This section will be empty in resume.")
-
-    write_latex_section(os.path.join(output_folder, "skills.tex"), new_skills_latex)
-    write_latex_section(os.path.join(output_folder, "experience.tex"), new_experience_latex)
-    write_latex_section(os.path.join(output_folder, "projects.tex"), new_projects_latex)
+    prompt_tokens = None
+    if ranker is None and USE_RANKING:
+        ranker = get_default_ranker()
+    if ranker:
+        rank_start = time.monotonic()
+        ranked, prompt_tokens = ranker.rank(knowledge_bank, job_description)
+        structured_skills, structured_experience, structured_projects = ranked["skills"], ranked["experience"], ranked["projects"]
+        timings["rank"] = time.monotonic() - rank_start
+        print(format_report(prompt_tokens))
+
+    # 2. Read Original LaTeX Sections for Example Context (from the template snapshot)
+    original_skills_example = read_original_latex_section(os.path.join(base_resume_path, "skills.tex"))
+    original_experience_example = read_original_latex_section(os.path.join(base_resume_path, "experience.tex"))
+    original_projects_example = read_original_latex_section(os.path.join(base_resume_path, "projects.tex"))
+
+
+    # 3. Generate New Sections using Gemini, passing the examples.
+    # The three prompts are independent, so they run concurrently (with retries)
+    # and come back already stripped of markdown code fences.
+    section_requests = {
+        "skills": (generate_skills_section_with_gemini, (structured_skills, job_description, original_skills_example)),
+        "experience": (generate_experience_section_with_gemini, (structured_experience, job_description, original_experience_example)),
+        "projects": (generate_projects_section_with_gemini, (structured_projects, job_description, original_projects_example)),
+    }
+    llm_client = llm_client or get_default_llm_client()
+    if llm_cache is None and USE_LLM_CACHE:
+        llm_cache = get_default_llm_cache()
+    # Sections are checked before compiling, so a bad one is re-requested on its own
+    # instead of failing latexmk; invalid output is never stored in the cache.
+    validator = LatexValidator.from_templates(base_resume_path) if VALIDATE_SECTIONS else None
+    if llm_cache:
+        llm_client = CachingLLMClient(llm_client, llm_cache, postprocess=clean_gemini_output,
+                                      accept=validator.is_acceptable if validator else None)
+    llm_start = time.monotonic()
+    new_sections, section_timings = generate_sections_concurrently(section_requests, llm_client=llm_client, validator=validator)
+    timings["llm"] = time.monotonic() - llm_start
+    timings.update({f"llm_{section}": seconds for section, seconds in section_timings.items()})
+
+    # 4. Write Gemini's output to files in the new output folder. A section that failed,
+    # timed out or came back empty gets the original template section instead of
+    # leaving an empty section in the resume.
+    section_status = {}
+    for section, latex in new_sections.items():
+        if latex is None:
+            print(f"Warning: Gemini did not return content for {section}. Keeping the original template section.")
+            section_status[section] = "fallback"
+            try:
+                latex = template_texts.get(os.path.join(base_resume_path, SECTION_FILES[section]))
+            except FileNotFoundError:
+                continue
+        else:
+            section_status[section] = "generated"
+        write_latex_section(os.path.join(output_folder, SECTION_FILES[section]), latex)
 
     print(f"Updated .tex files in {output_folder} with Gemini-generated content.")
 
-    # 6. Compile the LaTeX Resume to PDF in the new output folder
-    compile_latex_to_pdf(output_folder)
+    # 5. Compile the LaTeX Resume to PDF in the new output folder
+    compile_start = time.monotonic()
+    if compile_lock is not None:
+        with compile_lock:
+            timings["compile_queue"] = time.monotonic() - compile_start
+            build = compile_latex_to_pdf(output_folder, slot=build_slot)
+    else:
+        build = compile_latex_to_pdf(output_folder, slot=build_slot)
+    timings["compile"] = time.monotonic() - compile_start
+    timings.update({f"compile_{stage}": seconds for stage, seconds in build["timings"].items() if stage != "total"})
+    timings["total"] = time.monotonic() - run_start
 
     print("--- Resume customization complete ---")
+    return {
+        "output_folder": output_folder,
+        "pdf_path": build["pdf_path"],
+        "sections": section_status,
+        "timings": timings,
+        "prompt_tokens": prompt_tokens,
+    }
 
 
 # --- Example Usage ---
 if __name__ == "__main__":
+    # Ensure API key is set
+    try:
+        get_default_llm_client()
+    except RuntimeError:
+        print("Error: GOOGLE_API_KEY environment variable not set.")
+        print("Please set it before running the script (e.g., export GOOGLE_API_KEY='your_key_here').")
+        exit(1)
+
     job_description_devops = """
     
 About the job
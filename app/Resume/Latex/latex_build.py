@@ -0,0 +1,246 @@
+"""
+Incremental LaTeX build engine for generated resumes.
+
+Three things make repeated builds cheap compared to a clean `latexmk` per resume:
+
+1. The shared preamble of resume.tex (everything up to \\endofdump, including
+   custom-commands.tex) is precompiled once into a format file with
+   mylatexformat, keyed on its content hash. Font-heavy packages like lato and
+   fontawesome5 are then loaded from the dump instead of reprocessed.
+2. latexmk runs with -outdir pointing at a persistent "warm" directory per build
+   slot, so aux files from the previous resume carry over and most builds
+   settle in a single pdflatex pass.
+3. Every PDF built is also kept under build_dir/outputs, named by the hash of
+   its input .tex files and format, so rebuilding identical inputs (in any
+   folder, e.g. a job regenerated with the same tailored content) skips
+   compilation and copies the earlier PDF. The newest RESUME_BUILD_OUTPUTS_MAX
+   are kept.
+
+If the format can't be built (e.g. mylatexformat is missing) the engine falls
+back to plain latexmk, still in the warm directory, and tries the format again
+after RESUME_FORMAT_RETRY_SECONDS.
+"""
+import fcntl
+import glob
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUILD_DIR = os.getenv("RESUME_BUILD_DIR", ".latex_build")
+# PDFs kept in build_dir/outputs for unchanged inputs to reuse; 0 disables the reuse
+OUTPUTS_MAX = int(os.getenv("RESUME_BUILD_OUTPUTS_MAX", "200"))
+# After a failed format build, seconds before it is tried again (e.g. once a missing
+# package is installed); until then builds fall back to plain latexmk
+FORMAT_RETRY_SECONDS = int(os.getenv("RESUME_FORMAT_RETRY_SECONDS", "3600"))
+MAIN_FILE = "resume.tex"
+# Files the precompiled preamble depends on, besides the preamble of MAIN_FILE itself
+PREAMBLE_INPUTS = ["custom-commands.tex"]
+PREAMBLE_END = re.compile(r"\\csname\s+endofdump\\endcsname|\\begin\{document\}")
+
+
+@contextmanager
+def _locked(path):
+    """Exclusive advisory lock, so concurrent builds don't share a format build or warm slot."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _sha256_files(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class LatexBuildEngine:
+    def __init__(self, build_dir=DEFAULT_BUILD_DIR, use_format=True):
+        self.build_dir = os.path.abspath(build_dir)
+        self.use_format = use_format
+
+    # --- Preamble format ---
+
+    def _preamble_key(self, source_dir):
+        with open(os.path.join(source_dir, MAIN_FILE), "r", encoding="utf-8") as f:
+            main = f.read()
+        match = PREAMBLE_END.search(main)
+        preamble = main[:match.start()] if match else main
+        digest = hashlib.sha256(preamble.encode("utf-8"))
+        for name in PREAMBLE_INPUTS:
+            path = os.path.join(source_dir, name)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+        return digest.hexdigest()[:16]
+
+    def _format_failed(self, failed_marker, key):
+        """
+        Whether a recent format build of this preamble failed. The marker records the
+        preamble key and the time of the failure; a stale or foreign one is removed so
+        the build is tried again.
+        """
+        try:
+            with open(failed_marker, "r", encoding="utf-8") as f:
+                header = f.readline().split()
+        except FileNotFoundError:
+            return False
+        try:
+            failed_key, failed_at = header[0], float(header[1])
+        except (IndexError, ValueError):
+            failed_key, failed_at = None, 0.0  # written before the marker had a header
+        if failed_key == key and time.time() - failed_at < FORMAT_RETRY_SECONDS:
+            return True
+        try:
+            os.remove(failed_marker)
+        except FileNotFoundError:
+            pass
+        return False
+
+    def ensure_format(self, source_dir):
+        """
+        Returns the path (without the .fmt extension, as pdflatex -fmt expects) of the
+        precompiled preamble for source_dir, building it on first use. None if it can't be built.
+        """
+        key = self._preamble_key(source_dir)
+        format_dir = os.path.join(self.build_dir, "formats", key)
+        fmt_base = os.path.join(format_dir, "preamble")
+        failed_marker = os.path.join(format_dir, "FAILED")
+        if os.path.exists(fmt_base + ".fmt"):
+            return fmt_base
+        if self._format_failed(failed_marker, key):
+            return None
+
+        with _locked(os.path.join(self.build_dir, "formats", f"{key}.lock")):
+            if os.path.exists(fmt_base + ".fmt"):  # another process built it while we waited
+                return fmt_base
+            if self._format_failed(failed_marker, key):  # or failed to
+                return None
+            os.makedirs(format_dir, exist_ok=True)
+            for name in [MAIN_FILE] + PREAMBLE_INPUTS:
+                src = os.path.join(source_dir, name)
+                if os.path.exists(src):
+                    shutil.copy(src, format_dir)
+            print(f"Precompiling LaTeX preamble into {fmt_base}.fmt ...")
+            try:
+                result = subprocess.run(
+                    ["pdflatex", "-ini", "-interaction=nonstopmode", "-jobname=preamble",
+                     "&pdflatex", "mylatexformat.ltx", MAIN_FILE],
+                    cwd=format_dir, capture_output=True, text=True,
+                )
+            except FileNotFoundError:
+                return None
+            if result.returncode != 0 or not os.path.exists(fmt_base + ".fmt"):
+                print("Warning: could not precompile the preamble; falling back to full builds.")
+                with open(failed_marker, "w", encoding="utf-8") as f:
+                    f.write(f"{key} {time.time()}\n")
+                    f.write(result.stdout[-4000:])
+                return None
+            return fmt_base
+
+    # --- Builds ---
+
+    def inputs_hash(self, source_dir, fmt_base=None):
+        tex_files = sorted(glob.glob(os.path.join(source_dir, "*.tex")))
+        digest = _sha256_files(tex_files)
+        return hashlib.sha256(f"{digest}:{fmt_base or ''}".encode()).hexdigest()
+
+    # --- Outputs of earlier builds ---
+
+    def _reuse_output(self, output_path, pdf_path):
+        """Copies the PDF built earlier from the same inputs to pdf_path. False if there is none."""
+        try:
+            shutil.copyfile(output_path, pdf_path)
+        except FileNotFoundError:
+            return False
+        os.utime(output_path)  # recently used, so pruned last
+        return True
+
+    def _save_output(self, pdf_path, output_path):
+        outputs_dir = os.path.dirname(output_path)
+        os.makedirs(outputs_dir, exist_ok=True)
+        # Copied under a temporary name first, so a half-written PDF is never reused
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        shutil.copyfile(pdf_path, tmp_path)
+        os.replace(tmp_path, output_path)
+
+        outputs = []
+        for entry in os.scandir(outputs_dir):
+            if entry.name.endswith(".pdf"):
+                try:
+                    outputs.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        outputs.sort(reverse=True)
+        for _, path in outputs[OUTPUTS_MAX:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def compile(self, source_dir, slot=0):
+        """
+        Builds source_dir/resume.pdf. Returns a dict with ok, skipped, pdf_path,
+        per-stage timings in seconds, and the tail of the log on failure.
+        """
+        source_dir = os.path.abspath(source_dir)
+        timings = {}
+        start = time.monotonic()
+
+        fmt_base = self.ensure_format(source_dir) if self.use_format else None
+        timings["format"] = time.monotonic() - start
+
+        stage = time.monotonic()
+        pdf_path = os.path.join(source_dir, "resume.pdf")
+        output_path = os.path.join(self.build_dir, "outputs", f"{self.inputs_hash(source_dir, fmt_base)}.pdf")
+        timings["hash"] = time.monotonic() - stage
+        if OUTPUTS_MAX > 0 and self._reuse_output(output_path, pdf_path):
+            timings["total"] = time.monotonic() - start
+            print(f"Resume inputs unchanged, reusing the earlier build: {pdf_path}")
+            return {"ok": True, "skipped": True, "pdf_path": pdf_path, "timings": timings, "log": ""}
+
+        warm_dir = os.path.join(self.build_dir, "warm", f"slot-{slot}")
+        stage = time.monotonic()
+        with _locked(warm_dir + ".lock"):
+            timings["wait"] = time.monotonic() - stage
+            os.makedirs(warm_dir, exist_ok=True)
+            command = ["latexmk", "-pdf", "-interaction=nonstopmode", f"-outdir={warm_dir}"]
+            if fmt_base:
+                command.append(f"-pdflatex=pdflatex -fmt={fmt_base} %O %S")
+            command.append(MAIN_FILE)
+
+            stage = time.monotonic()
+            try:
+                result = subprocess.run(command, cwd=source_dir, capture_output=True, text=True)
+            except FileNotFoundError:
+                timings["total"] = time.monotonic() - start
+                return {"ok": False, "skipped": False, "pdf_path": None, "timings": timings,
+                        "log": "latexmk command not found"}
+            timings["latexmk"] = time.monotonic() - stage
+
+            built_pdf = os.path.join(warm_dir, "resume.pdf")
+            ok = result.returncode == 0 and os.path.exists(built_pdf)
+            if ok:
+                stage = time.monotonic()
+                shutil.copyfile(built_pdf, pdf_path)
+                if OUTPUTS_MAX > 0:
+                    self._save_output(pdf_path, output_path)
+                timings["copy"] = time.monotonic() - stage
+
+        timings["total"] = time.monotonic() - start
+        return {
+            "ok": ok,
+            "skipped": False,
+            "pdf_path": pdf_path if ok else None,
+            "timings": timings,
+            "log": "" if ok else (result.stdout[-4000:] + result.stderr[-2000:]),
+        }
@@ -0,0 +1,212 @@
+"""
+Structural checks for generated LaTeX sections, run before anything is compiled.
+
+A bad section used to surface only as a failed latexmk run, after the whole
+pipeline had finished. The validator catches the usual model mistakes in
+microseconds instead:
+
+- unbalanced \\begin/\\end environments, including the list macros from
+  custom-commands.tex (\\resumeItemListStart ... \\resumeItemListEnd)
+- unbalanced braces
+- unescaped & % # _ $ in text
+- macros that neither custom-commands.tex, the templates nor plain LaTeX define
+
+Trivial escapes are fixed in place (e.g. "80% faster" -> "80\\% faster"); what
+can't be fixed is reported, so generate.py can re-request only that section.
+"""
+import os
+import re
+
+from snapshot import TEMPLATE_FILES, template_texts
+
+# Plain LaTeX/package macros a section may use even if no template happens to
+BASE_MACROS = {
+    "section", "subsection", "textbf", "textit", "emph", "underline", "small", "footnotesize", "scriptsize",
+    "tiny", "normalsize", "large", "Large", "item", "href", "url", "vspace", "hspace", "begin", "end",
+    "textasciitilde", "textasciicircum", "textbackslash", "textbar", "textendash", "textemdash", "quad",
+    "qquad", "newline", "linebreak", "par", "noindent", "centering", "hfill", "bullet", "cdot", "times",
+    "ldots", "dots", "textcolor", "mbox", "raggedright", "LaTeX", "TeX", "textsuperscript", "texttt",
+}
+
+MACRO_RE = re.compile(r"\\([A-Za-z@]+)")
+DEFINITION_RE = re.compile(r"\\(?:re)?newcommand\*?\s*\{?\s*\\([A-Za-z@]+)")
+ENV_RE = re.compile(r"\\(begin|end)\s*\{([^}]*)\}")
+PERCENT_RE = re.compile(r"(?<!\\)%")
+# Arguments that hold URLs, where % # _ & are legal as-is
+URL_ARG_RE = re.compile(r"\\(?:href|url)\s*\{[^}]*\}")
+PERCENT_AFTER_NUMBER_RE = re.compile(r"(?<=[0-9])%")
+DOLLAR_AMOUNT_RE = re.compile(r"(?<!\\)\$(?=[0-9])")
+UNESCAPED_DOLLAR_RE = re.compile(r"(?<!\\)\$")
+TEXT_SPECIALS_RE = re.compile(r"(?<!\\)[&#_]")
+
+
+class ValidationResult:
+    def __init__(self, text, errors, fixes):
+        self.text = text
+        self.errors = errors
+        self.fixes = fixes
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def _spans(pattern, text):
+    return [m.span() for m in pattern.finditer(text)]
+
+
+def _inside(position, spans):
+    return any(start <= position < end for start, end in spans)
+
+
+def _comment_spans(text):
+    """From each unescaped % outside a URL argument to the end of its line."""
+    urls = _spans(URL_ARG_RE, text)
+    spans = []
+    for m in PERCENT_RE.finditer(text):
+        if _inside(m.start(), urls) or _inside(m.start(), spans):
+            continue
+        end = text.find("\n", m.start())
+        spans.append((m.start(), len(text) if end == -1 else end))
+    return spans
+
+
+def _strip_comments(text):
+    for start, end in reversed(_comment_spans(text)):
+        text = text[:start] + text[end:]
+    return text
+
+
+def _math_spans(text, protected):
+    dollars = [m.start() for m in UNESCAPED_DOLLAR_RE.finditer(text) if not _inside(m.start(), protected)]
+    return [(dollars[i], dollars[i + 1] + 1) for i in range(0, len(dollars) - 1, 2)]
+
+
+class LatexValidator:
+    def __init__(self, known_macros, list_macros=None):
+        self.known_macros = set(known_macros) | BASE_MACROS
+        # Macros that open or close an environment, e.g. {"resumeItemListStart": [("begin", "itemize")]}
+        self.list_macros = list_macros or {}
+
+    @classmethod
+    def from_templates(cls, base_resume_path="."):
+        """Knows every macro custom-commands.tex defines and every macro the template set uses."""
+        known = set()
+        list_macros = {}
+        for fname in TEMPLATE_FILES:
+            try:
+                text = template_texts.get(os.path.join(base_resume_path, fname))
+            except FileNotFoundError:
+                continue
+            text = _strip_comments(text)
+            known.update(MACRO_RE.findall(text))
+            definitions = list(DEFINITION_RE.finditer(text))
+            for i, match in enumerate(definitions):
+                name = match.group(1)
+                known.add(name)
+                body_end = definitions[i + 1].start() if i + 1 < len(definitions) else len(text)
+                envs = ENV_RE.findall(text[match.end():body_end])
+                begins = sum(1 for kind, _ in envs if kind == "begin")
+                if envs and begins != len(envs) - begins:
+                    list_macros[name] = envs
+        return cls(known, list_macros)
+
+    def autofix(self, text):
+        """Escapes specials that can only have been meant literally. Returns (text, list of fixes)."""
+        fixes = []
+
+        protected = _spans(URL_ARG_RE, text)
+        fixed, count = PERCENT_AFTER_NUMBER_RE.subn(lambda m: m.group(0) if _inside(m.start(), protected) else "\\%", text)
+        count = fixed.count("\\%") - text.count("\\%")
+        if count:
+            fixes.append(f"escaped {count} percent sign(s) after a number")
+            text = fixed
+
+        protected = _spans(URL_ARG_RE, text)
+        dollars = [m for m in UNESCAPED_DOLLAR_RE.finditer(text) if not _inside(m.start(), protected)]
+        if len(dollars) % 2:
+            # An odd number can't all be math delimiters; currency amounts are the usual culprit
+            fixed, count = DOLLAR_AMOUNT_RE.subn(lambda m: m.group(0) if _inside(m.start(), protected) else "\\$", text)
+            if count:
+                fixes.append(f"escaped {count} dollar sign(s) before an amount")
+                text = fixed
+
+        protected = _spans(URL_ARG_RE, text) + _comment_spans(text)
+        protected += _math_spans(text, protected)
+        in_tabular = "\\begin{tabular" in text
+        escaped = []
+
+        def escape(match):
+            char = match.group(0)
+            if _inside(match.start(), protected) or (char == "&" and in_tabular):
+                return char
+            escaped.append(char)
+            return "\\" + char
+
+        text = TEXT_SPECIALS_RE.sub(escape, text)
+        if escaped:
+            fixes.append(f"escaped {len(escaped)} special character(s): {' '.join(sorted(set(escaped)))}")
+
+        mismatched, unclosed = self._scan_environments(_strip_comments(text))
+        if unclosed and not mismatched:
+            # Models often drop the final list terminator; closing it at the end is unambiguous
+            text = text.rstrip("\n") + "\n" + "\n".join(f"\\end{{{env}}}" for env in reversed(unclosed)) + "\n"
+            fixes.append(f"closed {len(unclosed)} unterminated environment(s)")
+        return text, fixes
+
+    def _scan_environments(self, body):
+        """Returns (errors for mismatched \\end's, environments left open at the end)."""
+        errors = []
+        stack = []
+        tokens = [(m.start(), m.group(1), m.group(2).strip()) for m in ENV_RE.finditer(body)]
+        for m in MACRO_RE.finditer(body):
+            for kind, env in self.list_macros.get(m.group(1), []):
+                tokens.append((m.start(), kind, env.strip()))
+        for _, kind, env in sorted(tokens):
+            if kind == "begin":
+                stack.append(env)
+            elif not stack:
+                errors.append(f"\\end{{{env}}} without a matching \\begin{{{env}}}")
+            elif stack[-1] != env:
+                errors.append(f"\\end{{{env}}} closes \\begin{{{stack[-1]}}}")
+                stack.pop()
+            else:
+                stack.pop()
+        return errors, stack
+
+    def check(self, text):
+        """Returns the problems autofix can't repair, as short messages the model can act on."""
+        errors = []
+        body = _strip_comments(text)
+        protected = _spans(URL_ARG_RE, body)
+
+        mismatched, unclosed = self._scan_environments(body)
+        errors.extend(mismatched)
+        for env in unclosed:
+            errors.append(f"\\begin{{{env}}} is never closed")
+
+        depth = 0
+        unbalanced = False
+        for m in re.finditer(r"(?<!\\)[{}]", body):
+            depth += 1 if m.group(0) == "{" else -1
+            if depth < 0:
+                unbalanced = True
+                depth = 0
+        if unbalanced or depth:
+            errors.append("unbalanced braces { }")
+
+        dollars = [m for m in UNESCAPED_DOLLAR_RE.finditer(body) if not _inside(m.start(), protected)]
+        if len(dollars) % 2:
+            errors.append("unbalanced $ (escape literal dollar signs as \\$)")
+
+        unknown = sorted({name for name in MACRO_RE.findall(body) if name not in self.known_macros})
+        if unknown:
+            errors.append("unknown macros: " + ", ".join(f"\\{name}" for name in unknown))
+        return errors
+
+    def validate(self, text):
+        text, fixes = self.autofix(text)
+        return ValidationResult(text, self.check(text), fixes)
+
+    def is_acceptable(self, text):
+        return self.validate(text).ok
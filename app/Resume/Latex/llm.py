@@ -0,0 +1,128 @@
+import os
+import random
+from abc import ABC, abstractmethod
+import threading
+import time
+
+
+class LLMClient(ABC):
+    """
+    Minimal interface the resume generator needs from a model. Implementations
+    must be thread-safe: the three resume sections are generated concurrently.
+    """
+
+    @abstractmethod
+    def generate(self, prompt_text, model_name="gemini-1.5-flash", temperature=0.4, timeout=None):
+        """Returns the model's text for the prompt. Raises on failure."""
+
+
+class GeminiClient(LLMClient):
+    """Google Gemini through the google-generativeai SDK."""
+
+    def __init__(self, api_key=None):
+        import google.generativeai as genai
+
+        api_key = api_key or os.environ.get("GOOGLE_API_KEY")
+        if not api_key:
+            raise RuntimeError("GOOGLE_API_KEY environment variable not set.")
+        genai.configure(api_key=api_key)
+        self._genai = genai
+
+    def generate(self, prompt_text, model_name="gemini-1.5-flash", temperature=0.4, timeout=None):
+        model = self._genai.GenerativeModel(model_name)
+        request_options = {"timeout": timeout} if timeout else None
+        response = model.generate_content(
+            prompt_text,
+            generation_config=self._genai.types.GenerationConfig(temperature=temperature),
+            request_options=request_options,
+        )
+        return response.text
+
+
+class FakeLLMClient(LLMClient):
+    """
+    Local stand-in for tests and benchmarks. Sleeps `delay` (+/- `jitter`) seconds per call,
+    fails the first `failures` calls, and answers with `responses[section]` when the prompt
+    asks for that section (matched on the "OUTPUT NEW <SECTION> SECTION" marker), else `default`.
+    """
+
+    def __init__(self, responses=None, default="", delay=0.0, jitter=0.0, failures=0, seed=None):
+        self.responses = responses or {}
+        self.default = default
+        self.delay = delay
+        self.jitter = jitter
+        self.failures = failures
+        self.calls = 0
+        self.prompts = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate(self, prompt_text, model_name="gemini-1.5-flash", temperature=0.4, timeout=None):
+        with self._lock:
+            self.calls += 1
+            self.prompts.append(prompt_text)
+            should_fail = self.calls <= self.failures
+            delay = max(0.0, self.delay + self._rng.uniform(-self.jitter, self.jitter))
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Fake model did not answer within {timeout}s")
+        time.sleep(delay)
+        if should_fail:
+            raise RuntimeError("Injected fake model failure")
+        for section, text in self.responses.items():
+            if f"OUTPUT NEW {section.upper()} SECTION" in prompt_text:
+                return text
+        return self.default
+
+
+class BoundedLLMClient(LLMClient):
+    """Caps concurrent calls to the wrapped client with a (threading or multiprocessing) semaphore."""
+
+    def __init__(self, inner, semaphore):
+        self.inner = inner
+        self.semaphore = semaphore
+
+    def generate(self, prompt_text, model_name="gemini-1.5-flash", temperature=0.4, timeout=None):
+        with self.semaphore:
+            return self.inner.generate(prompt_text, model_name=model_name, temperature=temperature, timeout=timeout)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens per second up to `capacity`,
+    so short bursts go through immediately while the long-run rate stays capped.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1.0):
+        """Blocks until `tokens` are available and takes them. Returns the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class RateLimitedLLMClient(LLMClient):
+    """Takes a token from a shared TokenBucket before every call to the wrapped client."""
+
+    def __init__(self, inner, bucket):
+        self.inner = inner
+        self.bucket = bucket
+
+    def generate(self, prompt_text, model_name="gemini-1.5-flash", temperature=0.4, timeout=None):
+        self.bucket.acquire()
+        return self.inner.generate(prompt_text, model_name=model_name, temperature=temperature, timeout=timeout)
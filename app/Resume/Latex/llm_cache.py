@@ -0,0 +1,231 @@
+"""
+Content-addressed on-disk cache for LLM section outputs.
+
+Entries are keyed on a hash of (prompt, model_name, temperature) and hold the
+cleaned LaTeX, so re-running the generator with unchanged inputs skips the
+model entirely, and changing one knowledge-bank section only re-prompts that
+section. The cache is bounded in bytes with least-recently-used eviction
+(recency is tracked through file mtimes, which hits refresh). Writes keep a
+running byte total, so the directory is only scanned once the total passes
+the limit, and eviction then frees enough room for many more writes.
+
+    python llm_cache.py stats
+    python llm_cache.py list
+    python llm_cache.py prune --max-bytes 10000000 --older-than 30
+    python llm_cache.py clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from llm import LLMClient
+
+DEFAULT_CACHE_DIR = os.getenv("RESUME_LLM_CACHE_DIR", ".llm_cache")
+DEFAULT_MAX_BYTES = int(os.getenv("RESUME_LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Share of max_bytes an over-limit cache is pruned down to
+PRUNE_TARGET = 0.9
+
+
+def cache_key(prompt_text, model_name, temperature):
+    payload = json.dumps([model_name, float(temperature), prompt_text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Bytes of .tex entries, as of the last scan plus this process's writes since;
+        # None until the first put() needs it
+        self._bytes = None
+        # Reentrant: put() prunes and prune() deletes while holding it
+        self._lock = threading.RLock()
+
+    def _path(self, key):
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.directory, key[:2], f"{key}.tex")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return text
+
+    def _size(self, path):
+        try:
+            return os.stat(path).st_size
+        except FileNotFoundError:
+            return 0
+
+    def put(self, key, text, meta=None):
+        path = self._path(key)
+        # One writer at a time per instance, so the running total stays exact
+        with self._lock:
+            if self.max_bytes and self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._scan())
+            replaced = self._size(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            if meta is not None:
+                with open(path[:-len(".tex")] + ".json", "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+            if self._bytes is not None:
+                self._bytes += self._size(path) - replaced
+                if self.max_bytes and self._bytes > self.max_bytes:
+                    self.prune(max_bytes=int(self.max_bytes * PRUNE_TARGET))
+
+    def delete(self, key):
+        path = self._path(key)
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes -= self._size(path)
+            for p in (path, path[:-len(".tex")] + ".json"):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+
+    def _scan(self):
+        """(key, bytes, last used) of every entry, from stat alone, least recently used first."""
+        result = []
+        if not os.path.isdir(self.directory):
+            return result
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".tex"):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                result.append((entry.name[:-len(".tex")], st.st_size, st.st_mtime))
+        result.sort(key=lambda e: e[2])
+        return result
+
+    def entries(self):
+        """All entries as dicts with their metadata, least recently used first."""
+        result = []
+        for key, size, last_used in self._scan():
+            meta = {}
+            meta_path = self._path(key)[:-len(".tex")] + ".json"
+            if os.path.exists(meta_path):
+                try:
+                    with open(meta_path, "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    pass
+            result.append({"key": key, "bytes": size, "last_used": last_used, **meta})
+        return result
+
+    def prune(self, max_bytes=None, max_age_days=None):
+        """Evicts entries older than max_age_days, then LRU entries until under max_bytes. Returns the count removed."""
+        with self._lock:
+            entries = self._scan()
+            removed = 0
+            now = time.time()
+            total = sum(size for _, size, _ in entries)
+            for key, size, last_used in entries:
+                too_old = max_age_days is not None and now - last_used > max_age_days * 86400
+                too_big = max_bytes is not None and total > max_bytes
+                if not (too_old or too_big):
+                    continue
+                self.delete(key)
+                total -= size
+                removed += 1
+            # Resynced from the scan, which also counts entries other processes wrote
+            self._bytes = total
+            return removed
+
+    def clear(self):
+        return self.prune(max_bytes=0)
+
+    def stats(self):
+        entries = self._scan()
+        return {
+            "directory": os.path.abspath(self.directory),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+class CachingLLMClient(LLMClient):
+    """
+    Wraps another client with the on-disk cache. `postprocess` (e.g. stripping code
+    fences) runs before storing, so hits return exactly what a fresh call would
+    after cleaning. Empty answers are never cached, nor are answers `accept`
+    rejects (e.g. invalid LaTeX); a cached entry it rejects is evicted.
+    """
+
+    def __init__(self, inner, cache=None, postprocess=None, accept=None):
+        self.inner = inner
+        self.cache = cache or LLMCache()
+        self.postprocess = postprocess or (lambda text: text)
+        self.accept = accept or (lambda text: True)
+        self.hits = 0
+        self.misses = 0
+
+    def generate(self, prompt_text, model_name="gemini-1.5-flash", temperature=0.4, timeout=None):
+        key = cache_key(prompt_text, model_name, temperature)
+        cached = self.cache.get(key)
+        if cached is not None and not self.accept(cached):
+            print(f"LLM cache entry {key[:12]} rejected, evicting it")
+            self.cache.delete(key)
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            print(f"LLM cache hit ({key[:12]})")
+            return cached
+        self.misses += 1
+        text = self.postprocess(self.inner.generate(prompt_text, model_name=model_name, temperature=temperature, timeout=timeout))
+        if text and self.accept(text):
+            self.cache.put(key, text, meta={"model_name": model_name, "temperature": temperature, "created": time.time()})
+        return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR, help="cache directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="show entry count and size")
+    sub.add_parser("list", help="list entries, least recently used first")
+    prune = sub.add_parser("prune", help="evict old and least recently used entries")
+    prune.add_argument("--max-bytes", type=int, default=None)
+    prune.add_argument("--older-than", type=float, default=None, metavar="DAYS")
+    sub.add_parser("clear", help="remove every entry")
+    args = parser.parse_args()
+
+    cache = LLMCache(args.dir, max_bytes=None)
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "list":
+        for entry in cache.entries():
+            used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["last_used"]))
+            print(f"{entry['key'][:16]}  {entry['bytes']:>8} B  last used {used}  {entry.get('model_name', '')}")
+    elif args.command == "prune":
+        if args.max_bytes is None and args.older_than is None:
+            parser.error("prune needs --max-bytes and/or --older-than")
+        print(f"Removed {cache.prune(max_bytes=args.max_bytes, max_age_days=args.older_than)} entries")
+    elif args.command == "clear":
+        print(f"Removed {cache.clear()} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Local relevance ranking of knowledge-bank entries against a job description.
+
+Each skill, experience bullet and project is scored with BM25 (vectorized with
+NumPy, no network), and only the top entries are sent to the model, as compact
+JSON. This keeps prompt size, and with it LLM latency and cost, proportional to
+what the job needs instead of to the whole career history.
+
+Term statistics for a knowledge bank are built once and cached, in memory and
+as .npz files keyed on a hash of the bank's contents, so repeated runs (the
+batch CLI, the API's resume queue) only pay for scoring the job description.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.getenv("RESUME_RANK_CACHE_DIR", ".rank_cache")
+# How many entries of each section reach the prompt
+SKILLS_TOP_K = int(os.getenv("RESUME_RANK_SKILLS", "25"))
+EXPERIENCE_BULLETS_PER_ROLE = int(os.getenv("RESUME_RANK_BULLETS_PER_ROLE", "6"))
+PROJECTS_TOP_K = int(os.getenv("RESUME_RANK_PROJECTS", "4"))
+# Standard BM25 parameters: term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "we", "will", "with", "you", "your",
+}
+# Keeps technical terms like "c++", "c#", "node.js" and "ci/cd" together
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+
+def tokenize(text):
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        # Compound terms also count as their parts, so "ci/cd" matches "CI" and "CD"
+        parts = re.split(r"[./-]", token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part and part not in STOPWORDS)
+    return tokens
+
+
+def compact_json(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def estimate_tokens(text):
+    """Rough LLM token count (about four characters per token for English prose and JSON)."""
+    return math.ceil(len(text) / 4)
+
+
+def _flatten_text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(_flatten_text(v) for v in value.values())
+    if isinstance(value, list):
+        return " ".join(_flatten_text(v) for v in value)
+    return ""
+
+
+def _bullet_field(entry):
+    """Name of the first list-of-strings field of an experience entry (e.g. "bullets")."""
+    for key, value in entry.items():
+        if isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+            return key
+    return None
+
+
+class BM25Index:
+    """Term-frequency matrix (documents x vocabulary) plus the per-term IDF weights."""
+
+    def __init__(self, vocabulary, term_freqs, k1=BM25_K1, b=BM25_B):
+        self.vocabulary = vocabulary
+        self.term_freqs = term_freqs
+        self.k1 = k1
+        self.b = b
+        n_docs = term_freqs.shape[0]
+        doc_freqs = (term_freqs > 0).sum(axis=0)
+        self.idf = np.log1p((n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        doc_lengths = term_freqs.sum(axis=1)
+        avg_length = doc_lengths.mean() if n_docs and doc_lengths.mean() > 0 else 1.0
+        # Per-document part of the BM25 denominator, precomputed once
+        self.length_norm = (k1 * (1 - b + b * doc_lengths / avg_length)).astype(np.float32)
+
+    @classmethod
+    def build(cls, documents):
+        vocabulary = {}
+        rows = []
+        for document in documents:
+            counts = {}
+            for token in tokenize(document):
+                column = vocabulary.setdefault(token, len(vocabulary))
+                counts[column] = counts.get(column, 0) + 1
+            rows.append(counts)
+        term_freqs = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(rows):
+            if counts:
+                term_freqs[row, list(counts)] = list(counts.values())
+        return cls(vocabulary, term_freqs)
+
+    def scores(self, query_text):
+        columns = sorted({self.vocabulary[token] for token in tokenize(query_text) if token in self.vocabulary})
+        if not columns or not self.term_freqs.shape[0]:
+            return np.zeros(self.term_freqs.shape[0], dtype=np.float32)
+        tf = self.term_freqs[:, columns]
+        weights = tf * (self.k1 + 1) / (tf + self.length_norm[:, None])
+        return weights @ self.idf[columns]
+
+    def save(self, path):
+        terms = np.array(sorted(self.vocabulary, key=self.vocabulary.get), dtype=str)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Write-then-rename so a concurrent reader never loads a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp.npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, terms=terms, term_freqs=self.term_freqs)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            vocabulary = {term: column for column, term in enumerate(data["terms"].tolist())}
+            return cls(vocabulary, data["term_freqs"])
+
+
+class KnowledgeBankRanker:
+    """Builds (or loads) one BM25Index per knowledge-bank section and picks the top entries for a job."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._indexes = {}
+
+    def _index(self, documents):
+        key = hashlib.sha256(compact_json(documents).encode("utf-8")).hexdigest()
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+        path = os.path.join(self.cache_dir, f"{key}.npz") if self.cache_dir else None
+        if path and os.path.exists(path):
+            try:
+                index = BM25Index.load(path)
+            except (OSError, ValueError, KeyError):
+                index = None
+        if index is None:
+            index = BM25Index.build(documents)
+            if path:
+                try:
+                    index.save(path)
+                except OSError as e:
+                    print(f"Warning: could not cache ranking index at {path}: {e}")
+        self._indexes[key] = index
+        return index
+
+    def rank_skills(self, skills, job_description, top_k=SKILLS_TOP_K):
+        positions = []
+        documents = []
+        for category, items in skills.items():
+            if isinstance(items, list):
+                for i, item in enumerate(items):
+                    positions.append((category, i))
+                    documents.append(f"{category} {_flatten_text(item)}")
+        if not documents:
+            return skills
+        scores = self._index(documents).scores(job_description)
+        if not scores.any():
+            return skills  # nothing matched; let the model choose from everything
+        keep = {positions[i] for i in np.argsort(-scores, kind="stable")[:top_k] if scores[i] > 0}
+        ranked = {}
+        for category, items in skills.items():
+            if not isinstance(items, list):
+                ranked[category] = items  # e.g. certification blocks, kept whole
+                continue
+            selected = [item for i, item in enumerate(items) if (category, i) in keep]
+            if selected:
+                ranked[category] = selected
+        return ranked
+
+    def rank_experience(self, experience, job_description, per_role=EXPERIENCE_BULLETS_PER_ROLE):
+        # Every role is kept (it is part of the career timeline); only its bullets are trimmed
+        positions = []
+        documents = []
+        for r, role in enumerate(experience):
+            field = _bullet_field(role) if isinstance(role, dict) else None
+            if field:
+                for i, bullet in enumerate(role[field]):
+                    positions.append((r, i))
+                    documents.append(bullet)
+        if not documents:
+            return experience
+        scores = self._index(documents).scores(job_description)
+        by_role = {}
+        for (r, i), score in zip(positions, scores.tolist()):
+            by_role.setdefault(r, []).append((score, i))
+        ranked = []
+        for r, role in enumerate(experience):
+            if r not in by_role or len(by_role[r]) <= per_role:
+                ranked.append(role)
+                continue
+            best = sorted(by_role[r], key=lambda pair: -pair[0])[:per_role]
+            field = _bullet_field(role)
+            keep = sorted(i for _, i in best)
+            ranked.append({**role, field: [role[field][i] for i in keep]})
+        return ranked
+
+    def rank_projects(self, projects, job_description, top_k=PROJECTS_TOP_K):
+        if len(projects) <= top_k:
+            return projects
+        scores = self._index([_flatten_text(project) for project in projects]).scores(job_description)
+        if not scores.any():
+            # No query term appears in any project, so there is no ranking to apply: keep
+            # the knowledge bank's own order, which is how its author prioritized them
+            return projects[:top_k]
+        keep = sorted(np.argsort(-scores, kind="stable")[:top_k].tolist())
+        return [projects[i] for i in keep]
+
+    def rank(self, knowledge_bank, job_description):
+        """
+        Returns the ranked skills, experience and projects, plus a report of the
+        estimated prompt tokens their data takes before (whole section) and after
+        ranking (top entries). Both sides are measured as the compact JSON the prompt
+        carries, so the savings come from ranking alone, not from whitespace.
+        """
+        full = {
+            "skills": knowledge_bank.get("skills", {}),
+            "experience": knowledge_bank.get("experience", []),
+            "projects": knowledge_bank.get("projects", []),
+        }
+        ranked = {
+            "skills": self.rank_skills(full["skills"], job_description),
+            "experience": self.rank_experience(full["experience"], job_description),
+            "projects": self.rank_projects(full["projects"], job_description),
+        }
+        report = {
+            section: {
+                "tokens_before": estimate_tokens(compact_json(full[section])),
+                "tokens_after": estimate_tokens(compact_json(ranked[section])),
+            }
+            for section in full
+        }
+        return ranked, report
+
+
+def format_report(report):
+    before = sum(r["tokens_before"] for r in report.values())
+    after = sum(r["tokens_after"] for r in report.values())
+    saved = (1 - after / before) * 100 if before else 0.0
+    details = ", ".join(f"{section} {r['tokens_before']}->{r['tokens_after']}" for section, r in report.items())
+    return f"Prompt data: ~{before} -> ~{after} tokens ({saved:.0f}% saved; {details})"
+
+
+_default_ranker = None
+
+
+def get_default_ranker():
+    global _default_ranker
+    if _default_ranker is None:
+        _default_ranker = KnowledgeBankRanker()
+    return _default_ranker
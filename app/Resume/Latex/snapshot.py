@@ -0,0 +1,107 @@
+"""
+In-memory snapshots of the generator's inputs: the knowledge bank and the LaTeX
+template set.
+
+Long-running workers (the API's resume queue, batch.py) generate many resumes
+from the same unchanged files. Each file is read and parsed once per process and
+revalidated with a stat() on every use, so an edit to the bank or a template is
+picked up on the next resume without a restart.
+
+Output folders are materialized by hardlinking the unchanged templates (falling
+back to a copy across filesystems); only the regenerated section files are
+written. Those are written to a fresh inode (write-then-rename), never through a
+link, so a template is never modified by a generated resume.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+TEMPLATE_FILES = ["resume.tex", "heading.tex", "education.tex", "custom-commands.tex", "skills.tex", "experience.tex", "projects.tex"]
+SECTION_FILES = {"skills": "skills.tex", "experience": "experience.tex", "projects": "projects.tex"}
+
+
+class FileSnapshotCache:
+    """
+    Caches a loader's result per path, keyed on the file's (mtime, size, inode).
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, path):
+        """Returns the loaded value; raises FileNotFoundError (or the loader's error) like a plain read."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        value = self.loader(path)
+        with self._lock:
+            self._entries[path] = (signature, value)
+            self.loads += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _read_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _read_text(path):
+    with open(path, "r") as f:
+        return f.read()
+
+
+knowledge_banks = FileSnapshotCache(_read_json)
+template_texts = FileSnapshotCache(_read_text)
+
+
+def write_file_atomic(path, content):
+    """Writes to a temp file and renames it over `path`, replacing (not writing through) any hardlink."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def link_or_copy(src_path, dst_path):
+    try:
+        os.link(src_path, dst_path)
+    except OSError:
+        # Different filesystem, or links not permitted there
+        shutil.copyfile(src_path, dst_path)
+
+
+def materialize_templates(base_resume_path, output_folder, skip=()):
+    """
+    Hardlinks every template except those in `skip` (the files the caller will write
+    itself) into output_folder. Returns the names of templates that were missing.
+    """
+    missing = []
+    for fname in TEMPLATE_FILES:
+        if fname in skip:
+            continue
+        src_path = os.path.join(base_resume_path, fname)
+        if not os.path.exists(src_path):
+            missing.append(fname)
+            continue
+        link_or_copy(src_path, os.path.join(output_folder, fname))
+    return missing
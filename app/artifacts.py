@@ -0,0 +1,271 @@
+"""
+Content-addressed store for generated resume PDFs, and its retention sweep.
+
+A PDF is stored once as ARTIFACT_DIR/<2 hex chars>/<sha256>.pdf, so regenerating
+an identical resume reuses the existing file, and the file name doubles as a
+strong ETag: the bytes behind a name never change.
+
+After a successful compile the resume worker moves the PDF into the store and
+prunes the build folder down to its .tex sources; latexmk's aux files already
+stay in the warm build directory (see Resume/Latex/latex_build.py), where the
+next build reuses them.
+
+The sweep keeps the store bounded. Artifacts no job points to are removed once
+they are older than ARTIFACT_MAX_AGE_DAYS, or oldest first while the store is
+over ARTIFACT_MAX_BYTES; build folders older than ARTIFACT_MAX_AGE_DAYS are
+removed whole. The API runs it every ARTIFACT_SWEEP_INTERVAL seconds, or run it
+by hand:
+
+    cd app && python artifacts.py --dry-run
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+from typing import Awaitable, Callable, Optional, Set
+
+# Resolved, so paths under it compare equal to realpath() of stored files
+ARTIFACT_DIR = os.path.realpath(os.getenv(
+    "ARTIFACT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Resume", "Latex", "artifacts")
+))
+# Retention limits for artifacts no job references; 0 disables a limit
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(1024 ** 3)))
+ARTIFACT_MAX_AGE_DAYS = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "30"))
+# Newer artifacts are never swept: the job they were built for may not point to them yet
+ARTIFACT_GRACE_SECONDS = float(os.getenv("ARTIFACT_GRACE_SECONDS", "3600"))
+# 0 disables the API's periodic sweep
+ARTIFACT_SWEEP_INTERVAL = float(os.getenv("ARTIFACT_SWEEP_INTERVAL", "3600"))
+# Internal nginx location mapped to ARTIFACT_DIR (e.g. /_artifacts/). When set, the API
+# answers with X-Accel-Redirect and nginx sends the file itself with sendfile.
+ARTIFACT_ACCEL_REDIRECT = os.getenv("ARTIFACT_ACCEL_REDIRECT", "")
+
+# Build folder contents kept after a successful compile
+KEEP_EXTENSIONS = (".tex",)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_path(digest: str) -> str:
+    return os.path.join(ARTIFACT_DIR, digest[:2], f"{digest}.pdf")
+
+
+def artifact_digest(path: str) -> Optional[str]:
+    """
+    The sha256 of a path inside the store, read from its name; None for any other
+    path. Symlinks and ".." are resolved first, so nothing outside the store passes.
+    """
+    path = os.path.realpath(path)
+    if os.path.dirname(os.path.dirname(path)) != ARTIFACT_DIR:
+        return None
+    digest = os.path.basename(path)[:-len(".pdf")]
+    return digest if path == artifact_path(digest) else None
+
+
+def store_pdf(path: str) -> dict:
+    """
+    Adds a PDF to the store (hardlinked when on the same filesystem) and returns
+    {"sha256", "path", "size"}. An identical PDF already stored is reused and
+    counts as new again for the age limit.
+    """
+    digest = _sha256_file(path)
+    target = artifact_path(digest)
+    if os.path.exists(target):
+        os.utime(target)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Link or copy under a temporary name first, so a half-written file is never visible
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        try:
+            try:
+                os.link(path, tmp_path)
+            except OSError:
+                shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return {"sha256": digest, "path": target, "size": os.path.getsize(target)}
+
+
+def prune_build_outputs(output_folder: str) -> int:
+    """Removes everything but the .tex sources from a build folder. Returns the bytes freed."""
+    freed = 0
+    for entry in os.scandir(output_folder):
+        if entry.name.endswith(KEEP_EXTENSIONS):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            freed += _tree_size(entry.path)
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            freed += entry.stat(follow_symlinks=False).st_size
+            os.remove(entry.path)
+    return freed
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+def _list_artifacts():
+    """(path, size, mtime) of every stored artifact and leftover temporary file."""
+    if not os.path.isdir(ARTIFACT_DIR):
+        return []
+    found = []
+    for shard in os.scandir(ARTIFACT_DIR):
+        if not shard.is_dir(follow_symlinks=False):
+            continue
+        for entry in os.scandir(shard.path):
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            found.append((entry.path, st.st_size, st.st_mtime))
+    return found
+
+
+def _remove(path: str, dry_run: bool):
+    if dry_run:
+        return
+    try:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def sweep(
+    referenced: Set[str],
+    output_dir: Optional[str] = None,
+    max_bytes: int = ARTIFACT_MAX_BYTES,
+    max_age_days: float = ARTIFACT_MAX_AGE_DAYS,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Applies the retention limits. `referenced` holds the resume_path of every job;
+    those files are always kept. Build folders under output_dir are removed by age only.
+    """
+    now = time.time()
+    referenced = {os.path.realpath(path) for path in referenced}
+    totals = {"artifacts_removed": 0, "folders_removed": 0, "bytes_freed": 0}
+
+    candidates = []
+    stored_bytes = 0
+    for path, size, mtime in _list_artifacts():
+        if path.endswith(".tmp") and now - mtime > ARTIFACT_GRACE_SECONDS:
+            _remove(path, dry_run)  # left behind by a worker that died mid-store
+            continue
+        stored_bytes += size
+        if path not in referenced and now - mtime > ARTIFACT_GRACE_SECONDS:
+            candidates.append((mtime, path, size))
+
+    # Oldest first: past the age limit always, then for as long as the store is too big
+    for mtime, path, size in sorted(candidates):
+        expired = max_age_days and now - mtime > max_age_days * 86400
+        if not expired and not (max_bytes and stored_bytes > max_bytes):
+            break
+        _remove(path, dry_run)
+        stored_bytes -= size
+        totals["artifacts_removed"] += 1
+        totals["bytes_freed"] += size
+    if max_bytes and stored_bytes > max_bytes:
+        logging.warning(f"Resume artifacts use {stored_bytes:,} bytes (limit {max_bytes:,}), most still referenced by jobs")
+
+    if output_dir and max_age_days and os.path.isdir(output_dir):
+        # Folders holding a PDF a job still points to (built before the store existed) are kept
+        referenced_folders = {os.path.dirname(path) for path in referenced}
+        for entry in os.scandir(output_dir):
+            if not entry.is_dir(follow_symlinks=False) or now - entry.stat().st_mtime <= max_age_days * 86400:
+                continue
+            if os.path.realpath(entry.path) in referenced_folders:
+                continue
+            totals["bytes_freed"] += _tree_size(entry.path)
+            _remove(entry.path, dry_run)
+            totals["folders_removed"] += 1
+    totals["bytes_kept"] = stored_bytes
+    return totals
+
+
+class ArtifactSweeper:
+    """Runs sweep() in a thread every ARTIFACT_SWEEP_INTERVAL seconds."""
+
+    def __init__(self, interval: float = ARTIFACT_SWEEP_INTERVAL):
+        self.interval = interval
+        self._task = None
+
+    def start(self, referenced_paths: Callable[[], Awaitable[Set[str]]], output_dir: str):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run(referenced_paths, output_dir))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self, referenced_paths, output_dir):
+        while True:
+            try:
+                referenced = await referenced_paths()
+                totals = await asyncio.to_thread(sweep, referenced, output_dir)
+                if totals["artifacts_removed"] or totals["folders_removed"]:
+                    logging.info(
+                        f"Artifact sweep removed {totals['artifacts_removed']} PDFs and "
+                        f"{totals['folders_removed']} build folders ({totals['bytes_freed']:,} bytes)"
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Artifact sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+artifact_sweeper = ArtifactSweeper()
+
+
+async def run_sweep(dry_run: bool) -> dict:
+    from repository import repository
+    from resume_worker import OUTPUT_DIR
+
+    await repository.connect()
+    try:
+        referenced = await repository.resume_paths()
+    finally:
+        await repository.close()
+    return sweep(referenced, OUTPUT_DIR, dry_run=dry_run)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="report what would be removed without removing it")
+    args = parser.parse_args()
+
+    totals = asyncio.run(run_sweep(args.dry_run))
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(
+        f"{verb} {totals['artifacts_removed']} PDFs and {totals['folders_removed']} build folders "
+        f"({totals['bytes_freed']:,} bytes); {totals['bytes_kept']:,} bytes of PDFs kept"
+    )
+
+
+if __name__ == "__main__":
+    main()
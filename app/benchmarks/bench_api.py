@@ -0,0 +1,211 @@
+"""
+Throughput and latency percentiles of the main job endpoints (create_job,
+get_jobs, get_job, partial_update_job) against seeded datasets.
+
+Requests go through the full ASGI app (middleware, validation, encoding) via
+httpx's in-process transport, so no server is needed. With --backend mongo (the
+default) the database is either a real MongoDB (DATABASE_URL, database
+MONGO_DB_NAME, default "job_tracker_bench") or, with --in-memory,
+mongomock-motor; in-memory numbers are only comparable with other in-memory
+runs. With --backend sqlite it is an embedded SQLite file (--sqlite-path). Either
+is wiped for every dataset size. Needs httpx (and mongomock-motor for
+--in-memory), which the API itself doesn't.
+
+    cd app && python benchmarks/bench_api.py --in-memory --sizes 1000 10000
+    cd app && python benchmarks/bench_api.py --backend sqlite --sizes 1000 10000
+    cd app && python benchmarks/bench_api.py --sizes 1000 10000 100000 --output baseline.json
+    cd app && python benchmarks/bench_api.py --sizes 1000 10000 100000 --baseline baseline.json
+
+bench_backends.py runs this for both backends and compares them.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from bench_serialization import make_jobs
+from report import finish, latency_summary, make_report
+
+SCENARIOS = ["create_job", "get_jobs", "get_job", "partial_update_job"]
+STATUSES = ["Applied", "Interview", "Rejected"]
+SEED_BATCH_SIZE = 1000
+
+
+def use_in_memory_mongo():
+    try:
+        import mongomock_motor
+    except ImportError:
+        sys.exit("--in-memory needs mongomock-motor: pip install mongomock-motor")
+    import motor.motor_asyncio
+
+    # db.py builds its client at import time, so this has to happen before importing the app
+    motor.motor_asyncio.AsyncIOMotorClient = lambda *args, **kwargs: mongomock_motor.AsyncMongoMockClient()
+
+
+async def seed_mongo(docs):
+    from db import descriptions_collection, ensure_indexes, jobs_collection
+    from descriptions import encode_description, split_description
+
+    await jobs_collection.delete_many({})
+    await descriptions_collection.delete_many({})
+    # Stored the way the API stores them: summaries in jobs, compressed text in job_descriptions
+    descriptions = [{"_id": doc["_id"], **encode_description(split_description(doc))} for doc in docs]
+    for start in range(0, len(docs), SEED_BATCH_SIZE):
+        await jobs_collection.insert_many(docs[start:start + SEED_BATCH_SIZE], ordered=False)
+        await descriptions_collection.insert_many(descriptions[start:start + SEED_BATCH_SIZE], ordered=False)
+    await ensure_indexes()
+    return [str(doc["_id"]) for doc in docs]
+
+
+async def seed_sqlite(repository, docs):
+    await repository.pool.run(lambda conn: conn.executescript(
+        "DELETE FROM jobs; DELETE FROM job_transitions; INSERT INTO jobs_fts (jobs_fts) VALUES ('delete-all');"
+    ))
+    results = await repository.bulk_insert(docs, SEED_BATCH_SIZE)
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        raise RuntimeError(f"{len(failed)} seed jobs failed, e.g. {failed[0]['error']}")
+    return [r["id"] for r in results]
+
+
+async def seed(size, description_words):
+    from repository import repository
+
+    docs = make_jobs(size, description_words)
+    if repository.name == "mongo":
+        ids = await seed_mongo(docs)
+    else:
+        ids = await seed_sqlite(repository, docs)
+    await repository.get_counters(recompute=True)
+    return ids
+
+
+async def run_scenario(send, total, concurrency):
+    """Runs `send(i)` for i in range(total) on `concurrency` workers; returns (latencies in ms, elapsed s)."""
+    samples = []
+    next_index = iter(range(total))
+
+    async def worker():
+        for i in next_index:
+            start = time.perf_counter()
+            response = await send(i)
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text[:200]}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+async def bench_size(client, size, args, rng):
+    from cache import job_cache
+
+    print(f"Seeding {size:,} jobs...")
+    ids = await seed(size, args.description_words)
+    cursors = {}
+
+    def cold():
+        if args.cold:
+            job_cache.invalidate()
+
+    async def create_job(i):
+        return await client.post("/jobs", json={
+            "title": "Benchmark Engineer",
+            "company": f"Bench {i % 50}",
+            "description": "benchmark " * args.description_words,
+            "url": f"https://bench.example.com/new/{size}/{i}",
+            "status": rng.choice(STATUSES),
+            "date_applied": "2024-06-01",
+        })
+
+    async def get_jobs(i):
+        # Each of the concurrent readers pages through its own status filter
+        worker = i % args.concurrency
+        params = {"limit": args.page_size, "status": STATUSES[worker % len(STATUSES)]}
+        if cursors.get(worker):
+            params["after"] = cursors[worker]
+        cold()
+        response = await client.get("/jobs", params=params)
+        cursors[worker] = response.json().get("next_cursor") if response.status_code == 200 else None
+        return response
+
+    async def get_job(i):
+        cold()
+        return await client.get(f"/jobs/{rng.choice(ids)}")
+
+    async def partial_update_job(i):
+        return await client.patch(f"/jobs/{rng.choice(ids)}", json={"status": rng.choice(STATUSES)})
+
+    senders = {"create_job": create_job, "get_jobs": get_jobs, "get_job": get_job, "partial_update_job": partial_update_job}
+    results = {}
+    for scenario in args.scenarios:
+        samples, elapsed = await run_scenario(senders[scenario], args.requests, args.concurrency)
+        results[f"{size}/{scenario}"] = latency_summary(samples, elapsed)
+        print(f"  {scenario:<20} {results[f'{size}/{scenario}']['throughput_rps']:>10} req/s  p95 {results[f'{size}/{scenario}']['p95_ms']} ms")
+    return results
+
+
+async def run(args):
+    import httpx
+
+    import main
+    from repository import repository
+
+    rng = random.Random(args.seed)
+    results = {}
+    # The ASGI transport doesn't run the app's lifespan, so connect here
+    await repository.connect()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for size in args.sizes:
+                results.update(await bench_size(client, size, args, rng))
+    finally:
+        await repository.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="seeded dataset sizes, e.g. 1000 10000 100000")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--description-words", type=int, default=100)
+    parser.add_argument("--cold", action="store_true", help="invalidate the response cache before every read")
+    parser.add_argument("--backend", choices=["mongo", "sqlite"], default="mongo")
+    parser.add_argument("--in-memory", action="store_true", help="use mongomock-motor instead of MongoDB")
+    parser.add_argument("--db-name", default="job_tracker_bench", help="MongoDB database to (re)seed")
+    parser.add_argument("--sqlite-path", help="SQLite file to (re)seed; default a temporary file")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the JSON report here (e.g. as a baseline)")
+    parser.add_argument("--baseline", help="compare with a saved report; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that counts as a regression")
+    args = parser.parse_args()
+
+    os.environ["MONGO_DB_NAME"] = args.db_name
+    if args.backend == "sqlite":
+        if args.in_memory:
+            parser.error("--in-memory only applies to --backend mongo")
+        path = args.sqlite_path or os.path.join(tempfile.mkdtemp(prefix="bench_api_"), "jobs.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(path)}"
+    elif not os.getenv("DATABASE_URL", "mongodb").startswith("mongodb"):
+        os.environ["DATABASE_URL"] = "mongodb://localhost:27017/job_tracker"
+    if args.in_memory:
+        use_in_memory_mongo()
+    results = asyncio.run(run(args))
+
+    config = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "threshold")}
+    sys.exit(finish(make_report("api", config, results), args.output, args.baseline, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Runs the API benchmark (bench_api.py) once per storage backend with the same
+workload and prints the two side by side.
+
+Each backend runs in its own process, since the backend is chosen when the app
+is imported. Arguments after "--" go to bench_api.py unchanged.
+
+    cd app && python benchmarks/bench_backends.py -- --sizes 1000 10000
+    cd app && python benchmarks/bench_backends.py --output-dir bench_results -- --in-memory --sizes 1000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from report import HIGHER_IS_BETTER
+
+BENCH_API = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_api.py")
+BACKENDS = ["mongo", "sqlite"]
+# Shown in the comparison; the full reports are in --output-dir
+METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+# Applies to the Mongo run only
+MONGO_ONLY_ARGS = {"--in-memory"}
+
+
+def run_backend(backend, bench_args, output):
+    args = [arg for arg in bench_args if backend == "mongo" or arg not in MONGO_ONLY_ARGS]
+    command = [sys.executable, BENCH_API, "--backend", backend, "--output", output, *args]
+    print(f"=== {backend}: {' '.join(command[1:])}")
+    subprocess.run(command, check=True)
+    with open(output, "r") as f:
+        return json.load(f)
+
+
+def print_comparison(reports):
+    mongo, sqlite = reports["mongo"]["results"], reports["sqlite"]["results"]
+    print(f"\n{'scenario':<32}{'metric':<16}{'mongo':>12}{'sqlite':>12}{'sqlite/mongo':>14}  better")
+    for scenario in mongo:
+        if scenario not in sqlite:
+            continue
+        for metric in METRICS:
+            a, b = mongo[scenario].get(metric), sqlite[scenario].get(metric)
+            if not isinstance(a, (int, float)) or not isinstance(b, (int, float)) or not a:
+                continue
+            better = "sqlite" if (b > a) == (metric in HIGHER_IS_BETTER) else "mongo"
+            print(f"{scenario:<32}{metric:<16}{a:>12.3f}{b:>12.3f}{b / a:>13.2f}x  {better}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", help="keep each backend's JSON report here (default: a temporary directory)")
+    parser.add_argument("bench_args", nargs=argparse.REMAINDER, help="arguments for bench_api.py, after --")
+    args = parser.parse_args()
+    bench_args = args.bench_args[1:] if args.bench_args[:1] == ["--"] else args.bench_args
+
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix="bench_backends_")
+    os.makedirs(output_dir, exist_ok=True)
+    reports = {backend: run_backend(backend, bench_args, os.path.join(output_dir, f"{backend}.json")) for backend in BACKENDS}
+    print_comparison(reports)
+    print(f"\nReports saved in {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Near-duplicate index (near_duplicates.py) at scale: signature time, LSH lookup
+latency and recall over synthetic postings, a share of which are reposts of an
+earlier posting with a few words edited.
+
+    cd app && python benchmarks/bench_near_duplicates.py --postings 100000
+    cd app && python benchmarks/bench_near_duplicates.py --postings 10000 --output near_dup.json
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_duplicates import NearDuplicateIndex, signature
+from report import finish, latency_summary, make_report
+
+VOCABULARY = (
+    "kubernetes terraform python aws pipeline deploy monitoring incident platform engineer scalable "
+    "distributed latency service team ownership docker ci cd observability postgres kafka on-call "
+    "reliability infrastructure automation react typescript frontend backend api design review mentor "
+    "customers product roadmap data warehouse spark airflow security compliance cloud gcp azure linux "
+    "networking storage performance testing quality release growth startup remote hybrid salary equity"
+).split()
+# Shared by every posting, like the equal-opportunity paragraph most boards append
+BOILERPLATE = (
+    "we are an equal opportunity employer and value diversity at our company we do not discriminate "
+    "on the basis of race religion color national origin gender sexual orientation age or disability"
+)
+
+
+def make_posting(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)) + " " + BOILERPLATE
+
+
+def repost(rng: random.Random, text: str, edits: int) -> str:
+    """The same posting with a few words replaced, as companies do when relisting a role."""
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    index = NearDuplicateIndex()
+    originals = []
+    signature_ms = []
+    start = time.perf_counter()
+    for i in range(args.postings):
+        text = make_posting(rng, args.words)
+        t0 = time.perf_counter()
+        sig = signature(text)
+        signature_ms.append((time.perf_counter() - t0) * 1000)
+        index.add(f"job-{i}", sig)
+        if len(originals) < args.queries:
+            originals.append((f"job-{i}", text))
+    build_s = time.perf_counter() - start
+    print(f"Indexed {args.postings} postings in {build_s:.1f}s")
+
+    # Half the queries are reposts of an indexed posting, half unrelated new postings
+    lookup_ms, found, false_matches = [], 0, 0
+    queries = []
+    for job_id, text in originals:
+        queries.append((job_id, signature(repost(rng, text, args.edits))))
+        queries.append((None, signature(make_posting(rng, args.words))))
+    start = time.perf_counter()
+    for expected, sig in queries:
+        t0 = time.perf_counter()
+        matches = index.query(sig)
+        lookup_ms.append((time.perf_counter() - t0) * 1000)
+        if expected is None:
+            false_matches += bool(matches)
+        elif any(job_id == expected for job_id, _ in matches):
+            found += 1
+    lookup = latency_summary(lookup_ms, time.perf_counter() - start)
+    lookup["recall"] = round(found / len(originals), 4)
+    lookup["false_positive_rate"] = round(false_matches / len(originals), 4)
+    return {
+        "signature": latency_summary(signature_ms, build_s),
+        "lookup": lookup,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000, help="reposts looked up (and as many new postings)")
+    parser.add_argument("--words", type=int, default=300, help="words per posting, before the boilerplate")
+    parser.add_argument("--edits", type=int, default=5, help="words changed in a repost")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="save the JSON report here (e.g. as a baseline)")
+    parser.add_argument("--baseline", help="compare with a saved report; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that counts as a regression")
+    args = parser.parse_args()
+
+    results = run(args)
+    config = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "threshold")}
+    sys.exit(finish(make_report("near_duplicates", config, results), args.output, args.baseline, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
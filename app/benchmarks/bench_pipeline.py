@@ -0,0 +1,182 @@
+"""
+End-to-end throughput of the resume pipeline (generate.py via batch.py) with a
+fake LLM of configurable latency and either a stubbed or the real latexmk.
+
+Everything runs in a scratch directory: a synthetic knowledge bank, synthetic
+job descriptions, and fresh build/ranking/LLM caches, so runs are repeatable.
+The stub latexmk/pdflatex only sleep and write a placeholder PDF, which isolates
+the pipeline's own overhead; --latexmk real measures actual TeX builds.
+
+    cd app && python benchmarks/bench_pipeline.py --resumes 50 --workers 4 --llm-delay 0.5
+    cd app && python benchmarks/bench_pipeline.py --latexmk real --resumes 10 --output pipeline.json
+    cd app && python benchmarks/bench_pipeline.py --baseline pipeline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME_DIR = os.path.join(APP_DIR, "Resume", "Latex")
+sys.path.insert(0, APP_DIR)
+
+from bench_serialization import WORDS
+from report import finish, latency_summary, make_report
+
+STAGES = ["rank", "llm", "compile_queue", "compile", "total"]
+
+# Stand-ins for the TeX tools: pdflatex -ini writes the preamble format, latexmk
+# writes a PDF into -outdir. Both sleep for BENCH_LATEX_DELAY seconds.
+STUB_PDFLATEX = """#!{python}
+import os, sys, time
+time.sleep(float(os.environ.get("BENCH_LATEX_DELAY", "0")))
+for arg in sys.argv[1:]:
+    if arg.startswith("-jobname="):
+        open(arg.split("=", 1)[1] + ".fmt", "w").close()
+"""
+STUB_LATEXMK = """#!{python}
+import os, sys, time
+time.sleep(float(os.environ.get("BENCH_LATEX_DELAY", "0")))
+outdir = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("-outdir=")), ".")
+with open(os.path.join(outdir, "resume.pdf"), "w") as f:
+    f.write("%PDF-1.4 benchmark stub")
+"""
+
+
+def install_latex_stubs(workdir, delay):
+    bin_dir = os.path.join(workdir, "bin")
+    os.makedirs(bin_dir)
+    for name, source in (("pdflatex", STUB_PDFLATEX), ("latexmk", STUB_LATEXMK)):
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(source.format(python=sys.executable))
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+    os.environ["BENCH_LATEX_DELAY"] = str(delay)
+
+
+def make_knowledge_bank(rng, roles=4, bullets_per_role=10, projects=8):
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+
+    return {
+        "skills": {
+            "Languages": ["Python", "Go", "Kotlin", "Bash", "SQL"],
+            "Cloud & DevOps": ["AWS", "Terraform", "Kubernetes", "Docker", "Jenkins", "Helm", "Prometheus"],
+            "Frameworks": ["Django", "FastAPI", "React", "Android SDK"],
+        },
+        "experience": [
+            {
+                "company": f"Company {r}",
+                "role": "Software Engineer",
+                "duration": f"{2015 + 2 * r} -- {2017 + 2 * r}",
+                "location": "Remote",
+                "bullets": [sentence(18) for _ in range(bullets_per_role)],
+            }
+            for r in range(roles)
+        ],
+        "projects": [
+            {"name": f"Project {p}", "tech": ", ".join(rng.sample(WORDS, 3)), "bullets": [sentence(16) for _ in range(2)]}
+            for p in range(projects)
+        ],
+    }
+
+
+def make_job_descriptions(rng, count, words=400):
+    return [{"id": f"bench-{i}", "description": " ".join(rng.choice(WORDS) for _ in range(words))} for i in range(count)]
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        # generate.py reads these when it is imported
+        os.environ["RESUME_BUILD_DIR"] = os.path.join(workdir, "build")
+        os.environ["RESUME_RANK_CACHE_DIR"] = os.path.join(workdir, "rank_cache")
+        os.environ["RESUME_LLM_CACHE_DIR"] = os.path.join(workdir, "llm_cache")
+        os.environ["RESUME_LLM_CACHE"] = "1" if args.llm_cache else "0"
+        if args.latexmk == "stub":
+            install_latex_stubs(workdir, args.latex_delay)
+        sys.path.insert(0, RESUME_DIR)
+        import batch
+        from llm import FakeLLMClient
+
+        knowledge_bank_path = os.path.join(workdir, "knowledge_bank.json")
+        with open(knowledge_bank_path, "w") as f:
+            json.dump(make_knowledge_bank(rng), f)
+        # The template sections are realistic, valid model answers
+        responses = {}
+        for section in ("skills", "experience", "projects"):
+            with open(os.path.join(RESUME_DIR, f"{section}.tex")) as f:
+                responses[section] = f.read()
+        llm_client = FakeLLMClient(responses=responses, delay=args.llm_delay, jitter=args.llm_jitter, seed=args.seed)
+
+        jobs = make_job_descriptions(rng, args.resumes)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            records, elapsed = batch.run_batch(
+                jobs,
+                knowledge_bank_path=knowledge_bank_path,
+                base_resume_path=RESUME_DIR,
+                output_base_folder=os.path.join(workdir, "out"),
+                llm_client=llm_client,
+                state=batch.BatchState(os.path.join(workdir, "state.jsonl")),
+                workers=args.workers,
+                latex_concurrency=args.latex_concurrency,
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    done = [r for r in records if r["status"] == "done"]
+    if not done:
+        sys.exit(f"No resume was generated; rerun with --verbose. Last output:\n{output.getvalue()[-2000:]}")
+    summary = latency_summary([r["timings"]["total"] * 1000 for r in done], elapsed)
+    results = {
+        "pipeline": {
+            "resumes": len(done),
+            "failed": len(records) - len(done),
+            "throughput_per_min": round(len(done) / elapsed * 60, 2),
+            **{k: v for k, v in summary.items() if k.endswith("_ms")},
+        }
+    }
+    for stage in STAGES:
+        samples = [r["timings"][stage] * 1000 for r in done if stage in r["timings"]]
+        if samples:
+            stage_summary = latency_summary(samples, elapsed)
+            results[f"stage/{stage}"] = {k: stage_summary[k] for k in ("mean_ms", "p50_ms", "p95_ms")}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latex-concurrency", type=int, default=None, help="default: CPU count")
+    parser.add_argument("--llm-delay", type=float, default=0.2, help="fake model latency per call, seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--llm-cache", action="store_true", help="keep the on-disk LLM cache enabled")
+    parser.add_argument("--latexmk", choices=["stub", "real"], default="stub")
+    parser.add_argument("--latex-delay", type=float, default=0.05, help="stub build time, seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+    parser.add_argument("--output", help="save the JSON report here (e.g. as a baseline)")
+    parser.add_argument("--baseline", help="compare with a saved report; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that counts as a regression")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run(args)
+    print(f"Ran {args.resumes} resumes in {time.perf_counter() - start:.1f}s")
+    config = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "threshold", "verbose")}
+    sys.exit(finish(make_report("pipeline", config, results), args.output, args.baseline, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
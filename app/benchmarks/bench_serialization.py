@@ -0,0 +1,124 @@
+"""
+Payload size and encode time of a GET /jobs-style list response, comparing
+FastAPI's default path (response_model validation + jsonable_encoder + stdlib
+json) with the fast path in serialization.py (orjson / msgpack, plus gzip).
+
+    cd app && python benchmarks/bench_serialization.py --jobs 10000
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from models import JobOut, to_job_out
+from serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode
+
+WORDS = (
+    "kubernetes terraform python aws pipeline deploy monitoring incident platform "
+    "engineer scalable distributed latency service team ownership docker ci cd "
+    "observability postgres kafka on-call reliability infrastructure automation"
+).split()
+
+
+def make_jobs(n: int, description_words: int, seed: int = 42) -> List[dict]:
+    """Documents shaped like rows read from the jobs collection."""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    statuses = ["Applied", "Interview", "Rejected"]
+    jobs = []
+    for i in range(n):
+        jobs.append({
+            "_id": ObjectId(),
+            "title": f"{rng.choice(['Senior', 'Staff', 'Junior', ''])} {rng.choice(WORDS).title()} Engineer".strip(),
+            "company": f"Company {rng.randrange(n // 10 or 1)}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(description_words)),
+            "url": f"https://jobs.example.com/view/{i}",
+            "url_normalized": f"jobs.example.com/view/{i}",
+            "status": rng.choice(statuses),
+            "date_applied": (start + timedelta(days=rng.randrange(365))).isoformat(),
+            "resume_path": None,
+            "notes": None,
+            "created_at": datetime(2024, 1, 1) + timedelta(seconds=i),
+        })
+    return jobs
+
+
+def timed(fn, repeat: int):
+    """Best-of-`repeat` wall time in ms, and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run(n: int, description_words: int, repeat: int) -> dict:
+    docs = make_jobs(n, description_words)
+    adapter = TypeAdapter(List[JobOut])
+
+    def baseline():
+        # What FastAPI does for `response_model=List[JobOut]` returning dicts
+        rows = [{**d, "id": str(d["_id"])} for d in docs]
+        validated = adapter.validate_python(rows)
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode()
+
+    def fast(media_type):
+        def encode_page():
+            items = [to_job_out(dict(d)) for d in docs]
+            return encode({"items": items, "next_cursor": None}, media_type)
+        return encode_page
+
+    results = {}
+    for name, fn in (
+        ("baseline_json", baseline),
+        ("orjson", fast(JSON_MEDIA_TYPE)),
+        ("msgpack", fast(MSGPACK_MEDIA_TYPE)),
+    ):
+        encode_ms, body = timed(fn, repeat)
+        gzip_ms, gzipped = timed(lambda: gzip.compress(body, compresslevel=5), repeat)
+        results[name] = {
+            "encode_ms": round(encode_ms, 2),
+            "bytes": len(body),
+            "gzip_ms": round(gzip_ms, 2),
+            "gzip_bytes": len(gzipped),
+        }
+    return {"jobs": n, "description_words": description_words, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--description-words", type=int, default=400, help="~400 words is a typical posting")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    report = run(args.jobs, args.description_words, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    base = report["results"]["baseline_json"]
+    print(f"{report['jobs']} jobs, ~{report['description_words']} words per description (best of {args.repeat})")
+    print(f"{'path':<15}{'encode ms':>12}{'bytes':>14}{'gzip ms':>10}{'gzip bytes':>14}{'speedup':>10}")
+    for name, r in report["results"].items():
+        speedup = base["encode_ms"] / r["encode_ms"] if r["encode_ms"] else float("inf")
+        print(f"{name:<15}{r['encode_ms']:>12.1f}{r['bytes']:>14,}{r['gzip_ms']:>10.1f}{r['gzip_bytes']:>14,}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Shared helpers for the benchmark scripts: latency summaries, JSON reports and
+comparison against a saved baseline.
+
+    python benchmarks/bench_api.py --output baseline.json
+    ... change something ...
+    python benchmarks/bench_api.py --baseline baseline.json   # exits 1 on a regression
+"""
+import json
+import math
+import platform
+import sys
+from datetime import datetime, timezone
+
+# Metrics where a larger value is an improvement; every other metric is a cost
+HIGHER_IS_BETTER = {"throughput_rps", "throughput_per_min"}
+# Single-sample extremes are too noisy to gate on
+NOT_COMPARED = {"requests", "resumes", "failed", "max_ms"}
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def latency_summary(samples_ms, elapsed_s):
+    """Throughput and latency percentiles for one scenario (samples in milliseconds)."""
+    if not samples_ms:
+        return {"requests": 0}
+    return {
+        "requests": len(samples_ms),
+        "throughput_rps": round(len(samples_ms) / elapsed_s, 2) if elapsed_s > 0 else None,
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3),
+        "p50_ms": round(percentile(samples_ms, 0.50), 3),
+        "p95_ms": round(percentile(samples_ms, 0.95), 3),
+        "p99_ms": round(percentile(samples_ms, 0.99), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+
+def make_report(benchmark, config, results):
+    return {
+        "benchmark": benchmark,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=0.10):
+    """
+    Compares every numeric metric present in both reports. Returns rows of
+    (scenario, metric, baseline value, current value, relative change, regressed).
+    """
+    rows = []
+    for scenario, metrics in report["results"].items():
+        base_metrics = baseline.get("results", {}).get(scenario)
+        if not base_metrics:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if metric in NOT_COMPARED or not isinstance(value, (int, float)) or not isinstance(base, (int, float)) or not base:
+                continue
+            change = (value - base) / base
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append((scenario, metric, base, value, change, worse > threshold))
+    return rows
+
+
+def print_results(report):
+    for scenario, metrics in report["results"].items():
+        details = "  ".join(f"{k}={v}" for k, v in metrics.items())
+        print(f"{scenario:<32} {details}")
+
+
+def finish(report, output=None, baseline=None, threshold=0.10):
+    """Prints (and optionally saves) the report; with a baseline, returns exit status 1 on regressions."""
+    print_results(report)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {output}")
+    if not baseline:
+        return 0
+    with open(baseline, "r") as f:
+        rows = compare(report, json.load(f), threshold)
+    regressions = [row for row in rows if row[5]]
+    print(f"\nCompared with {baseline} (regression threshold {threshold:.0%}):")
+    for scenario, metric, base, value, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{scenario:<32}{metric:<20}{base:>12.3f}{value:>12.3f}{change:>+9.1%}{flag}")
+    if regressions:
+        print(f"{len(regressions)} metrics regressed by more than {threshold:.0%}")
+        return 1
+    print("No regressions")
+    return 0
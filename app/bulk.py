@@ -0,0 +1,212 @@
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from descriptions import delete_descriptions, save_descriptions, split_description
+from models import JobIn, JobUpdate, normalize_url
+from stats import apply_counter_deltas
+
+# Documents per insert_many/bulk_write call. Mongo splits oversized batches itself,
+# but smaller chunks keep each round trip (and its error report) bounded.
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "10000"))
+
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors()
+    )
+
+
+def item_result(index: int, job_id=None, error: str = None) -> dict:
+    return {"index": index, "id": job_id, "ok": error is None, "error": error}
+
+
+def _write_error_message(write_error: dict) -> str:
+    return write_error.get("errmsg", "Write failed")
+
+
+# The prepare_* helpers validate a bulk request the same way for every storage
+# backend (see repository.py). Each returns the results list, with the rejected
+# items already filled in, and the valid items to write.
+
+def prepare_inserts(items: List[Dict[str, Any]]):
+    """Validates items against JobIn. Valid items are (request index, job document with description)."""
+    results = [None] * len(items)
+    valid = []
+    now = datetime.utcnow()
+    for index, item in enumerate(items):
+        try:
+            job_dict = JobIn.model_validate(item).model_dump(mode="json")
+        except ValidationError as e:
+            results[index] = item_result(index, error=_validation_message(e))
+            continue
+        job_dict["created_at"] = now
+        job_dict["url_normalized"] = normalize_url(job_dict["url"])
+        valid.append((index, job_dict))
+    return results, valid
+
+
+def prepare_updates(items: List[Dict[str, Any]]):
+    """
+    Validates {"id": ..., <JobUpdate fields>} items. Valid items are (request index, ObjectId, fields to set).
+    A job may appear once per request: the status transitions are counted from statuses
+    read before the writes, so a second update of the same job would count its old status twice.
+    """
+    results = [None] * len(items)
+    valid = []
+    seen = set()
+    now = datetime.utcnow()
+    for index, item in enumerate(items):
+        job_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(job_id, str) or not ObjectId.is_valid(job_id):
+            results[index] = item_result(index, job_id=job_id if isinstance(job_id, str) else None, error="Invalid job ID")
+            continue
+        if ObjectId(job_id) in seen:
+            results[index] = item_result(index, job_id=job_id, error="Job already updated earlier in this request")
+            continue
+        fields = {k: v for k, v in item.items() if k != "id"}
+        try:
+            job_dict = JobUpdate.model_validate(fields).model_dump(exclude_unset=True, mode="json")
+        except ValidationError as e:
+            results[index] = item_result(index, job_id=job_id, error=_validation_message(e))
+            continue
+        if not job_dict:
+            results[index] = item_result(index, job_id=job_id, error="No fields to update")
+            continue
+        job_dict["updated_at"] = now
+        if job_dict.get("url"):
+            job_dict["url_normalized"] = normalize_url(job_dict["url"])
+        seen.add(ObjectId(job_id))
+        valid.append((index, ObjectId(job_id), job_dict))
+    return results, valid
+
+
+def prepare_deletes(ids: List[str]):
+    """Valid items are (request index, ObjectId)."""
+    results = [None] * len(ids)
+    valid = []
+    for index, job_id in enumerate(ids):
+        if not ObjectId.is_valid(job_id):
+            results[index] = item_result(index, job_id=job_id, error="Invalid job ID")
+            continue
+        valid.append((index, ObjectId(job_id)))
+    return results, valid
+
+
+async def bulk_insert(
+    collection, descriptions_collection, items: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE
+) -> List[dict]:
+    """
+    Validates each item against JobIn and inserts the valid ones with unordered insert_many.
+    Descriptions go to descriptions_collection (see descriptions.py).
+    """
+    results, valid = prepare_inserts(items)
+    valid = [(index, job_dict, split_description(job_dict)) for index, job_dict in valid]
+
+    for _, chunk in chunks(valid, chunk_size):
+        docs = [doc for _, doc, _ in chunk]
+        failed = {}
+        try:
+            # insert_many assigns each document its _id client-side before sending
+            await collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {err["index"]: _write_error_message(err) for err in e.details.get("writeErrors", [])}
+        created = []
+        descriptions = {}
+        for position, (index, doc, description) in enumerate(chunk):
+            if position in failed:
+                results[index] = item_result(index, error=failed[position])
+            else:
+                results[index] = item_result(index, job_id=str(doc["_id"]))
+                created.append(doc["status"])
+                descriptions[doc["_id"]] = description
+        await save_descriptions(descriptions_collection, descriptions)
+        await apply_counter_deltas(created=created)
+    return results
+
+
+async def bulk_update(
+    collection, descriptions_collection, items: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE
+) -> List[dict]:
+    """
+    Applies per-item partial updates ({"id": ..., <JobUpdate fields>}) with unordered bulk_write.
+    New descriptions go to descriptions_collection.
+    """
+    results, valid = prepare_updates(items)
+    valid = [(index, oid, job_dict, split_description(job_dict)) for index, oid, job_dict in valid]
+
+    for _, chunk in chunks(valid, chunk_size):
+        # bulk_write only reports aggregate counts, so look up which IDs exist up front
+        # to be able to report "not found" per item.
+        # The same lookup gives the current statuses for the stats counters.
+        existing = {
+            doc["_id"]: doc.get("status")
+            async for doc in collection.find({"_id": {"$in": [oid for _, oid, _, _ in chunk]}}, {"status": 1})
+        }
+        ops, op_items = [], []
+        for index, oid, job_dict, description in chunk:
+            if oid not in existing:
+                results[index] = item_result(index, job_id=str(oid), error="Job not found")
+                continue
+            update = {"$set": job_dict}
+            if description is not None:
+                update["$unset"] = {"description": ""}
+            ops.append(UpdateOne({"_id": oid}, update))
+            op_items.append((index, oid, job_dict.get("status"), description))
+        if not ops:
+            continue
+
+        failed = {}
+        try:
+            await collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed = {err["index"]: _write_error_message(err) for err in e.details.get("writeErrors", [])}
+        transitions = []
+        descriptions = {}
+        for position, (index, oid, new_status, description) in enumerate(op_items):
+            results[index] = item_result(index, job_id=str(oid), error=failed.get(position))
+            if position in failed:
+                continue
+            if new_status:
+                transitions.append((existing[oid], new_status))
+            if description is not None:
+                descriptions[oid] = description
+        await save_descriptions(descriptions_collection, descriptions)
+        await apply_counter_deltas(transitions=transitions)
+    return results
+
+
+async def bulk_delete(
+    collection, descriptions_collection, ids: List[str], chunk_size: int = BULK_CHUNK_SIZE
+) -> List[dict]:
+    """Deletes the given job IDs (and their descriptions) in chunks, reporting invalid and missing IDs per item."""
+    results, valid = prepare_deletes(ids)
+
+    for _, chunk in chunks(valid, chunk_size):
+        oids = [oid for _, oid in chunk]
+        existing = {doc["_id"]: doc.get("status") async for doc in collection.find({"_id": {"$in": oids}}, {"status": 1})}
+        if existing:
+            await collection.delete_many({"_id": {"$in": list(existing)}})
+            await delete_descriptions(descriptions_collection, existing)
+            await apply_counter_deltas(deleted=existing.values())
+        for index, oid in chunk:
+            error = None if oid in existing else "Job not found"
+            results[index] = item_result(index, job_id=str(oid), error=error)
+    return results
+
+
+def summarize(results: List[dict]) -> dict:
+    succeeded = sum(1 for r in results if r["ok"])
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+from fastapi import Request, Response
+
+# The cache is per process: with several workers a write on one only invalidates
+# its own copy, so the TTL bounds how stale another worker's answer can be.
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared load whose caller was cancelled; its followers retry instead of failing."""
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of encoded responses with single-flight loading: concurrent
+    misses on the same key share one loader call instead of each querying Mongo.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: dict = {}
+        # Bumped on every invalidation; a load that started before a write must not be stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def _get(self, key):
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set(self, key, entry: CachedResponse):
+        self._entries[key] = (time.monotonic() + self.ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        entry = self._get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LeaderCancelled:
+                # The first waiter to get here becomes the new leader, the others follow it;
+                # counted once, by the retry
+                self.coalesced -= 1
+                return await self.get_or_load(key, loader)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            entry = await loader()
+        except asyncio.CancelledError:
+            # One client disconnecting must not fail the requests that joined its load
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved so an unawaited future doesn't log a warning
+            raise
+        else:
+            future.set_result(entry)
+            if generation == self._generation:
+                self._set(key, entry)
+        finally:
+            self._inflight.pop(key, None)
+        return entry
+
+    def invalidate(self):
+        """Drops everything. Any write can change any list page, so lists can't be invalidated selectively."""
+        self._generation += 1
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Turns a cache entry into a 200, or a bodiless 304 when the client already has this ETag."""
+    # no-cache: clients may store the response but must revalidate it with If-None-Match
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if entry.etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+
+job_cache = ResponseCache()
@@ -0,0 +1,140 @@
+"""
+Split-out storage for job descriptions.
+
+A posting is several KB of text that only GET /jobs/{job_id}, the export and
+resume generation read. Kept inline on the job document, it was carried through
+every list page, search result and find_one_and_update. It now lives in its own
+collection, one zstd-compressed document per job, keyed by the job's _id:
+
+    {"_id": <job ObjectId>, "codec": "zstd", "data": <bytes>, "size": <UTF-8 bytes>}
+
+Job documents keep `description_size` and `description_keywords` (the
+posting's most frequent terms), which the job_text index searches in place of
+the full text.
+
+Documents written before the split still carry an inline `description` until
+migrate_descriptions.py has moved it; the readers here fall back to it.
+
+Functions that touch the database take the collection as an argument, like
+bulk.py. batch.py, which uses a synchronous client, only needs decode_description.
+"""
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import zstandard
+from pymongo import ReplaceOne
+
+# zstd level for new descriptions. Descriptions are written once and read rarely,
+# so a higher level than zstd's default (3) costs little.
+DESCRIPTION_ZSTD_LEVEL = int(os.getenv("DESCRIPTION_ZSTD_LEVEL", "9"))
+# Shorter texts are stored as-is; compression doesn't pay for its frame overhead
+DESCRIPTION_COMPRESS_MIN_BYTES = int(os.getenv("DESCRIPTION_COMPRESS_MIN_BYTES", "256"))
+# Distinct terms of each description kept on the job document for text search
+DESCRIPTION_KEYWORDS = int(os.getenv("DESCRIPTION_KEYWORDS", "100"))
+# Job IDs per $in lookup when descriptions are joined onto a stream of jobs
+DESCRIPTION_BATCH_SIZE = int(os.getenv("DESCRIPTION_BATCH_SIZE", "500"))
+
+# Fields the split adds to job documents; internal, never part of API responses
+DESCRIPTION_FIELDS = ("description_size", "description_keywords")
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+# Frequent words that would otherwise crowd out the terms worth searching for
+STOPWORDS = {
+    "a", "about", "all", "also", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from", "has",
+    "have", "in", "is", "it", "its", "more", "of", "on", "or", "our", "that", "the", "their", "this", "to",
+    "we", "what", "who", "will", "with", "you", "your",
+}
+
+
+def encode_description(text: str) -> dict:
+    """The side-collection fields for `text` (everything but _id)."""
+    raw = text.encode("utf-8")
+    if len(raw) < DESCRIPTION_COMPRESS_MIN_BYTES:
+        return {"codec": "none", "data": raw, "size": len(raw)}
+    data = zstandard.ZstdCompressor(level=DESCRIPTION_ZSTD_LEVEL).compress(raw)
+    return {"codec": "zstd", "data": data, "size": len(raw)}
+
+
+def decode_description(doc: dict) -> str:
+    data = bytes(doc["data"])
+    if doc["codec"] == "zstd":
+        # compress() records the content size in the frame, so no max_output_size is needed
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif doc["codec"] != "none":
+        raise ValueError(f"Unknown description codec {doc['codec']!r}")
+    return data.decode("utf-8")
+
+
+def extract_keywords(text: str, limit: int = DESCRIPTION_KEYWORDS) -> str:
+    """The `limit` most frequent non-stopword terms of `text`, most frequent first."""
+    counts = Counter(word for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS)
+    return " ".join(word for word, _ in counts.most_common(limit))
+
+
+def split_description(job_dict: dict) -> Optional[str]:
+    """
+    Pops `description` off a job document about to be written and sets the fields
+    that stand in for it there. Returns the text (None if the dict had none), which
+    the caller stores with save_description(s).
+    """
+    if "description" not in job_dict:
+        return None
+    text = job_dict.pop("description") or ""
+    job_dict["description_size"] = len(text.encode("utf-8"))
+    job_dict["description_keywords"] = extract_keywords(text)
+    return text
+
+
+async def save_description(collection, job_id, text: str):
+    await collection.replace_one({"_id": job_id}, encode_description(text), upsert=True)
+
+
+async def save_descriptions(collection, descriptions: Dict):
+    """Upserts {job_id: text} in one unordered bulk write."""
+    if descriptions:
+        await collection.bulk_write(
+            [ReplaceOne({"_id": job_id}, encode_description(text), upsert=True) for job_id, text in descriptions.items()],
+            ordered=False,
+        )
+
+
+async def delete_descriptions(collection, job_ids: Iterable):
+    job_ids = list(job_ids)
+    if job_ids:
+        await collection.delete_many({"_id": {"$in": job_ids}})
+
+
+async def load_description(collection, job: dict) -> str:
+    """The description of a job document, from the side collection unless it is still inline."""
+    if "description" in job:
+        return job["description"] or ""
+    doc = await collection.find_one({"_id": job["_id"]})
+    return decode_description(doc) if doc else ""
+
+
+async def attach_descriptions(collection, jobs: List[dict]) -> List[dict]:
+    """Sets `description` on each job document in place, with one lookup for the whole list."""
+    missing = [job["_id"] for job in jobs if "description" not in job]
+    found = {}
+    if missing:
+        async for doc in collection.find({"_id": {"$in": missing}}):
+            found[doc["_id"]] = decode_description(doc)
+    for job in jobs:
+        if "description" not in job:
+            job["description"] = found.get(job["_id"], "")
+    return jobs
+
+
+async def iter_with_descriptions(cursor, collection, batch_size: int = DESCRIPTION_BATCH_SIZE):
+    """Yields the cursor's job documents with descriptions attached, joined a batch at a time."""
+    batch = []
+    async for job in cursor:
+        batch.append(job)
+        if len(batch) >= batch_size:
+            for job in await attach_descriptions(collection, batch):
+                yield job
+            batch = []
+    for job in await attach_descriptions(collection, batch):
+        yield job
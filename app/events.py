@@ -0,0 +1,233 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Optional
+
+from pymongo.errors import PyMongoError
+
+from db import jobs_collection
+from models import to_job_summary
+from serialization import encode
+
+# Recent events kept for clients that reconnect with Last-Event-ID
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "1000"))
+# Events a slow client may fall behind by before it is told to reload instead
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "500"))
+# Comment lines sent on idle connections so proxies don't time them out
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+# Set to 0 to skip change streams and always broadcast from this process's own writes
+EVENTS_USE_CHANGE_STREAM = os.getenv("EVENTS_USE_CHANGE_STREAM", "1") == "1"
+# Reconnect delay the browser's EventSource is told to use
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+# How long a change stream waits on the server for new events per round trip
+CHANGE_STREAM_MAX_AWAIT_MS = 1000
+
+# Drops what event payloads never carry before it leaves the server
+CHANGE_STREAM_PIPELINE = [{"$project": {"fullDocument.description": 0, "fullDocument.description_keywords": 0}}]
+
+OPERATIONS = {"insert": "insert", "update": "update", "replace": "update", "delete": "delete"}
+
+
+def _job_payload(doc: Optional[dict]) -> Optional[dict]:
+    # The same shape as a GET /jobs row; clients that need the description fetch the job
+    return to_job_summary(doc) if doc else None
+
+
+class ChangeFeed:
+    """
+    Fans out job inserts/updates/deletes to Server-Sent Events subscribers.
+
+    With a replica set, one shared change stream on the jobs collection is the
+    source, so writes from any API process (or batch.py, or the resume queue)
+    show up; event ids are the stream's resume tokens. On a standalone mongod,
+    where change streams don't exist, the API's write handlers publish their own
+    changes instead (only writes made through this process are seen then).
+
+    Recent events are buffered, so a client reconnecting with Last-Event-ID gets
+    what it missed; in change-stream mode, older tokens are resumed from the
+    oplog. When neither can cover the gap the client gets a "reset" event and
+    should reload its first page.
+    """
+
+    def __init__(self):
+        self.mode = "broadcast"
+        self._subscribers = set()
+        self._buffer = deque(maxlen=EVENTS_BUFFER_SIZE)
+        self._task = None
+        self._sequence = itertools.count(1)
+        # Distinguishes broadcast ids across restarts, which lose the buffer
+        self._epoch = format(int(time.time()), "x")
+
+    async def start(self):
+        if EVENTS_USE_CHANGE_STREAM:
+            try:
+                stream = jobs_collection.watch(
+                    CHANGE_STREAM_PIPELINE, full_document="updateLookup", max_await_time_ms=CHANGE_STREAM_MAX_AWAIT_MS
+                )
+                first = await stream.try_next()  # opening the cursor fails here on a standalone server
+            except (PyMongoError, NotImplementedError) as e:
+                logging.info(f"Change streams unavailable ({e}); broadcasting job events from this process")
+            else:
+                self.mode = "change_stream"
+                self._task = asyncio.create_task(self._watch(stream, first))
+                return
+        self.mode = "broadcast"
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for queue in list(self._subscribers):
+            self._offer(queue, None)
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "subscribers": len(self._subscribers), "buffered": len(self._buffer)}
+
+    # --- producing ---
+
+    def _event_from_change(self, change: dict) -> Optional[dict]:
+        op = OPERATIONS.get(change["operationType"])
+        if op is None:
+            return None  # drop/rename/invalidate
+        return {
+            "event_id": change["_id"]["_data"],
+            "op": op,
+            "id": str(change["documentKey"]["_id"]),
+            "job": _job_payload(change.get("fullDocument")) if op != "delete" else None,
+        }
+
+    async def _watch(self, stream, first):
+        resume_token = None
+        change = first
+        while True:
+            try:
+                while True:
+                    if change is not None:
+                        event = self._event_from_change(change)
+                        if event:
+                            self._dispatch(event)
+                    change = await stream.try_next()
+                    # Advances even without changes (post-batch token), so a resume skips nothing
+                    resume_token = stream.resume_token
+            except asyncio.CancelledError:
+                await stream.close()
+                raise
+            except PyMongoError as e:
+                # The driver already retries once on transient errors; back off and resume from the last token
+                logging.error(f"Job change stream failed: {e}; resuming")
+                await stream.close()
+                await asyncio.sleep(1)
+                stream = jobs_collection.watch(
+                    CHANGE_STREAM_PIPELINE,
+                    full_document="updateLookup",
+                    max_await_time_ms=CHANGE_STREAM_MAX_AWAIT_MS,
+                    resume_after=resume_token,
+                )
+                change = None
+
+    def publish(self, op: str, job_id, doc: Optional[dict] = None):
+        """
+        Called by write handlers after a successful write. A no-op when the change
+        stream is the source. `doc` is the job after the write, if the handler has it;
+        without one, clients fetch the job themselves.
+        """
+        if self.mode != "broadcast":
+            return
+        self._dispatch({
+            "event_id": f"{self._epoch}-{next(self._sequence)}",
+            "op": op,
+            "id": str(job_id),
+            "job": _job_payload(doc) if op != "delete" else None,
+        })
+
+    def _dispatch(self, event: dict):
+        self._buffer.append(event)
+        for queue in list(self._subscribers):
+            self._offer(queue, event)
+
+    def _offer(self, queue: asyncio.Queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind to catch up from the queue; end its stream with a reset
+            self._subscribers.discard(queue)
+            queue.get_nowait()
+            queue.put_nowait({"event_id": None, "op": "reset"})
+
+    # --- consuming ---
+
+    def _buffered_after(self, last_event_id: str) -> Optional[list]:
+        for index, event in enumerate(self._buffer):
+            if event["event_id"] == last_event_id:
+                return list(self._buffer)[index + 1:]
+        return None
+
+    async def _resumed_after(self, last_event_id: str) -> Optional[list]:
+        """Replays changes after a token older than the buffer from the oplog, if it still covers it."""
+        events = []
+        try:
+            async with jobs_collection.watch(
+                CHANGE_STREAM_PIPELINE, full_document="updateLookup", resume_after={"_data": last_event_id}, max_await_time_ms=1
+            ) as stream:
+                while len(events) < EVENTS_BUFFER_SIZE:
+                    change = await stream.try_next()
+                    if change is None:
+                        return events
+                    event = self._event_from_change(change)
+                    if event:
+                        events.append(event)
+        except PyMongoError as e:
+            logging.info(f"Could not resume job events after {last_event_id[:16]}...: {e}")
+        return None
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[dict]:
+        """Yields events (the catch-up after last_event_id first), or None on idle heartbeat intervals."""
+        queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        # Subscribe before catching up so nothing falls between the two; duplicates are skipped below
+        self._subscribers.add(queue)
+        try:
+            seen = set()
+            if last_event_id:
+                missed = self._buffered_after(last_event_id)
+                if missed is None and self.mode == "change_stream":
+                    missed = await self._resumed_after(last_event_id)
+                if missed is None:
+                    yield {"event_id": None, "op": "reset"}
+                    missed = []
+                for event in missed:
+                    seen.add(event["event_id"])
+                    yield event
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    return  # shutting down
+                if event["event_id"] in seen:
+                    continue
+                yield event
+                if event["op"] == "reset":
+                    return
+        finally:
+            self._subscribers.discard(queue)
+
+
+def format_sse(event: Optional[dict]) -> bytes:
+    """One Server-Sent Events frame; None becomes a heartbeat comment."""
+    if event is None:
+        return b": keep-alive\n\n"
+    frame = b""
+    if event["event_id"]:
+        frame += b"id: " + event["event_id"].encode() + b"\n"
+    data = {k: v for k, v in event.items() if k != "event_id"}
+    return frame + b"event: " + event["op"].encode() + b"\ndata: " + encode(data) + b"\n\n"
+
+
+change_feed = ChangeFeed()
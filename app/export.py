@@ -0,0 +1,63 @@
+import csv
+import io
+import os
+from datetime import date, datetime
+
+from models import to_job_out
+from serialization import encode
+
+# Number of documents Mongo returns per getMore. Large enough to keep round trips low,
+# small enough that a batch of multi-KB descriptions stays well within memory.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+# Flush the output buffer to the client once it grows past this many bytes
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+CSV_FIELDS = [
+    "id",
+    "title",
+    "company",
+    "status",
+    "date_applied",
+    "url",
+    "resume_path",
+    "notes",
+    "created_at",
+    "updated_at",
+    "description",
+]
+
+
+async def iter_ndjson(cursor):
+    """Yields the cursor's documents as newline-delimited JSON, a buffer at a time."""
+    buffer = []
+    size = 0
+    async for doc in cursor:
+        line = encode(to_job_out(doc)) + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_FLUSH_BYTES:
+            yield b"".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def iter_csv(cursor):
+    """Yields the cursor's documents as CSV rows with a header line, a buffer at a time."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    async for doc in cursor:
+        doc = to_job_out(doc)
+        for key, value in doc.items():
+            if isinstance(value, (datetime, date)):
+                doc[key] = value.isoformat()
+        writer.writerow(doc)
+        if out.tell() >= EXPORT_FLUSH_BYTES:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue().encode()
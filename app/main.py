@@ -1,14 +1,95 @@
-from fastapi import FastAPI
-from typing import List
+import os
+from contextlib import asynccontextmanager
+from fastapi import Body, FastAPI, HTTPException, Query, Request
+from typing import Any, Dict, List, Optional
 from datetime import date, datetime
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 
 from bson import ObjectId
-from models import JobIn, JobOut, JobUpdate
-from db import jobs_collection
+from models import (
+    BulkDeleteRequest,
+    BulkResult,
+    ExportFormat,
+    IndexUsage,
+    JobIn,
+    JobOut,
+    JobPage,
+    JobSearchPage,
+    JobSort,
+    JobStats,
+    JobStatus,
+    JobUpdate,
+    NearDuplicate,
+    ResumeTaskOut,
+    SortOrder,
+    normalize_url,
+    to_job_out,
+    to_job_summary,
+)
+from db import pool_monitor
+from repository import DuplicateJobError, repository
+from cache import CachedResponse, cached_response, job_cache, make_etag
+from serialization import encode, negotiate, render
+from metrics import MetricsMiddleware, render_gauges, render_metrics
+from resume_queue import RESUME_QUEUE_ENABLED, enqueue_resume, latest_task, resume_queue
+from resume_worker import OUTPUT_DIR
+from near_duplicates import near_duplicate_index, signature, to_matches
+from artifacts import ARTIFACT_ACCEL_REDIRECT, ARTIFACT_DIR, artifact_digest, artifact_path, artifact_sweeper
+from events import EVENTS_RETRY_MS, change_feed, format_sse
+from stats import summarize_counters
+from bulk import BULK_CHUNK_SIZE, MAX_BULK_ITEMS, summarize
+from export import EXPORT_BATCH_SIZE, iter_csv, iter_ndjson
+from pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    SORT_FIELDS,
+    decode_cursor,
+    encode_cursor,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await repository.connect()
+    # On MongoDB other processes add signatures too; the refresh picks those up
+    await near_duplicate_index.start(repository, refresh=repository.name == "mongo")
+    # Change streams and the resume queue's task collection need MongoDB; on SQLite,
+    # events are broadcast from this process's writes and resume generation is off
+    if repository.name == "mongo":
+        await change_feed.start()
+        if RESUME_QUEUE_ENABLED:
+            await resume_queue.start()
+    artifact_sweeper.start(repository.resume_paths, OUTPUT_DIR)
+    yield
+    await artifact_sweeper.stop()
+    await near_duplicate_index.stop()
+    await resume_queue.stop()
+    await change_feed.stop()
+    await repository.close()
+
+
+# Handlers that build their own payloads return them through serialization.render();
+# everything else still gets orjson instead of the stdlib encoder.
+class JSONGZipMiddleware(GZipMiddleware):
+    """Leaves PDFs alone: they are compressed already, and gzip would break their range responses."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith(".pdf"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+# Compress responses above the threshold (JSON list pages compress several-fold)
+app.add_middleware(
+    JSONGZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MIN_BYTES", "1024")),
+    compresslevel=int(os.getenv("GZIP_LEVEL", "5")),
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allows all origins
@@ -16,90 +97,359 @@ app.add_middleware(
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
 )
+# Added last so it is outermost and times the whole stack, compression included
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
 
 
-@app.post("/jobs")
-async def create_job(job: JobIn):
+@app.get("/healthz")
+async def healthz():
+    # Liveness: the process is serving requests. Deliberately doesn't touch Mongo,
+    # so a database outage doesn't get the backend container restarted.
+    return {"status": "ok", "pool": pool_monitor.snapshot()}
+
+
+@app.get("/readyz")
+async def readyz():
+    try:
+        latency_ms = await repository.ping()
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "error": str(e), "pool": pool_monitor.snapshot()},
+        )
+    return {"status": "ok", f"{repository.name}_latency_ms": round(latency_ms, 2), "pool": pool_monitor.snapshot()}
+
+
+@app.get("/admin/indexes", response_model=List[IndexUsage])
+async def admin_indexes():
+    return await repository.index_usage()
+
+
+@app.get("/admin/cache")
+async def admin_cache():
+    return job_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    body = render_metrics([
+        render_gauges("job_cache", "Response cache counters (see /admin/cache)", job_cache.stats(), label="stat"),
+        render_gauges("mongo_pool", "Connection pool state", pool_monitor.snapshot(), label="stat"),
+    ])
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _encode(payload, media_type: str) -> CachedResponse:
+    body = encode(payload, media_type)
+    return CachedResponse(body=body, etag=make_etag(body), media_type=media_type)
+
+
+@app.post("/jobs", response_model=JobOut)
+async def create_job(job: JobIn, request: Request):
     
     job_dict = job.model_dump(mode="json")
     # Append the current date and time to the job dictionary
     job_dict["created_at"] = datetime.utcnow()
+    job_dict["url_normalized"] = normalize_url(job_dict["url"])
+    # Reposts of the same role are flagged against the postings indexed so far
+    sig = signature(job_dict["description"])
+    matches = near_duplicate_index.query(sig) if sig is not None else []
     
-    # Send to MongoDB
-    result = await jobs_collection.insert_one(job_dict)
+    try:
+        job_dict = await repository.create(job_dict)
+    except DuplicateJobError:
+        raise HTTPException(status_code=409, detail="A job with this URL already exists")
+
+    await near_duplicate_index.index_job(repository, job_dict["_id"], sig)
+    job_cache.invalidate()
+    change_feed.publish("insert", job_dict["_id"], job_dict)
+
+    # to_job_out turns the new _id into the string id
+    job_out = to_job_out(job_dict)
+    job_out["near_duplicates"] = to_matches(matches)
+    return render(request, job_out)
+
+@app.get("/jobs", response_model=JobPage)
+async def get_jobs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    status: Optional[List[JobStatus]] = Query(None),
+    company: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    sort: JobSort = JobSort.id,
+    order: SortOrder = SortOrder.asc,
+    include_description: bool = False,
+):
+    sort_field = SORT_FIELDS[sort.value]
+    descending = order == SortOrder.desc
+
+    filters = {
+        "status": [s.value for s in status] if status else None,
+        "company": company,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+    media_type = negotiate(request)
+
+    async def load():
+        # Fetch one extra row to find out whether there is a next page without a count query
+        try:
+            jobs = await repository.list_jobs(filters, sort_field, descending, after, limit + 1, include_description)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            last = jobs[-1]
+            next_cursor = encode_cursor(last.get(sort_field), last["_id"])
+
+        # Rows carry summaries only; descriptions are joined in on request
+        items = [to_job_summary(job) for job in jobs]
+        if include_description:
+            for item, job in zip(items, jobs):
+                item["description"] = job["description"]
+        return _encode({"items": items, "next_cursor": next_cursor}, media_type)
+
+    cache_key = (
+        "jobs", media_type, limit, after, tuple(sorted(s.value for s in status or [])),
+        company, date_from, date_to, sort.value, order.value, include_description,
+    )
+    entry = await job_cache.get_or_load(cache_key, load)
+    return cached_response(request, entry)
+
+
+# The routes below must be registered before /jobs/{job_id} so their
+# fixed path segments ("search", "export", "bulk", "stats") are not taken for a job ID.
+@app.get("/jobs/search", response_model=JobSearchPage)
+async def search_jobs(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    status: Optional[List[JobStatus]] = Query(None),
+    include_description: bool = False,
+):
+    # Relevance scores can't be range-queried, so search pages by offset. The offset still
+    # travels in an opaque cursor so the API looks the same as GET /jobs.
+    offset = 0
+    if after:
+        try:
+            offset, _ = decode_cursor(after)
+            offset = int(offset)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    jobs = await repository.search(
+        q, [s.value for s in status] if status else None, offset, limit + 1, include_description
+    )
+
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = encode_cursor(offset + limit, jobs[-1]["_id"])
+
+    items = [to_job_out(job) for job in jobs]
+    return render(request, {"items": items, "next_cursor": next_cursor})
+
+
+@app.get("/jobs/export")
+async def export_jobs(
+    format: ExportFormat = ExportFormat.ndjson,
+    status: Optional[List[JobStatus]] = Query(None),
+    company: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    filters = {
+        "status": [s.value for s in status] if status else None,
+        "company": company,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+    # Stream straight off the storage: documents are encoded and sent as each batch arrives,
+    # skipping JobOut validation, so memory stays flat regardless of collection size.
+    cursor = repository.iter_jobs(filters, EXPORT_BATCH_SIZE)
+
+    if format == ExportFormat.csv:
+        body, media_type = iter_csv(cursor), "text/csv; charset=utf-8"
+    else:
+        body, media_type = iter_ndjson(cursor), "application/x-ndjson"
+
+    filename = f"jobs-{datetime.utcnow():%Y%m%d-%H%M%S}.{format.value}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# Bulk endpoints take raw dicts and validate item by item, so one bad row
+# is reported in its result slot instead of failing the whole request.
+def _check_bulk_size(items: list):
+    if not items:
+        raise HTTPException(status_code=400, detail="No items provided")
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+
+
+def _publish_bulk(op: str, results: List[dict]):
+    for item in results:
+        if item["ok"]:
+            change_feed.publish(op, item["id"])
+
+
+async def _index_bulk(items: List[Dict[str, Any]], results: List[dict]):
+    """Re-signs every successfully written item that set a description, as the single-job handlers do."""
+    descriptions = {
+        ObjectId(result["id"]): items[result["index"]].get("description")
+        for result in results
+        if result["ok"] and "description" in items[result["index"]]
+    }
+    if not descriptions:
+        return
+    # Thousands of signatures take seconds of CPU; keep them off the event loop
+    signatures = await run_in_threadpool(lambda: {job_id: signature(text) for job_id, text in descriptions.items()})
+    await near_duplicate_index.index_jobs(repository, signatures)
+
+
+@app.post("/jobs/bulk", response_model=BulkResult)
+async def bulk_create_jobs(
+    items: List[Dict[str, Any]] = Body(...),
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_ITEMS),
+):
+    _check_bulk_size(items)
+    results = await repository.bulk_insert(items, chunk_size)
+    await _index_bulk(items, results)
+    job_cache.invalidate()
+    _publish_bulk("insert", results)
+    return summarize(results)
+
 
-    # Convert the inserted ID to a string and remove the MongoDB _id field
-    job_dict["id"] = str(result.inserted_id)
-    job_dict.pop("_id")
+@app.patch("/jobs/bulk", response_model=BulkResult)
+async def bulk_update_jobs(
+    items: List[Dict[str, Any]] = Body(...),
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_ITEMS),
+):
+    _check_bulk_size(items)
+    results = await repository.bulk_update(items, chunk_size)
+    await _index_bulk(items, results)
+    job_cache.invalidate()
+    _publish_bulk("update", results)
+    return summarize(results)
 
-    return job_dict
 
-@app.get("/jobs", response_model=List[JobOut])
-async def get_jobs():
-    jobs = []
-    jobs_cursor = jobs_collection.find()
-    async for job in jobs_cursor:
-        job["id"] = str(job["_id"])
-        job.pop("_id")
-        jobs.append(job)
-    return jobs
+@app.delete("/jobs/bulk", response_model=BulkResult)
+async def bulk_delete_jobs(
+    request: BulkDeleteRequest,
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_ITEMS),
+):
+    _check_bulk_size(request.ids)
+    results = await repository.bulk_delete(request.ids, chunk_size)
+    for item in results:
+        if item["ok"]:
+            near_duplicate_index.remove(item["id"])
+    job_cache.invalidate()
+    _publish_bulk("delete", results)
+    return summarize(results)
+
+
+@app.get("/jobs/events")
+async def job_events(request: Request, last_event_id: Optional[str] = None):
+    """
+    Server-Sent Events feed of job inserts, updates and deletes, so open tables can
+    apply deltas instead of refetching /jobs. Each event carries the job (or null,
+    meaning "fetch it") and an id to resume from after a reconnect.
+    """
+    # EventSource sends the header on its own reconnects; the query parameter covers a page reload
+    last_event_id = request.headers.get("last-event-id") or last_event_id
+
+    async def stream():
+        yield f"retry: {EVENTS_RETRY_MS}\n\n".encode()
+        async for event in change_feed.subscribe(last_event_id):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/jobs/stats", response_model=JobStats)
+async def job_stats(recompute: bool = False, breakdown: bool = False):
+    # The counters document answers the common dashboard query in O(1);
+    # the per-company/per-week breakdown needs an aggregation, so it is opt-in.
+    stats = summarize_counters(await repository.get_counters(recompute=recompute))
+    if breakdown:
+        stats.update(await repository.get_breakdown())
+    return stats
 
 
 
 @app.get("/jobs/{job_id}", response_model=JobOut)
-async def get_job(job_id: str):
+async def get_job(job_id: str, request: Request):
     if not ObjectId.is_valid(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID")
 
-    job = await jobs_collection.find_one({"_id": ObjectId(job_id)})
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    media_type = negotiate(request)
+
+    async def load():
+        job = await repository.get(ObjectId(job_id))
 
-    job["id"] = str(job["_id"])
-    job.pop("_id",None)
-    return job
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        return _encode(to_job_out(job), media_type)
+
+    entry = await job_cache.get_or_load(("job", media_type, job_id), load)
+    return cached_response(request, entry)
 
 @app.delete("/jobs/{job_id}")
 async def delete_job(job_id: str):
     if not ObjectId.is_valid(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID")
 
-    result = await jobs_collection.delete_one({"_id": ObjectId(job_id)})
-
-    if result.deleted_count == 0:
+    if not await repository.delete(ObjectId(job_id)):
         raise HTTPException(status_code=404, detail="Job not found")
+    near_duplicate_index.remove(job_id)
+    job_cache.invalidate()
+    change_feed.publish("delete", job_id)
 
     return {"detail": "Job deleted successfully"}
 
 @app.put("/jobs/{job_id}", response_model=JobOut)
-async def update_job(job_id: str, job: JobIn):
+async def update_job(job_id: str, job: JobIn, request: Request):
     if not ObjectId.is_valid(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID")
         
     job_dict = job.model_dump(mode="json")
     job_dict["updated_at"] = datetime.utcnow()
+    job_dict["url_normalized"] = normalize_url(job_dict["url"])
 
 
-    result = await jobs_collection.find_one_and_update(
-        {"_id": ObjectId(job_id)},
-        {"$set": job_dict},
-        return_document=True
-    )
+    try:
+        result = await repository.replace(ObjectId(job_id), job_dict)
+    except DuplicateJobError:
+        raise HTTPException(status_code=409, detail="A job with this URL already exists")
 
     if not result:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    result["id"] = str(result["_id"])
-    result.pop("_id", None)
-    return result
+    await near_duplicate_index.index_job(repository, ObjectId(job_id), signature(result["description"]))
+    job_cache.invalidate()
+    change_feed.publish("update", job_id, result)
+
+    return render(request, to_job_out(result))
 
 @app.patch("/jobs/{job_id}", response_model=JobOut)
-async def partial_update_job(job_id: str, job: JobUpdate):
+async def partial_update_job(job_id: str, job: JobUpdate, request: Request):
     if not ObjectId.is_valid(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID")
 
@@ -108,16 +458,139 @@ async def partial_update_job(job_id: str, job: JobUpdate):
 
     if not job_dict:
         raise HTTPException(status_code=400, detail="No fields to update")
+    if job_dict.get("url"):
+        job_dict["url_normalized"] = normalize_url(job_dict["url"])
 
-    result = await jobs_collection.find_one_and_update(
-        {"_id": ObjectId(job_id)},
-        {"$set": job_dict},
-        return_document=True
-    )
+    # The repository takes the description out of job_dict
+    description_changed = "description" in job_dict
+    try:
+        result = await repository.update(ObjectId(job_id), job_dict)
+    except DuplicateJobError:
+        raise HTTPException(status_code=409, detail="A job with this URL already exists")
 
     if not result:
         raise HTTPException(status_code=404, detail="Job not found")
+    if description_changed:
+        await near_duplicate_index.index_job(repository, ObjectId(job_id), signature(result["description"]))
+    job_cache.invalidate()
+    change_feed.publish("update", job_id, result)
+
+    return render(request, to_job_out(result))
+
+
+
+def _task_out(task: dict) -> dict:
+    task = dict(task)
+    task["id"] = str(task.pop("_id"))
+    task["job_id"] = str(task["job_id"])
+    return task
+
+
+@app.get("/jobs/{job_id}/duplicates", response_model=List[NearDuplicate])
+async def job_duplicates(job_id: str):
+    """Other jobs whose description is nearly the same as this one's, most similar first."""
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    description = await repository.get_description(ObjectId(job_id))
+    if description is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    sig = signature(description)
+    return to_matches(near_duplicate_index.query(sig, exclude=job_id)) if sig is not None else []
+
+
+@app.post("/jobs/{job_id}/resume", status_code=202, response_model=ResumeTaskOut)
+async def generate_resume(job_id: str, force: bool = False):
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+
+    if repository.name != "mongo":
+        raise HTTPException(status_code=501, detail="Resume generation needs the MongoDB backend")
+    description = await repository.get_description(ObjectId(job_id))
+    if description is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not description:
+        raise HTTPException(status_code=400, detail="Job has no description to tailor the resume to")
+
+    # Generation takes tens of seconds (three LLM calls and a LaTeX build), so it runs
+    # on the background queue; poll /jobs/{job_id}/resume/status for the result.
+    # Unless forced, the queue reuses a near-duplicate job's resume when there is one
+    task = await enqueue_resume(ObjectId(job_id), force=force)
+    return _task_out(task)
+
+
+# Content-addressed URLs never change meaning, so caches may keep them for good
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PDF_CHUNK_SIZE = int(os.getenv("PDF_CHUNK_SIZE", str(256 * 1024)))
+
+
+async def _pdf_response(request: Request, digest: str, cache_control: str):
+    """
+    Serves the stored artifact with the given sha256, with a strong ETag (the sha256),
+    a 304 for a matching If-None-Match, and range requests (FileResponse handles
+    Range and If-Range). Only files in the artifact store are ever served.
+    """
+    path = artifact_path(digest)
+    try:
+        stat_result = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    headers = {
+        "ETag": f'"{digest}"',
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        "Content-Location": f"/artifacts/{digest}.pdf",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    if ARTIFACT_ACCEL_REDIRECT:
+        # nginx serves the file (sendfile, ranges) from its internal location
+        location = ARTIFACT_ACCEL_REDIRECT.rstrip("/") + "/" + os.path.relpath(path, ARTIFACT_DIR)
+        return Response(headers={**headers, "X-Accel-Redirect": location}, media_type="application/pdf")
+    response = FileResponse(
+        path,
+        media_type="application/pdf",
+        filename="resume.pdf",
+        content_disposition_type="inline",
+        stat_result=stat_result,
+        headers=headers,
+    )
+    response.chunk_size = PDF_CHUNK_SIZE
+    return response
+
+
+@app.get("/jobs/{job_id}/resume.pdf")
+async def download_resume(job_id: str, request: Request):
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    resume_path = await repository.get_resume_path(ObjectId(job_id))
+    if resume_path is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Anything but a stored artifact (e.g. a path written before the store existed) isn't served
+    digest = artifact_digest(resume_path) if resume_path else None
+    if not digest:
+        raise HTTPException(status_code=404, detail="No resume generated for this job")
+    # Regenerating the resume changes what this URL serves, so caches revalidate
+    # (a cheap 304); Content-Location names the immutable copy.
+    return await _pdf_response(request, digest, "no-cache")
+
+
+@app.get("/artifacts/{digest}.pdf")
+async def download_artifact(digest: str, request: Request):
+    if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+        raise HTTPException(status_code=400, detail="Invalid artifact ID")
+    return await _pdf_response(request, digest, IMMUTABLE_CACHE_CONTROL)
+
+
+@app.get("/jobs/{job_id}/resume/status", response_model=ResumeTaskOut)
+async def resume_status(job_id: str):
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    if repository.name != "mongo":
+        raise HTTPException(status_code=501, detail="Resume generation needs the MongoDB backend")
 
-    result["id"] = str(result["_id"])
-    result.pop("_id", None)
-    return result
\ No newline at end of file
+    task = await latest_task(ObjectId(job_id))
+    if not task:
+        raise HTTPException(status_code=404, detail="No resume generation requested for this job")
+    return _task_out(task)
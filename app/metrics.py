@@ -0,0 +1,228 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+import bson
+from pymongo import monitoring
+
+# Latency buckets in seconds, roughly log-spaced from 1ms to 10s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Log Mongo commands slower than this many milliseconds. Unset/empty disables the log.
+SLOW_QUERY_MS = os.getenv("SLOW_QUERY_MS", "")
+# Re-encoding every reply to measure its size costs CPU proportional to the bytes read
+MEASURE_REPLY_BYTES = os.getenv("METRICS_COMMAND_BYTES", "1") == "1"
+
+slow_query_log = logging.getLogger("slow_query")
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label tuple. Thread-safe."""
+
+    def __init__(self, name: str, help: str, label_names: tuple, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            base = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+class CounterVec:
+    """Monotonic counters keyed by label tuple. Thread-safe."""
+
+    def __init__(self, name: str, help: str, label_names: tuple):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{{{_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def render_gauges(name: str, help: str, values: dict, label: str = None) -> list:
+    """Renders a dict of numbers as gauges: one series per key under `label`, or plain if label is None."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    for key, value in values.items():
+        if value is None:
+            continue
+        suffix = f'{{{label}="{_escape(key)}"}}' if label else ""
+        lines.append(f"{name}{suffix} {float(value)}")
+    return lines
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+mongo_command_duration = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency as reported by the driver",
+    ("command", "collection"),
+)
+mongo_command_failures = CounterVec(
+    "mongo_command_failures_total", "MongoDB commands that returned an error", ("command", "collection")
+)
+mongo_documents_returned = CounterVec(
+    "mongo_command_documents_returned_total", "Documents returned in command replies", ("command", "collection")
+)
+mongo_reply_bytes = CounterVec(
+    "mongo_command_reply_bytes_total", "BSON bytes in command replies", ("command", "collection")
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each request from receipt to the last body chunk, labelled by
+    the matched route template (/jobs/{job_id}, not the concrete path) so cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route on the (shared) scope
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe((scope["method"], template, str(status)), time.perf_counter() - start)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Driver-level instrumentation of every command the client sends, plus the opt-in slow-query log."""
+
+    def __init__(self, slow_query_ms: float = None):
+        self.slow_query_ms = slow_query_ms
+        self._pending = {}  # (connection, request_id) -> (collection, command summary)
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = ""  # e.g. ping, or aggregate: 1 on the database
+        summary = None
+        if self.slow_query_ms is not None:
+            summary = {k: v for k, v in event.command.items() if k not in ("lsid", "$db", "$clusterTime", "documents")}
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (collection, summary)
+
+    def _finish(self, event):
+        with self._lock:
+            return self._pending.pop((event.connection_id, event.request_id), ("", None))
+
+    def succeeded(self, event):
+        collection, summary = self._finish(event)
+        labels = (event.command_name, collection)
+        seconds = event.duration_micros / 1_000_000
+        mongo_command_duration.observe(labels, seconds)
+
+        reply = event.reply
+        cursor = reply.get("cursor")
+        if isinstance(cursor, dict):
+            batch = cursor.get("firstBatch", cursor.get("nextBatch", []))
+            mongo_documents_returned.inc(labels, len(batch))
+        elif isinstance(reply.get("value"), dict):  # findAndModify
+            mongo_documents_returned.inc(labels, 1)
+        if MEASURE_REPLY_BYTES:
+            mongo_reply_bytes.inc(labels, len(bson.encode(reply)))
+
+        self._log_if_slow(event, collection, summary, seconds)
+
+    def failed(self, event):
+        collection, summary = self._finish(event)
+        labels = (event.command_name, collection)
+        seconds = event.duration_micros / 1_000_000
+        mongo_command_duration.observe(labels, seconds)
+        mongo_command_failures.inc(labels)
+        self._log_if_slow(event, collection, summary, seconds)
+
+    def _log_if_slow(self, event, collection, summary, seconds):
+        if self.slow_query_ms is None or seconds * 1000 < self.slow_query_ms:
+            return
+        text = str(summary)
+        if len(text) > 2000:
+            text = text[:2000] + "..."
+        slow_query_log.warning(
+            f"Slow Mongo command {event.command_name} on {collection or '-'}: {seconds * 1000:.1f} ms {text}"
+        )
+
+
+command_metrics = CommandMetrics(float(SLOW_QUERY_MS) if SLOW_QUERY_MS else None)
+
+
+def render_metrics(extra_sections=()) -> str:
+    """Prometheus text exposition (format 0.0.4) of every metric, plus caller-supplied sections."""
+    lines = []
+    for metric in (
+        http_request_duration,
+        mongo_command_duration,
+        mongo_command_failures,
+        mongo_documents_returned,
+        mongo_reply_bytes,
+    ):
+        lines.extend(metric.render())
+    for section in extra_sections:
+        lines.extend(section)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,86 @@
+"""
+Moves inline job descriptions into the compressed job_descriptions collection
+(see descriptions.py).
+
+For each job that still has a `description` field, the text is written to
+job_descriptions first, then the job gets description_size/description_keywords
+and loses the inline field. Only jobs that still have the field are selected,
+so an interrupted run is finished by running it again, and a job edited while
+the script runs is left as the API wrote it. The API keeps working throughout:
+its readers fall back to an inline description.
+
+    cd app && python migrate_descriptions.py --dry-run
+    cd app && python migrate_descriptions.py --batch-size 500
+
+The job_text index is rebuilt over description_keywords afterwards (the API's
+startup does the same).
+"""
+import argparse
+import asyncio
+
+from pymongo import UpdateOne
+
+from db import descriptions_collection, ensure_indexes, jobs_collection
+from descriptions import encode_description, split_description
+
+
+async def migrate(batch_size: int, dry_run: bool) -> dict:
+    totals = {"jobs": 0, "bytes_before": 0, "bytes_after": 0}
+    last_id = None
+    while True:
+        # Paging on _id, so a dry run (which writes nothing) still moves through the collection
+        query = {"description": {"$exists": True}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        cursor = jobs_collection.find(query, {"description": 1}).sort("_id", 1).limit(batch_size)
+        jobs = await cursor.to_list(length=batch_size)
+        if not jobs:
+            break
+        last_id = jobs[-1]["_id"]
+
+        side_docs = []
+        updates = []
+        for job in jobs:
+            fields = {"description": job["description"]}
+            text = split_description(fields)
+            stored = encode_description(text)
+            # Insert-only: if a write through the API already stored a newer text, it wins
+            side_docs.append(UpdateOne({"_id": job["_id"]}, {"$setOnInsert": stored}, upsert=True))
+            # Matches on the text read, so a concurrent edit isn't overwritten
+            updates.append(UpdateOne(
+                {"_id": job["_id"], "description": job["description"]},
+                {"$set": fields, "$unset": {"description": ""}},
+            ))
+            totals["bytes_before"] += fields["description_size"]
+            totals["bytes_after"] += len(stored["data"])
+        totals["jobs"] += len(jobs)
+        if dry_run:
+            continue
+
+        # Side documents first: a job never loses its inline text before the copy exists
+        await descriptions_collection.bulk_write(side_docs, ordered=False)
+        await jobs_collection.bulk_write(updates, ordered=False)
+        print(f"Migrated {totals['jobs']} jobs")
+
+    if not dry_run:
+        await ensure_indexes()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="report sizes without writing anything")
+    args = parser.parse_args()
+
+    totals = asyncio.run(migrate(args.batch_size, args.dry_run))
+    ratio = totals["bytes_before"] / totals["bytes_after"] if totals["bytes_after"] else 0.0
+    verb = "Would move" if args.dry_run else "Moved"
+    print(
+        f"{verb} {totals['jobs']} descriptions: {totals['bytes_before']:,} bytes -> "
+        f"{totals['bytes_after']:,} stored ({ratio:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
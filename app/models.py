@@ -1,7 +1,58 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import date, datetime
 from enum import Enum
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Query parameters job boards append for tracking; they do not identify the posting
+TRACKING_QUERY_PARAMS = {"ref", "refid", "trackingid", "trk", "gclid", "fbclid", "source", "src"}
+
+
+def normalize_url(url) -> str:
+    """
+    Canonical form of a posting URL used for duplicate detection: scheme, "www.",
+    default ports, fragments, trailing slashes and tracking parameters are dropped.
+    """
+    parts = urlsplit(str(url).strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_QUERY_PARAMS and not k.lower().startswith("utm_")
+    )
+    normalized = host + path
+    if query:
+        normalized += "?" + urlencode(query)
+    return normalized
+
+# Fields we keep on job documents for our own bookkeeping; never part of API responses
+INTERNAL_FIELDS = ("url_normalized", "description_size", "description_keywords")
+
+# What list views read of a job document (see JobSummary); everything else stays on the server
+SUMMARY_FIELDS = (
+    "title", "company", "status", "date_applied", "url", "resume_path", "notes", "created_at", "updated_at",
+)
+SUMMARY_PROJECTION = dict.fromkeys(SUMMARY_FIELDS, 1)
+
+
+def to_job_out(doc: dict) -> dict:
+    """Shapes a raw job document into the JobOut layout: string id, no internal fields."""
+    doc["id"] = str(doc.pop("_id"))
+    for field in INTERNAL_FIELDS:
+        doc.pop(field, None)
+    return doc
+
+
+def to_job_summary(doc: dict) -> dict:
+    """Shapes a job document into the JobSummary layout, dropping fields a list row doesn't carry."""
+    summary = {field: doc[field] for field in SUMMARY_FIELDS if field in doc}
+    summary["id"] = str(doc["_id"])
+    return summary
+
 
 class JobStatus(str, Enum):
     applied = "Applied"
@@ -16,13 +67,114 @@ class JobIn(BaseModel):
     company: str
     status: JobStatus
     date_applied: date
-    resume_path: Optional[str] = None
     notes: Optional[str] = None
 
 
+class NearDuplicate(BaseModel):
+    id: str
+    # Estimated Jaccard similarity of the two descriptions' shingles
+    similarity: float
+
+
 class JobOut(JobIn):
     id: str
     created_at: datetime
+    # Set once the background queue has generated a tailored resume; only the queue
+    # writes it (JobIn and JobUpdate don't accept it), and GET /jobs/{id}/resume.pdf
+    # serves it only from the artifact store
+    resume_path: Optional[str] = None
+    # Only in the POST /jobs response: earlier postings with nearly the same description
+    near_duplicates: Optional[List[NearDuplicate]] = None
+
+
+class JobSummary(BaseModel):
+    """A job as list views show it: everything but the description."""
+    id: str
+    title: str
+    company: str
+    status: JobStatus
+    date_applied: date
+    url: HttpUrl
+    created_at: datetime
+    resume_path: Optional[str] = None
+    notes: Optional[str] = None
+    # Only with include_description=true
+    description: Optional[str] = None
+
+
+class JobSort(str, Enum):
+    id = "id"
+    date_applied = "date_applied"
+    created_at = "created_at"
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+class JobSearchHit(JobOut):
+    # Omitted from search rows unless explicitly requested
+    description: Optional[str] = None
+    score: float
+
+
+class JobSearchPage(BaseModel):
+    items: List[JobSearchHit]
+    next_cursor: Optional[str] = None
+
+
+class ResumeTaskStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class ResumeTaskOut(BaseModel):
+    id: str
+    job_id: str
+    status: ResumeTaskStatus
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # A queued task that failed before is not retried until then
+    not_before: Optional[datetime] = None
+    error: Optional[str] = None
+    resume_path: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+    # Set when a near-duplicate job's resume was reused instead of generating one
+    reused_from: Optional[str] = None
+    similarity: Optional[float] = None
+
+
+class CountBucket(BaseModel):
+    key: Optional[str] = None
+    count: int
+
+
+class JobStats(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    # Counts of status changes observed through the API, e.g. "Applied_to_Interview"
+    transitions: Dict[str, int]
+    # Moves from Applied to Interview per job that was ever Applied (see stats.summarize_counters)
+    applied_to_interview_rate: float
+    recomputed_at: Optional[datetime] = None
+    by_company: Optional[List[CountBucket]] = None
+    by_week: Optional[List[CountBucket]] = None
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class JobPage(BaseModel):
+    items: List[JobSummary]
+    # Opaque token to pass back as `after` for the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 class JobUpdate(BaseModel):
@@ -32,5 +184,35 @@ class JobUpdate(BaseModel):
     company: Optional[str] = None
     status: Optional[JobStatus] = None
     date_applied: Optional[date] = None
-    resume_path: Optional[str] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[str]
+
+
+class BulkItemResult(BaseModel):
+    # Position of the item in the request body
+    index: int
+    id: Optional[str] = None
+    ok: bool
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+class IndexAccesses(BaseModel):
+    ops: int
+    since: Optional[datetime] = None
+
+
+class IndexUsage(BaseModel):
+    name: str
+    key: dict
+    declared: bool
+    accesses: Optional[IndexAccesses] = None
+    size_bytes: Optional[int] = None
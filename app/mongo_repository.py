@@ -0,0 +1,238 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import ReplaceOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from bulk import bulk_delete, bulk_insert, bulk_update
+from db import (
+    close_mongo_connection,
+    connect_to_mongo,
+    descriptions_collection,
+    ensure_indexes,
+    get_index_usage,
+    jobs_collection,
+    ping,
+    signatures_collection,
+)
+from descriptions import (
+    attach_descriptions,
+    delete_descriptions,
+    iter_with_descriptions,
+    load_description,
+    save_description,
+    split_description,
+)
+from models import SUMMARY_PROJECTION
+from pagination import build_job_filter, keyset_filter, sort_spec
+from repository import DuplicateJobError, JobRepository
+from stats import apply_counter_deltas, get_breakdown, get_counters
+
+# Signature documents per round trip while loading the near-duplicate index (about 0.6 KB each)
+SIGNATURE_BATCH_SIZE = 5000
+
+
+async def _tombstone_signatures(job_ids: List[ObjectId], now: Optional[datetime] = None):
+    """
+    Removes signatures by leaving a tombstone (minhash None) in their place, so the
+    near-duplicate index refresh of other API processes sees the removal too. A TTL
+    index drops tombstones after SIGNATURE_TOMBSTONE_TTL (see db.py).
+    """
+    if job_ids:
+        now = now or datetime.utcnow()
+        await signatures_collection.update_many(
+            {"_id": {"$in": job_ids}}, {"$set": {"minhash": None, "updated_at": now, "deleted_at": now}}
+        )
+
+
+class MongoJobRepository(JobRepository):
+    """Jobs in MongoDB: summaries in `jobs`, compressed descriptions in `job_descriptions`."""
+
+    name = "mongo"
+
+    async def connect(self):
+        await connect_to_mongo()
+        await ensure_indexes()
+        await get_counters()  # builds the stats counters on first start
+
+    async def close(self):
+        await close_mongo_connection()
+
+    async def ping(self) -> float:
+        return await ping()
+
+    async def create(self, job_dict: dict) -> dict:
+        description = split_description(job_dict)
+        try:
+            # insert_one sets _id on job_dict
+            await jobs_collection.insert_one(job_dict)
+        except DuplicateKeyError:
+            raise DuplicateJobError()
+        await save_description(descriptions_collection, job_dict["_id"], description)
+        await apply_counter_deltas(created=[job_dict["status"]])
+        job_dict["description"] = description
+        return job_dict
+
+    async def get(self, job_id: ObjectId) -> Optional[dict]:
+        job = await jobs_collection.find_one({"_id": job_id})
+        if job:
+            job["description"] = await load_description(descriptions_collection, job)
+        return job
+
+    async def get_description(self, job_id: ObjectId) -> Optional[str]:
+        job = await jobs_collection.find_one({"_id": job_id}, {"description": 1})
+        return await load_description(descriptions_collection, job) if job else None
+
+    async def get_resume_path(self, job_id: ObjectId) -> Optional[str]:
+        job = await jobs_collection.find_one({"_id": job_id}, {"resume_path": 1})
+        return (job.get("resume_path") or "") if job else None
+
+    async def resume_paths(self) -> Set[str]:
+        return {path for path in await jobs_collection.distinct("resume_path") if path}
+
+    async def save_signatures(self, signatures: Dict[ObjectId, Optional[bytes]], params: str):
+        if not signatures:
+            return
+        now = datetime.utcnow()
+        await _tombstone_signatures([job_id for job_id, minhash in signatures.items() if minhash is None], now)
+        stored = {job_id: minhash for job_id, minhash in signatures.items() if minhash is not None}
+        # A single job (every single-job write) is a plain upsert, as in descriptions.save_description
+        if len(stored) == 1:
+            (job_id, minhash), = stored.items()
+            await signatures_collection.replace_one(
+                {"_id": job_id}, {"minhash": minhash, "params": params, "updated_at": now}, upsert=True
+            )
+        elif stored:
+            await signatures_collection.bulk_write([
+                ReplaceOne({"_id": job_id}, {"minhash": minhash, "params": params, "updated_at": now}, upsert=True)
+                for job_id, minhash in stored.items()
+            ], ordered=False)
+
+    async def iter_signatures(self, params: str, since: Optional[datetime] = None):
+        query = {"params": params}
+        if since is not None:
+            query["updated_at"] = {"$gt": since}
+        else:
+            query["minhash"] = {"$ne": None}  # a first load has nothing to remove
+        async for doc in signatures_collection.find(query).batch_size(SIGNATURE_BATCH_SIZE):
+            yield doc["_id"], doc["minhash"], doc["updated_at"]
+
+    async def replace(self, job_id: ObjectId, job_dict: dict) -> Optional[dict]:
+        description = split_description(job_dict)
+        try:
+            # Take the pre-image (without the description; we have the new one) so the status
+            # transition can be counted; $set is a shallow field overwrite, so the post-image
+            # is just the two merged. A not-yet-migrated inline description is dropped.
+            result = await jobs_collection.find_one_and_update(
+                {"_id": job_id},
+                {"$set": job_dict, "$unset": {"description": ""}},
+                projection={"description": 0},
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            raise DuplicateJobError()
+        if not result:
+            return None
+        await save_description(descriptions_collection, job_id, description)
+        await apply_counter_deltas(transitions=[(result["status"], job_dict["status"])])
+        result.update(job_dict)
+        result["description"] = description
+        return result
+
+    async def update(self, job_id: ObjectId, fields: dict) -> Optional[dict]:
+        description = split_description(fields)
+        update = {"$set": fields}
+        if description is not None:
+            update["$unset"] = {"description": ""}
+        try:
+            # Take the pre-image so the status transition can be counted; $set is a
+            # shallow field overwrite, so the post-image is just the two merged.
+            result = await jobs_collection.find_one_and_update(
+                {"_id": job_id},
+                update,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            raise DuplicateJobError()
+        if not result:
+            return None
+        if description is not None:
+            result.pop("description", None)
+            await save_description(descriptions_collection, job_id, description)
+        if "status" in fields:
+            await apply_counter_deltas(transitions=[(result["status"], fields["status"])])
+        result.update(fields)
+        if description is None:
+            description = await load_description(descriptions_collection, result)
+        result["description"] = description
+        return result
+
+    async def delete(self, job_id: ObjectId) -> bool:
+        result = await jobs_collection.find_one_and_delete({"_id": job_id}, projection={"status": 1})
+        if not result:
+            return False
+        await delete_descriptions(descriptions_collection, [job_id])
+        await _tombstone_signatures([job_id])
+        await apply_counter_deltas(deleted=[result["status"]])
+        return True
+
+    async def list_jobs(
+        self, filters: dict, sort_field: str, descending: bool, after: Optional[str], limit: int,
+        include_description: bool = False,
+    ) -> List[dict]:
+        query = build_job_filter(**filters)
+        if after:
+            page_filter = keyset_filter(sort_field, descending, after)
+            query = {"$and": [query, page_filter]} if query else page_filter
+        # Rows carry summaries only; descriptions are in job_descriptions and joined on request
+        cursor = jobs_collection.find(query, SUMMARY_PROJECTION).sort(sort_spec(sort_field, descending)).limit(limit)
+        jobs = await cursor.to_list(length=limit)
+        if include_description:
+            await attach_descriptions(descriptions_collection, jobs)
+        return jobs
+
+    async def search(
+        self, q: str, status: Optional[List[str]], offset: int, limit: int, include_description: bool = False
+    ) -> List[dict]:
+        query = build_job_filter(status=status)
+        query["$text"] = {"$search": q}
+        projection = {**SUMMARY_PROJECTION, "score": {"$meta": "textScore"}}
+        cursor = (
+            jobs_collection.find(query, projection)
+            .sort([("score", {"$meta": "textScore"}), ("_id", 1)])
+            .skip(offset)
+            .limit(limit)
+        )
+        jobs = await cursor.to_list(length=limit)
+        if include_description:
+            await attach_descriptions(descriptions_collection, jobs)
+        return jobs
+
+    def iter_jobs(self, filters: dict, batch_size: int):
+        # Descriptions are joined in per batch with one $in lookup
+        return iter_with_descriptions(
+            jobs_collection.find(build_job_filter(**filters)).sort("_id", 1).batch_size(batch_size),
+            descriptions_collection,
+            batch_size,
+        )
+
+    async def bulk_insert(self, items: List[dict], chunk_size: int) -> List[dict]:
+        return await bulk_insert(jobs_collection, descriptions_collection, items, chunk_size)
+
+    async def bulk_update(self, items: List[dict], chunk_size: int) -> List[dict]:
+        return await bulk_update(jobs_collection, descriptions_collection, items, chunk_size)
+
+    async def bulk_delete(self, ids: List[str], chunk_size: int) -> List[dict]:
+        results = await bulk_delete(jobs_collection, descriptions_collection, ids, chunk_size)
+        await _tombstone_signatures([ObjectId(r["id"]) for r in results if r["ok"]])
+        return results
+
+    async def get_counters(self, recompute: bool = False) -> dict:
+        return await get_counters(recompute=recompute)
+
+    async def get_breakdown(self) -> dict:
+        return await get_breakdown()
+
+    async def index_usage(self) -> List[dict]:
+        return await get_index_usage()
@@ -0,0 +1,256 @@
+"""
+Near-duplicate detection for job descriptions, with MinHash and LSH.
+
+Companies repost the same role with small edits, which an exact hash misses.
+Each description is reduced to its set of word shingles (runs of
+NEAR_DUP_SHINGLE_SIZE words) and summarized by a MinHash signature of
+NEAR_DUP_PERMUTATIONS values; the fraction of positions two signatures agree on
+estimates the Jaccard similarity of their shingle sets. For lookups the
+signature is cut into NEAR_DUP_BANDS bands (LSH): only postings sharing a whole
+band with the query are compared, so a lookup costs a few dict probes and one
+vectorized comparison instead of a scan over every posting.
+
+Signatures are stored per job by the repository (job_signatures, next to the
+jobs), and each API process keeps the index in memory: loaded at startup,
+updated by its own writes (single and bulk) and, on MongoDB, refreshed every
+NEAR_DUP_REFRESH_SECONDS with signatures other processes wrote or removed.
+Jobs created before this existed are indexed with:
+
+    cd app && python near_duplicates.py --backfill
+"""
+import argparse
+import asyncio
+import logging
+import os
+import zlib
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from bson import ObjectId
+
+from descriptions import WORD_RE
+
+# Estimated Jaccard similarity from which two descriptions count as the same posting
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+NEAR_DUP_SHINGLE_SIZE = int(os.getenv("NEAR_DUP_SHINGLE_SIZE", "4"))
+NEAR_DUP_PERMUTATIONS = int(os.getenv("NEAR_DUP_PERMUTATIONS", "128"))
+# 16 bands of 8 rows: a pair at similarity 0.8 shares a band with probability 0.95,
+# one at 0.5 with probability 0.06, so few dissimilar postings reach the comparison
+NEAR_DUP_BANDS = int(os.getenv("NEAR_DUP_BANDS", "16"))
+# Most similar earlier postings reported per job
+NEAR_DUP_MAX_MATCHES = int(os.getenv("NEAR_DUP_MAX_MATCHES", "5"))
+# 0 disables the refresh (a single API process sees all writes itself)
+NEAR_DUP_REFRESH_SECONDS = float(os.getenv("NEAR_DUP_REFRESH_SECONDS", "30"))
+
+# Fixed, so signatures stay comparable across processes and restarts
+HASH_SEED = 1
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+# Stored with every signature; signatures computed with other settings are ignored
+SIGNATURE_PARAMS = f"k{NEAR_DUP_SHINGLE_SIZE}-p{NEAR_DUP_PERMUTATIONS}-s{HASH_SEED}"
+# Signatures stamped just before the last refresh may be committed just after it
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+# h(x) = (a * x + b) mod p per permutation, a and b drawn below p. The product wraps
+# at 2**64, which mixes the bits further; small a would leave h nearly monotonic in x,
+# and every permutation would then pick the same minimum.
+_rng = np.random.default_rng(HASH_SEED)
+_A = _rng.integers(1, MERSENNE_PRIME, size=NEAR_DUP_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, MERSENNE_PRIME, size=NEAR_DUP_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str) -> set:
+    words = WORD_RE.findall(text.lower())
+    size = NEAR_DUP_SHINGLE_SIZE
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature (uint32 per permutation) of a description; None if it has no words."""
+    found = shingles(text or "")
+    if not found:
+        return None
+    # crc32, unlike hash(), is the same in every process
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in found), dtype=np.uint64, count=len(found))
+    permuted = (hashes[:, None] * _A + _B) % MERSENNE_PRIME
+    return (permuted.min(axis=0) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """In-memory LSH index of job signatures. Not thread-safe; used from the event loop."""
+
+    def __init__(self, bands: int = NEAR_DUP_BANDS, threshold: float = NEAR_DUP_THRESHOLD):
+        if NEAR_DUP_PERMUTATIONS % bands:
+            raise ValueError("NEAR_DUP_PERMUTATIONS must be a multiple of NEAR_DUP_BANDS")
+        self.bands = bands
+        self.rows = NEAR_DUP_PERMUTATIONS // bands
+        self.threshold = threshold
+        # Row r of the matrix is the signature of _ids[r]; a removed job's row is
+        # set to None and goes on _free_rows for the next add() to reuse
+        self._signatures = np.empty((1024, NEAR_DUP_PERMUTATIONS), dtype=np.uint32)
+        self._ids: List[Optional[str]] = []
+        self._row_of = {}
+        self._free_rows: List[int] = []
+        # Per band: band bytes -> rows
+        self._buckets = [{} for _ in range(bands)]
+        self._since = None
+        self._task = None
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def _band_keys(self, sig: np.ndarray):
+        raw = sig.tobytes()
+        width = self.rows * sig.itemsize
+        return [raw[i * width:(i + 1) * width] for i in range(self.bands)]
+
+    def add(self, job_id: str, sig: np.ndarray):
+        row = self._row_of.get(job_id)
+        if row is not None and np.array_equal(self._signatures[row], sig):
+            return  # e.g. read again by a refresh
+        self.remove(job_id)
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = job_id
+        else:
+            row = len(self._ids)
+            if row == len(self._signatures):
+                self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+            self._ids.append(job_id)
+        self._signatures[row] = sig
+        self._row_of[job_id] = row
+        for bucket, key in zip(self._buckets, self._band_keys(sig)):
+            bucket.setdefault(key, set()).add(row)
+
+    def remove(self, job_id: str):
+        row = self._row_of.pop(job_id, None)
+        if row is None:
+            return
+        # The row's band keys come from its signature, still in the matrix
+        for bucket, key in zip(self._buckets, self._band_keys(self._signatures[row])):
+            rows = bucket[key]
+            rows.discard(row)
+            if not rows:
+                del bucket[key]
+        self._ids[row] = None
+        self._free_rows.append(row)
+
+    def query(self, sig: np.ndarray, exclude: Optional[str] = None, limit: int = NEAR_DUP_MAX_MATCHES) -> List[Tuple[str, float]]:
+        """(job id, estimated Jaccard similarity) of indexed jobs at or above the threshold, most similar first."""
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(sig)):
+            rows = bucket.get(key)
+            if rows:
+                candidates.update(rows)
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[rows] == sig).mean(axis=1)
+        matches = [
+            (self._ids[row], float(sim))
+            for row, sim in zip(rows.tolist(), similarity.tolist())
+            if sim >= self.threshold and self._ids[row] != exclude
+        ]
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:limit]
+
+    # --- persistence through the repository (see repository.py) ---
+
+    async def index_job(self, repository, job_id, sig: Optional[np.ndarray]):
+        """Stores a job's signature and adds it to the index; a job without one is dropped from both."""
+        await self.index_jobs(repository, {job_id: sig})
+
+    async def index_jobs(self, repository, signatures: Dict[ObjectId, Optional[np.ndarray]]):
+        """index_job for many jobs, stored in one round trip."""
+        await repository.save_signatures(
+            {job_id: sig.tobytes() if sig is not None else None for job_id, sig in signatures.items()},
+            SIGNATURE_PARAMS,
+        )
+        for job_id, sig in signatures.items():
+            if sig is None:
+                self.remove(str(job_id))
+            else:
+                self.add(str(job_id), sig)
+
+    async def load(self, repository):
+        """
+        Applies the signatures written since the last load (all of them the first time),
+        including removals: jobs deleted or emptied by another process.
+        """
+        since = self._since - REFRESH_OVERLAP if self._since else None
+        count = 0
+        async for job_id, minhash, updated_at in repository.iter_signatures(SIGNATURE_PARAMS, since):
+            if minhash is None:
+                self.remove(str(job_id))
+            else:
+                self.add(str(job_id), np.frombuffer(minhash, dtype=np.uint32))
+            if self._since is None or updated_at > self._since:
+                self._since = updated_at
+            count += 1
+        return count
+
+    async def start(self, repository, refresh: bool):
+        count = await self.load(repository)
+        logging.info(f"Near-duplicate index loaded with {count} job signatures")
+        if refresh and NEAR_DUP_REFRESH_SECONDS > 0:
+            self._task = asyncio.create_task(self._refresh(repository))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh(self, repository):
+        while True:
+            await asyncio.sleep(NEAR_DUP_REFRESH_SECONDS)
+            try:
+                await self.load(repository)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Near-duplicate index refresh failed: {e}")
+
+
+near_duplicate_index = NearDuplicateIndex()
+
+
+def to_matches(matches: List[Tuple[str, float]]) -> List[dict]:
+    return [{"id": job_id, "similarity": round(similarity, 3)} for job_id, similarity in matches]
+
+
+async def backfill(batch_size: int) -> int:
+    """Computes and stores the signature of every job (replacing any stored one)."""
+    from repository import repository
+
+    await repository.connect()
+    count = 0
+    batch = {}
+    try:
+        async for job in repository.iter_jobs({}, batch_size):
+            sig = signature(job.get("description") or "")
+            batch[job["_id"]] = sig.tobytes() if sig is not None else None
+            count += sig is not None
+            if len(batch) >= batch_size:
+                await repository.save_signatures(batch, SIGNATURE_PARAMS)
+                batch = {}
+        await repository.save_signatures(batch, SIGNATURE_PARAMS)
+    finally:
+        await repository.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backfill", action="store_true", help="(re)compute the signature of every job")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    if not args.backfill:
+        parser.error("nothing to do; pass --backfill")
+    print(f"Stored {asyncio.run(backfill(args.batch_size))} signatures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import List, Optional
+
+from bson import ObjectId
+
+# Page size limits for list endpoints. The table only ever shows a screenful of rows,
+# so there is no reason to let a single request pull the whole collection.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Maps the public sort option to the document field we keyset-paginate on.
+# Every sort is tie-broken on _id so the ordering (and therefore the cursor) is total.
+SORT_FIELDS = {
+    "id": "_id",
+    "date_applied": "date_applied",
+    "created_at": "created_at",
+}
+
+
+def encode_cursor(sort_value, job_id) -> str:
+    """Packs the sort key of the last row on a page into an opaque, URL-safe token."""
+    if hasattr(sort_value, "isoformat"):
+        sort_value = sort_value.isoformat()
+    elif isinstance(sort_value, ObjectId):
+        sort_value = str(sort_value)
+    payload = json.dumps({"v": sort_value, "id": str(job_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Reverses encode_cursor. Raises ValueError on anything we did not produce."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        job_id = ObjectId(payload["id"])
+        return payload["v"], job_id
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def build_job_filter(
+    status: Optional[List[str]] = None,
+    company: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> dict:
+    """Builds the Mongo filter for the server-side list filters."""
+    query = {}
+    if status:
+        query["status"] = status[0] if len(status) == 1 else {"$in": list(status)}
+    if company:
+        query["company"] = company
+    # date_applied is stored as an ISO "YYYY-MM-DD" string, so string comparison is date order
+    date_range = {}
+    if date_from:
+        date_range["$gte"] = date_from.isoformat()
+    if date_to:
+        date_range["$lte"] = date_to.isoformat()
+    if date_range:
+        query["date_applied"] = date_range
+    return query
+
+
+def keyset_filter(sort_field: str, descending: bool, after: str) -> dict:
+    """Returns the filter selecting rows strictly after the cursor in (sort_field, _id) order."""
+    value, last_id = decode_cursor(after)
+    op = "$lt" if descending else "$gt"
+    if sort_field == "_id":
+        return {"_id": {op: last_id}}
+    if sort_field == "created_at" and value is not None:
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+    return {
+        "$or": [
+            {sort_field: {op: value}},
+            {sort_field: value, "_id": {op: last_id}},
+        ]
+    }
+
+
+def sort_spec(sort_field: str, descending: bool) -> list:
+    direction = -1 if descending else 1
+    if sort_field == "_id":
+        return [("_id", direction)]
+    return [(sort_field, direction), ("_id", direction)]
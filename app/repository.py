@@ -0,0 +1,172 @@
+"""
+Storage interface the job handlers go through, and the backend selection.
+
+DATABASE_URL picks the backend:
+
+    mongodb://host:27017/job_tracker   MongoDB through Motor (mongo_repository.py), the default
+    sqlite:///data/jobs.db             embedded SQLite (sqlite_repository.py), relative path
+    sqlite:////var/lib/jobs.db         embedded SQLite, absolute path
+
+SQLite needs no separate server, which suits a single-user install; MongoDB is
+needed for multi-process deployments, the background resume queue and change
+stream events.
+
+Both backends hand jobs back as documents in the MongoDB layout ("_id" is an
+ObjectId, "created_at" a datetime, dates ISO strings), so the response shaping in
+models.py, the cursors in pagination.py and the event payloads work unchanged.
+"""
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+DATABASE_URL = os.getenv("DATABASE_URL", "mongodb://localhost:27017/job_tracker")
+
+
+class DuplicateJobError(Exception):
+    """Another job already has the same normalized URL."""
+
+
+class JobRepository(ABC):
+    """
+    Job storage. Writes keep the status counters behind GET /jobs/stats up to date,
+    and documents passed to create/replace/update carry their description inline;
+    where it is stored is up to the backend.
+
+    `filters` arguments are the list filters as keyword arguments for
+    pagination.build_job_filter: status (list of values), company, date_from, date_to.
+    """
+
+    # "mongo" or "sqlite"
+    name = ""
+
+    @abstractmethod
+    async def connect(self):
+        ...
+
+    @abstractmethod
+    async def close(self):
+        ...
+
+    @abstractmethod
+    async def ping(self) -> float:
+        """Round trip to the storage in milliseconds."""
+
+    @abstractmethod
+    async def create(self, job_dict: dict) -> dict:
+        """Inserts a job and returns it with its new _id. Raises DuplicateJobError."""
+
+    @abstractmethod
+    async def get(self, job_id: ObjectId) -> Optional[dict]:
+        """The whole job, description included, or None."""
+
+    @abstractmethod
+    async def get_description(self, job_id: ObjectId) -> Optional[str]:
+        """Only the description; None if the job doesn't exist."""
+
+    @abstractmethod
+    async def get_resume_path(self, job_id: ObjectId) -> Optional[str]:
+        """Only the resume_path ("" if there is none); None if the job doesn't exist."""
+
+    @abstractmethod
+    async def resume_paths(self) -> Set[str]:
+        """Every resume_path set on some job, for the artifact sweep (see artifacts.py)."""
+
+    @abstractmethod
+    async def save_signatures(self, signatures: Dict[ObjectId, Optional[bytes]], params: str):
+        """
+        Stores near-duplicate signatures by job id (see near_duplicates.py), replacing
+        older ones, in one round trip; None removes a job's signature. Signatures go
+        away with their job; a backend other processes refresh from must report those
+        removals through iter_signatures.
+        """
+
+    @abstractmethod
+    def iter_signatures(self, params: str, since: Optional[datetime] = None) -> AsyncIterator[Tuple[ObjectId, bytes, datetime]]:
+        """
+        (job id, signature, stored at) of every signature computed with `params`, optionally
+        only those stored after `since`. With `since`, a signature removed after it may come
+        back as (job id, None, removed at).
+        """
+
+    @abstractmethod
+    async def replace(self, job_id: ObjectId, job_dict: dict) -> Optional[dict]:
+        """Overwrites every JobIn field. Returns the job after the write, or None if it doesn't exist."""
+
+    @abstractmethod
+    async def update(self, job_id: ObjectId, fields: dict) -> Optional[dict]:
+        """Sets the given fields. Returns the job after the write, or None if it doesn't exist."""
+
+    @abstractmethod
+    async def delete(self, job_id: ObjectId) -> bool:
+        ...
+
+    @abstractmethod
+    async def list_jobs(
+        self, filters: dict, sort_field: str, descending: bool, after: Optional[str], limit: int,
+        include_description: bool = False,
+    ) -> List[dict]:
+        """
+        Up to `limit` job summaries in (sort_field, _id) order, starting after the
+        `after` cursor. Raises ValueError on an invalid cursor.
+        """
+
+    @abstractmethod
+    async def search(
+        self, q: str, status: Optional[List[str]], offset: int, limit: int, include_description: bool = False
+    ) -> List[dict]:
+        """Full-text matches for `q`, best first, each with a "score"."""
+
+    @abstractmethod
+    def iter_jobs(self, filters: dict, batch_size: int) -> AsyncIterator[dict]:
+        """Every matching job in _id order, descriptions included, read a batch at a time."""
+
+    @abstractmethod
+    async def bulk_insert(self, items: List[dict], chunk_size: int) -> List[dict]:
+        """Per-item results in the BulkItemResult layout (see bulk.py)."""
+
+    @abstractmethod
+    async def bulk_update(self, items: List[dict], chunk_size: int) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def bulk_delete(self, ids: List[str], chunk_size: int) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def get_counters(self, recompute: bool = False) -> dict:
+        """Status counters in the layout stats.summarize_counters reads."""
+
+    @abstractmethod
+    async def get_breakdown(self) -> dict:
+        """Per-company and per-week application counts (see stats.get_breakdown)."""
+
+    @abstractmethod
+    async def index_usage(self) -> List[dict]:
+        """Indexes in the IndexUsage layout."""
+
+
+def sqlite_path(url: str) -> str:
+    """Database file of a sqlite:/// URL."""
+    path = url[len("sqlite:///"):]
+    if not path or path.startswith(":memory:"):
+        # Every pooled connection would get its own empty in-memory database
+        raise ValueError("The SQLite backend needs a database file path, e.g. sqlite:///jobs.db")
+    return path
+
+
+def create_repository(url: str = DATABASE_URL) -> JobRepository:
+    if url.startswith("sqlite:///"):
+        from sqlite_repository import SQLiteJobRepository
+
+        return SQLiteJobRepository(sqlite_path(url))
+    if url.startswith(("mongodb://", "mongodb+srv://")):
+        from mongo_repository import MongoJobRepository
+
+        return MongoJobRepository()
+    raise ValueError(f"Unsupported DATABASE_URL scheme: {url.split(':', 1)[0]}")
+
+
+repository = create_repository()
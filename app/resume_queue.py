@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+import resume_worker
+from artifacts import artifact_digest
+from cache import job_cache
+from db import descriptions_collection, jobs_collection, tasks_collection
+from descriptions import load_description
+from events import change_feed
+from models import ResumeTaskStatus
+from near_duplicates import near_duplicate_index, signature
+
+# Worker processes; each runs one resume end to end
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", "2"))
+# Limits shared by all workers
+RESUME_LLM_CONCURRENCY = int(os.getenv("RESUME_LLM_CONCURRENCY", "3"))
+RESUME_LATEX_CONCURRENCY = int(os.getenv("RESUME_LATEX_CONCURRENCY", str(os.cpu_count() or 1)))
+# A running task whose lease lapses (the process died mid-task) goes back to the queue
+RESUME_TASK_LEASE = float(os.getenv("RESUME_TASK_LEASE", "600"))
+RESUME_TASK_MAX_ATTEMPTS = int(os.getenv("RESUME_TASK_MAX_ATTEMPTS", "3"))
+# A failed task waits RESUME_TASK_RETRY_DELAY seconds before its second attempt, doubling
+# for each attempt after that up to RESUME_TASK_RETRY_MAX_DELAY, so a model outage or rate
+# limit isn't hammered by immediate retries
+RESUME_TASK_RETRY_DELAY = float(os.getenv("RESUME_TASK_RETRY_DELAY", "30"))
+RESUME_TASK_RETRY_MAX_DELAY = float(os.getenv("RESUME_TASK_RETRY_MAX_DELAY", "600"))
+RESUME_QUEUE_POLL_INTERVAL = float(os.getenv("RESUME_QUEUE_POLL_INTERVAL", "2"))
+# Set to 0 on API replicas that should only enqueue, leaving processing to another instance
+RESUME_QUEUE_ENABLED = os.getenv("RESUME_QUEUE_ENABLED", "1") == "1"
+
+ACTIVE_STATUSES = [ResumeTaskStatus.queued.value, ResumeTaskStatus.running.value]
+
+
+async def enqueue_resume(job_id: ObjectId, force: bool = False) -> dict:
+    """
+    Queues resume generation for a job. Idempotent while a task for it is still queued
+    or running. `force` generates a new resume even if a near-duplicate job has one.
+    """
+    existing = await tasks_collection.find_one({"job_id": job_id, "status": {"$in": ACTIVE_STATUSES}})
+    if existing:
+        return existing
+
+    now = datetime.utcnow()
+    task = {
+        "job_id": job_id,
+        "status": ResumeTaskStatus.queued.value,
+        "attempts": 0,
+        "force": force,
+        "created_at": now,
+        "updated_at": now,
+    }
+    try:
+        await tasks_collection.insert_one(task)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent request for the same job
+        return await tasks_collection.find_one({"job_id": job_id, "status": {"$in": ACTIVE_STATUSES}})
+    resume_queue.notify()
+    return task
+
+
+async def latest_task(job_id: ObjectId):
+    return await tasks_collection.find_one({"job_id": job_id}, sort=[("created_at", -1)])
+
+
+class ResumeQueue:
+    """
+    Mongo-backed task queue drained by asyncio consumers that hand each task to a
+    process pool. Tasks are claimed with a lease that a heartbeat keeps renewing,
+    so work orphaned by a crash or restart is picked up again.
+    """
+
+    def __init__(self, workers: int = RESUME_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._consumers = []
+        self._wakeup = None
+
+    def _new_executor(self):
+        # spawn, not fork: children shouldn't inherit the event loop or the Motor client's sockets
+        ctx = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=resume_worker.init_worker,
+            initargs=(
+                ctx.BoundedSemaphore(RESUME_LLM_CONCURRENCY),
+                ctx.BoundedSemaphore(RESUME_LATEX_CONCURRENCY),
+                ctx.Value("i", 0),
+                RESUME_LATEX_CONCURRENCY,
+            ),
+        )
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        await self.recover_expired()
+        self._executor = self._new_executor()
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        logging.info(f"Resume queue started with {self.workers} workers")
+
+    async def stop(self):
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        if self._executor:
+            # Tasks still running keep their lease and are retried after it expires
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def recover_expired(self):
+        result = await tasks_collection.update_many(
+            {"status": ResumeTaskStatus.running.value, "lease_until": {"$lt": datetime.utcnow()}},
+            {"$set": {"status": ResumeTaskStatus.queued.value, "updated_at": datetime.utcnow()}},
+        )
+        if result.modified_count:
+            logging.warning(f"Requeued {result.modified_count} resume tasks with expired leases")
+
+    async def _claim(self):
+        now = datetime.utcnow()
+        return await tasks_collection.find_one_and_update(
+            # Tasks waiting out a retry delay are skipped; not_before is unset on first attempts
+            {"status": ResumeTaskStatus.queued.value, "not_before": {"$not": {"$gt": now}}},
+            {
+                "$set": {
+                    "status": ResumeTaskStatus.running.value,
+                    "started_at": now,
+                    "updated_at": now,
+                    "lease_until": now + timedelta(seconds=RESUME_TASK_LEASE),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _consume(self):
+        while True:
+            try:
+                task = await self._claim()
+                if task is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), RESUME_QUEUE_POLL_INTERVAL)
+                    except asyncio.TimeoutError:
+                        await self.recover_expired()
+                    continue
+                await self._run(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the consumer alive through transient Mongo errors
+                logging.error(f"Resume queue consumer error: {e}")
+                await asyncio.sleep(RESUME_QUEUE_POLL_INTERVAL)
+
+    async def _heartbeat(self, task_id):
+        while True:
+            await asyncio.sleep(RESUME_TASK_LEASE / 3)
+            try:
+                await tasks_collection.update_one(
+                    {"_id": task_id, "status": ResumeTaskStatus.running.value},
+                    {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=RESUME_TASK_LEASE)}},
+                )
+            except PyMongoError as e:
+                # The lease has two more beats to go; the next one may get through
+                logging.error(f"Could not renew the lease of resume task {task_id}: {e}")
+
+    async def _run(self, task):
+        job = await jobs_collection.find_one({"_id": task["job_id"]}, {"description": 1})
+        description = await load_description(descriptions_collection, job) if job else ""
+        if not description:
+            await self._finish(task, error="Job no longer exists or has no description", retry=False)
+            return
+        if not task.get("force") and await self._reuse(task, description):
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(task["_id"]))
+        executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(executor, resume_worker.generate_resume, description)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); replace the pool and let the task be retried. Every
+            # consumer on the broken pool gets here, but only the first replaces it: the
+            # others would shut down the new pool and cancel the work just sent to it.
+            if self._executor is executor:
+                logging.error("Resume worker pool broke; restarting it")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+            await self._finish(task, error="Worker process crashed", retry=True)
+        except Exception as e:
+            await self._finish(task, error=str(e), retry=True)
+        else:
+            await self._finish(task, result=result)
+        finally:
+            heartbeat.cancel()
+
+    async def _reuse(self, task, description: str) -> bool:
+        """
+        Finishes the task with the resume of the most similar earlier posting, if one
+        above the near-duplicate threshold has a stored resume artifact. Returns whether it did.
+        """
+        sig = signature(description)
+        if sig is None:
+            return False
+        for job_id, similarity in near_duplicate_index.query(sig, exclude=str(task["job_id"])):
+            match = await jobs_collection.find_one({"_id": ObjectId(job_id)}, {"resume_path": 1})
+            path = match.get("resume_path") if match else None
+            # Only resumes in the artifact store; anything else wasn't written by this queue
+            if path and artifact_digest(path) and os.path.exists(path):
+                logging.info(f"Resume task {task['_id']} reuses the resume of job {job_id} (similarity {similarity:.2f})")
+                await self._finish(task, result={
+                    "pdf_path": path, "timings": {}, "reused_from": job_id, "similarity": similarity,
+                })
+                return True
+        return False
+
+    async def _finish(self, task, result=None, error=None, retry=False):
+        now = datetime.utcnow()
+        if result is not None:
+            update = {
+                "status": ResumeTaskStatus.done.value,
+                "resume_path": result["pdf_path"],
+                "timings": result["timings"],
+                "error": None,
+                "reused_from": result.get("reused_from"),
+                "similarity": result.get("similarity"),
+            }
+            await jobs_collection.update_one(
+                {"_id": task["job_id"]}, {"$set": {"resume_path": result["pdf_path"], "updated_at": now}}
+            )
+            job_cache.invalidate()
+            change_feed.publish("update", task["job_id"])
+        elif retry and task["attempts"] < RESUME_TASK_MAX_ATTEMPTS:
+            delay = min(RESUME_TASK_RETRY_DELAY * 2 ** (task["attempts"] - 1), RESUME_TASK_RETRY_MAX_DELAY)
+            logging.warning(
+                f"Resume task {task['_id']} failed (attempt {task['attempts']}), retrying in {delay:.0f}s: {error}"
+            )
+            update = {
+                "status": ResumeTaskStatus.queued.value,
+                "error": error,
+                "not_before": now + timedelta(seconds=delay),
+            }
+        else:
+            logging.error(f"Resume task {task['_id']} failed: {error}")
+            update = {"status": ResumeTaskStatus.failed.value, "error": error}
+        update.update({"updated_at": now, "finished_at": now, "lease_until": None})
+        await tasks_collection.update_one({"_id": task["_id"]}, {"$set": update})
+
+
+resume_queue = ResumeQueue()
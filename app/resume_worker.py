@@ -0,0 +1,68 @@
+"""
+Process-side half of the resume queue (see resume_queue.py). Runs inside
+ProcessPoolExecutor workers, where the CPU-heavy prompt building and the
+latexmk subprocesses are off the API's event loop.
+"""
+import os
+import sys
+
+import artifacts
+
+RESUME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Resume", "Latex")
+KNOWLEDGE_BANK_PATH = os.getenv("RESUME_KNOWLEDGE_BANK", os.path.join(RESUME_DIR, "knowledge_bank.json"))
+OUTPUT_DIR = os.getenv("RESUME_OUTPUT_DIR", os.path.join(RESUME_DIR, "generated_resumes"))
+
+# Set by init_worker in each worker process
+_llm_semaphore = None
+_latex_semaphore = None
+_build_slot = 0
+
+
+def init_worker(llm_semaphore, latex_semaphore, slot_counter, latex_slots):
+    """
+    ProcessPoolExecutor initializer. The semaphores are shared by every worker so the
+    limits on concurrent LLM calls and latexmk processes hold across the whole pool.
+    """
+    global _llm_semaphore, _latex_semaphore, _build_slot
+    _llm_semaphore = llm_semaphore
+    _latex_semaphore = latex_semaphore
+    with slot_counter.get_lock():
+        _build_slot = slot_counter.value % latex_slots
+        slot_counter.value += 1
+
+    # generate.py resolves its caches relative to the working directory; pin them next to the templates
+    os.environ.setdefault("RESUME_LLM_CACHE_DIR", os.path.join(RESUME_DIR, ".llm_cache"))
+    os.environ.setdefault("RESUME_BUILD_DIR", os.path.join(RESUME_DIR, ".latex_build"))
+    os.environ.setdefault("RESUME_RANK_CACHE_DIR", os.path.join(RESUME_DIR, ".rank_cache"))
+    if RESUME_DIR not in sys.path:
+        sys.path.insert(0, RESUME_DIR)
+
+
+def generate_resume(job_description: str) -> dict:
+    """Runs the full pipeline for one job description. Raises if no PDF was produced."""
+    import generate
+    from llm import BoundedLLMClient
+
+    llm_client = generate.get_default_llm_client()
+    if _llm_semaphore is not None:
+        llm_client = BoundedLLMClient(llm_client, _llm_semaphore)
+
+    result = generate.generate_custom_resume_from_knowledge_bank(
+        job_description,
+        knowledge_bank_path=KNOWLEDGE_BANK_PATH,
+        base_resume_path=RESUME_DIR,
+        output_base_folder=OUTPUT_DIR,
+        llm_client=llm_client,
+        compile_lock=_latex_semaphore,
+        build_slot=_build_slot,
+    )
+    if result is None:
+        raise RuntimeError(f"Could not load knowledge bank from {KNOWLEDGE_BANK_PATH}")
+    if not result["pdf_path"]:
+        raise RuntimeError(f"LaTeX compilation failed in {result['output_folder']}")
+
+    # The job points at the deduplicated copy; the build folder keeps only its sources
+    artifact = artifacts.store_pdf(result["pdf_path"])
+    artifacts.prune_build_outputs(result["output_folder"])
+    result["pdf_path"] = artifact["path"]
+    return result
@@ -0,0 +1,47 @@
+from datetime import date, datetime
+
+import msgpack
+import orjson
+from bson import ObjectId
+from fastapi import Request, Response
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def negotiate(request: Request) -> str:
+    """Picks the response media type from the Accept header. JSON unless msgpack is asked for."""
+    accept = request.headers.get("accept", "")
+    if any(alias in accept for alias in _MSGPACK_ALIASES):
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def encode(payload, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        # msgpack has no datetime type that JS clients decode by default; send ISO strings like JSON does
+        return msgpack.packb(payload, default=_default, datetime=False)
+    return orjson.dumps(payload, default=_default)
+
+
+def render(request: Request, payload, status_code: int = 200, headers: dict = None) -> Response:
+    """
+    Encodes a payload our own handlers have already shaped (see models.to_job_out) in the
+    negotiated format. Returning a Response makes FastAPI skip response_model re-validation.
+    """
+    media_type = negotiate(request)
+    return Response(
+        content=encode(payload, media_type),
+        status_code=status_code,
+        media_type=media_type,
+        headers={"Vary": "Accept", **(headers or {})},
+    )
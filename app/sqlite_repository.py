@@ -0,0 +1,616 @@
+"""
+Embedded SQLite storage for single-node deployments (DATABASE_URL=sqlite:///path).
+
+- WAL journal, so reads never wait for the writer and the writer never waits
+  for readers. Writes take the lock up front (BEGIN IMMEDIATE) and queue on
+  busy_timeout instead of failing when two overlap.
+- sqlite3 calls block, so they run on a small thread pool, each thread with its
+  own connection, never on the event loop.
+- Jobs are a table with indexed status, company, date_applied and created_at
+  columns, each index ending in id so keyset pages come straight off it.
+- Descriptions are stored zstd-compressed in job_descriptions (the same
+  encoding as the Mongo side collection, see descriptions.py) and indexed with
+  FTS5 together with title, company and notes. The FTS table is contentless: it
+  holds only the index, not a second, uncompressed copy of the text.
+
+Job IDs are ObjectId strings as with MongoDB, so IDs, cursors and the API look
+the same on both backends.
+"""
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from bson import ObjectId
+
+from bulk import chunks, item_result, prepare_deletes, prepare_inserts, prepare_updates
+from descriptions import decode_description, encode_description
+from models import SUMMARY_FIELDS, JobStatus
+from pagination import decode_cursor
+from repository import DuplicateJobError, JobRepository
+from stats import transition_key
+
+# Threads (and connections) serving queries. WAL allows any number of concurrent
+# readers but one writer, so a few connections are enough for a single node.
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+# How long a write waits for another connection's write to finish
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Job fields stored as columns; the description lives in job_descriptions and jobs_fts
+COLUMNS = (
+    "title", "company", "status", "date_applied", "url", "url_normalized",
+    "resume_path", "notes", "created_at", "updated_at",
+)
+DATETIME_COLUMNS = {"created_at", "updated_at"}
+# Columns indexed in jobs_fts, and their bm25 weights (the same as Mongo's job_text index)
+FTS_COLUMNS = ("title", "company", "notes", "description")
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+SORT_COLUMNS = {"_id": "id", "date_applied": "date_applied", "created_at": "created_at"}
+SUMMARY_SELECT = ", ".join(f"j.{column}" for column in ("id",) + SUMMARY_FIELDS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    status TEXT NOT NULL,
+    date_applied TEXT NOT NULL,
+    url TEXT NOT NULL,
+    url_normalized TEXT UNIQUE,
+    resume_path TEXT,
+    notes TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS status_id ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS company_id ON jobs (company, id);
+CREATE INDEX IF NOT EXISTS date_applied_id ON jobs (date_applied, id);
+CREATE INDEX IF NOT EXISTS created_at_id ON jobs (created_at, id);
+
+CREATE TABLE IF NOT EXISTS job_descriptions (
+    seq INTEGER PRIMARY KEY REFERENCES jobs (seq) ON DELETE CASCADE,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, notes, description, content='', tokenize='porter unicode61'
+);
+
+-- Near-duplicate signatures (see near_duplicates.py)
+CREATE TABLE IF NOT EXISTS job_signatures (
+    seq INTEGER PRIMARY KEY REFERENCES jobs (seq) ON DELETE CASCADE,
+    minhash BLOB NOT NULL,
+    params TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+-- Status changes observed through the API, for GET /jobs/stats
+CREATE TABLE IF NOT EXISTS job_transitions (
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+
+-- Jobs created per status, kept after they are deleted (see stats.summarize_counters)
+CREATE TABLE IF NOT EXISTS job_created (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+-- Databases from before job_created: existing jobs count as created in their current status
+INSERT INTO job_created (status, count)
+    SELECT status, COUNT(*) FROM jobs WHERE NOT EXISTS (SELECT 1 FROM job_created) GROUP BY status;
+"""
+DECLARED_INDEXES = {"status_id", "company_id", "date_applied_id", "created_at_id"}
+SEARCH_TERM_RE = re.compile(r"\w+")
+
+
+def _to_column(field: str, value):
+    if field in DATETIME_COLUMNS and isinstance(value, datetime):
+        # Fixed width, so text order is time order (keyset pagination compares the strings)
+        return value.isoformat(timespec="microseconds")
+    return value
+
+
+def _to_document(row: sqlite3.Row) -> dict:
+    """A row in the Mongo document layout the handlers expect."""
+    doc = {"_id": ObjectId(row["id"])}
+    for key in row.keys():
+        value = row[key]
+        if key in ("seq", "id", "codec", "data"):
+            continue
+        if key in DATETIME_COLUMNS:
+            if value is None:
+                continue  # Mongo documents simply lack updated_at until the first update
+            value = datetime.fromisoformat(value)
+        doc[key] = value
+    if "codec" in row.keys():
+        doc["description"] = decode_description({"codec": row["codec"], "data": row["data"]}) if row["codec"] else ""
+    return doc
+
+
+def _filter_clauses(filters: dict):
+    """pagination.build_job_filter's filters as SQL conditions on jobs j."""
+    clauses, params = [], []
+    status = filters.get("status")
+    if status:
+        clauses.append(f"j.status IN ({', '.join('?' * len(status))})")
+        params.extend(status)
+    if filters.get("company"):
+        clauses.append("j.company = ?")
+        params.append(filters["company"])
+    # date_applied is an ISO "YYYY-MM-DD" string, so string comparison is date order
+    if filters.get("date_from"):
+        clauses.append("j.date_applied >= ?")
+        params.append(filters["date_from"].isoformat())
+    if filters.get("date_to"):
+        clauses.append("j.date_applied <= ?")
+        params.append(filters["date_to"].isoformat())
+    return clauses, params
+
+
+def _keyset_clause(sort_field: str, descending: bool, after: str):
+    """Rows strictly after the cursor in (sort column, id) order. Raises ValueError on a bad cursor."""
+    value, last_id = decode_cursor(after)
+    op = "<" if descending else ">"
+    column = SORT_COLUMNS[sort_field]
+    if column == "id":
+        return f"j.id {op} ?", [str(last_id)]
+    if column == "created_at" and value is not None:
+        try:
+            value = _to_column("created_at", datetime.fromisoformat(value))
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+    return f"(j.{column}, j.id) {op} (?, ?)", [value, str(last_id)]
+
+
+def _match_expression(q: str) -> str:
+    # Any of the words, like Mongo's $text; quoting keeps FTS5 operators in user input literal
+    return " OR ".join(f'"{term}"' for term in SEARCH_TERM_RE.findall(q))
+
+
+@contextmanager
+def _write(conn: sqlite3.Connection):
+    """A write transaction; takes the write lock up front so it can't fail halfway on a lock upgrade."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class ConnectionPool:
+    """Runs functions of a connection on a fixed set of threads, each owning one connection."""
+
+    def __init__(self, path: str, size: int = SQLITE_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="sqlite")
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        # Autocommit mode (isolation_level=None): transactions are explicit, see _write
+        conn = sqlite3.connect(
+            self.path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only risks the last transactions on power loss, never corruption
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _call(self, fn, args):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+            with self._lock:
+                self._connections.append(conn)
+        return fn(conn, *args)
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn, args)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+class SQLiteJobRepository(JobRepository):
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pool = None
+
+    async def connect(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self.pool = ConnectionPool(self.path)
+        await self.pool.run(lambda conn: conn.executescript(SCHEMA))
+        logging.info(f"Using SQLite database at {self.path}")
+
+    async def close(self):
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+    async def ping(self) -> float:
+        start = time.perf_counter()
+        await self.pool.run(lambda conn: conn.execute("SELECT 1").fetchone())
+        return (time.perf_counter() - start) * 1000
+
+    # --- synchronous helpers, run on the pool's threads ---
+
+    @staticmethod
+    def _description(conn, seq: int) -> str:
+        row = conn.execute("SELECT codec, data FROM job_descriptions WHERE seq = ?", (seq,)).fetchone()
+        return decode_description(row) if row else ""
+
+    @staticmethod
+    def _index(conn, seq: int, job: dict, description: str, old: Optional[tuple] = None):
+        """(Re)indexes a job in jobs_fts. A contentless table needs the old values to remove an entry."""
+        if old is not None:
+            conn.execute(
+                "INSERT INTO jobs_fts (jobs_fts, rowid, title, company, notes, description) VALUES ('delete', ?, ?, ?, ?, ?)",
+                (seq, *old),
+            )
+        conn.execute(
+            "INSERT INTO jobs_fts (rowid, title, company, notes, description) VALUES (?, ?, ?, ?, ?)",
+            (seq, job["title"], job["company"], job.get("notes"), description),
+        )
+
+    @staticmethod
+    def _store_description(conn, seq: int, description: str):
+        stored = encode_description(description)
+        conn.execute(
+            "INSERT OR REPLACE INTO job_descriptions (seq, codec, data, size) VALUES (?, ?, ?, ?)",
+            (seq, stored["codec"], stored["data"], stored["size"]),
+        )
+
+    def _insert(self, conn, job_dict: dict) -> dict:
+        """Inserts inside the caller's transaction. Raises DuplicateJobError."""
+        job = dict(job_dict)
+        description = job.pop("description", None) or ""
+        job_id = ObjectId()
+        try:
+            cursor = conn.execute(
+                f"INSERT INTO jobs (id, {', '.join(COLUMNS)}) VALUES (?{', ?' * len(COLUMNS)})",
+                (str(job_id), *(_to_column(column, job.get(column)) for column in COLUMNS)),
+            )
+        except sqlite3.IntegrityError:
+            raise DuplicateJobError()
+        self._store_description(conn, cursor.lastrowid, description)
+        self._index(conn, cursor.lastrowid, job, description)
+        conn.execute(
+            "INSERT INTO job_created (status, count) VALUES (?, 1) ON CONFLICT (status) DO UPDATE SET count = count + 1",
+            (job["status"],),
+        )
+        job["_id"] = job_id
+        job["description"] = description
+        return job
+
+    def _apply_update(self, conn, job_id: ObjectId, fields: dict) -> Optional[dict]:
+        """Updates inside the caller's transaction; returns the job after the write. Raises DuplicateJobError."""
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (str(job_id),)).fetchone()
+        if row is None:
+            return None
+        seq = row["seq"]
+        job = _to_document(row)
+        old_description = self._description(conn, seq)
+        description = fields.get("description")
+        columns = [column for column in COLUMNS if column in fields]
+        if columns:
+            try:
+                conn.execute(
+                    f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in columns)} WHERE seq = ?",
+                    (*(_to_column(column, fields[column]) for column in columns), seq),
+                )
+            except sqlite3.IntegrityError:
+                raise DuplicateJobError()
+        if description is not None:
+            self._store_description(conn, seq, description)
+        else:
+            description = old_description
+        updated = {**job, **fields, "description": description}
+        if any(updated[field] != (job.get(field) if field != "description" else old_description) for field in FTS_COLUMNS):
+            old = (job["title"], job["company"], job.get("notes"), old_description)
+            self._index(conn, seq, updated, description, old=old)
+        if "status" in fields and fields["status"] != job["status"]:
+            conn.execute(
+                "INSERT INTO job_transitions (key, count) VALUES (?, 1) ON CONFLICT (key) DO UPDATE SET count = count + 1",
+                (transition_key(job["status"], fields["status"]),),
+            )
+        return updated
+
+    def _remove(self, conn, job_id: ObjectId) -> bool:
+        row = conn.execute("SELECT seq, title, company, notes FROM jobs WHERE id = ?", (str(job_id),)).fetchone()
+        if row is None:
+            return False
+        old = (row["title"], row["company"], row["notes"], self._description(conn, row["seq"]))
+        conn.execute(
+            "INSERT INTO jobs_fts (jobs_fts, rowid, title, company, notes, description) VALUES ('delete', ?, ?, ?, ?, ?)",
+            (row["seq"], *old),
+        )
+        # job_descriptions goes with it (ON DELETE CASCADE)
+        conn.execute("DELETE FROM jobs WHERE seq = ?", (row["seq"],))
+        return True
+
+    # --- single-job operations ---
+
+    async def create(self, job_dict: dict) -> dict:
+        def create(conn):
+            with _write(conn):
+                return self._insert(conn, job_dict)
+
+        return await self.pool.run(create)
+
+    async def get(self, job_id: ObjectId) -> Optional[dict]:
+        def get(conn):
+            row = conn.execute(
+                "SELECT j.*, d.codec, d.data FROM jobs j LEFT JOIN job_descriptions d ON d.seq = j.seq WHERE j.id = ?",
+                (str(job_id),),
+            ).fetchone()
+            return _to_document(row) if row else None
+
+        return await self.pool.run(get)
+
+    async def get_description(self, job_id: ObjectId) -> Optional[str]:
+        job = await self.get(job_id)
+        return job["description"] if job else None
+
+    async def get_resume_path(self, job_id: ObjectId) -> Optional[str]:
+        def get_resume_path(conn):
+            row = conn.execute("SELECT resume_path FROM jobs WHERE id = ?", (str(job_id),)).fetchone()
+            return (row["resume_path"] or "") if row else None
+
+        return await self.pool.run(get_resume_path)
+
+    async def resume_paths(self) -> Set[str]:
+        def resume_paths(conn):
+            return {row["resume_path"] for row in conn.execute(
+                "SELECT DISTINCT resume_path FROM jobs WHERE resume_path IS NOT NULL AND resume_path != ''"
+            )}
+
+        return await self.pool.run(resume_paths)
+
+    async def save_signatures(self, signatures: Dict[ObjectId, Optional[bytes]], params: str):
+        now = _to_column("updated_at", datetime.utcnow())
+        removed = [(str(job_id),) for job_id, minhash in signatures.items() if minhash is None]
+        stored = [(minhash, params, now, str(job_id)) for job_id, minhash in signatures.items() if minhash is not None]
+
+        def save(conn):
+            with _write(conn):
+                conn.executemany("DELETE FROM job_signatures WHERE seq = (SELECT seq FROM jobs WHERE id = ?)", removed)
+                conn.executemany(
+                    "INSERT INTO job_signatures (seq, minhash, params, updated_at) "
+                    "SELECT seq, ?, ?, ? FROM jobs WHERE id = ? "
+                    "ON CONFLICT (seq) DO UPDATE SET minhash = excluded.minhash, params = excluded.params, "
+                    "updated_at = excluded.updated_at",
+                    stored,
+                )
+
+        if signatures:
+            await self.pool.run(save)
+
+    async def iter_signatures(self, params: str, since: Optional[datetime] = None, batch_size: int = 5000):
+        clauses, args = ["s.params = ?"], [params]
+        if since is not None:
+            clauses.append("s.updated_at > ?")
+            args.append(_to_column("updated_at", since))
+        sql = (
+            "SELECT s.seq, j.id, s.minhash, s.updated_at FROM job_signatures s JOIN jobs j ON j.seq = s.seq "
+            f"WHERE {' AND '.join(clauses)} AND s.seq > ? ORDER BY s.seq LIMIT ?"
+        )
+        last_seq = 0
+        while True:
+            def query(conn, after=last_seq):
+                return conn.execute(sql, (*args, after, batch_size)).fetchall()
+
+            batch = await self.pool.run(query)
+            for row in batch:
+                yield ObjectId(row["id"]), row["minhash"], datetime.fromisoformat(row["updated_at"])
+            if len(batch) < batch_size:
+                return
+            last_seq = batch[-1]["seq"]
+
+    async def replace(self, job_id: ObjectId, job_dict: dict) -> Optional[dict]:
+        return await self.update(job_id, job_dict)
+
+    async def update(self, job_id: ObjectId, fields: dict) -> Optional[dict]:
+        def update(conn):
+            with _write(conn):
+                return self._apply_update(conn, job_id, fields)
+
+        return await self.pool.run(update)
+
+    async def delete(self, job_id: ObjectId) -> bool:
+        def delete(conn):
+            with _write(conn):
+                return self._remove(conn, job_id)
+
+        return await self.pool.run(delete)
+
+    # --- queries ---
+
+    async def list_jobs(
+        self, filters: dict, sort_field: str, descending: bool, after: Optional[str], limit: int,
+        include_description: bool = False,
+    ) -> List[dict]:
+        clauses, params = _filter_clauses(filters)
+        if after:
+            clause, keyset_params = _keyset_clause(sort_field, descending, after)
+            clauses.append(clause)
+            params.extend(keyset_params)
+        column = SORT_COLUMNS[sort_field]
+        direction = "DESC" if descending else "ASC"
+        order = f"j.id {direction}" if column == "id" else f"j.{column} {direction}, j.id {direction}"
+        select, join = SUMMARY_SELECT, ""
+        if include_description:
+            select += ", d.codec, d.data"
+            join = "LEFT JOIN job_descriptions d ON d.seq = j.seq"
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {select} FROM jobs j {join} {where} ORDER BY {order} LIMIT ?"
+
+        def query(conn):
+            return [_to_document(row) for row in conn.execute(sql, (*params, limit))]
+
+        return await self.pool.run(query)
+
+    async def search(
+        self, q: str, status: Optional[List[str]], offset: int, limit: int, include_description: bool = False
+    ) -> List[dict]:
+        match = _match_expression(q)
+        if not match:
+            return []
+        clauses, params = _filter_clauses({"status": status})
+        select, join = SUMMARY_SELECT, ""
+        if include_description:
+            select += ", d.codec, d.data"
+            join = "LEFT JOIN job_descriptions d ON d.seq = j.seq"
+        # bm25() is lower for better matches; negated so "score" sorts like Mongo's textScore
+        sql = (
+            f"SELECT {select}, -bm25(jobs_fts, {', '.join(map(str, FTS_WEIGHTS))}) AS score "
+            f"FROM jobs_fts JOIN jobs j ON j.seq = jobs_fts.rowid {join} "
+            f"WHERE jobs_fts MATCH ? {''.join(f' AND {clause}' for clause in clauses)} "
+            f"ORDER BY score DESC, j.id LIMIT ? OFFSET ?"
+        )
+
+        def query(conn):
+            return [_to_document(row) for row in conn.execute(sql, (match, *params, limit, offset))]
+
+        return await self.pool.run(query)
+
+    async def iter_jobs(self, filters: dict, batch_size: int):
+        clauses, params = _filter_clauses(filters)
+        last_id = ""
+        while True:
+            where = " AND ".join(clauses + ["j.id > ?"])
+            sql = (
+                "SELECT j.*, d.codec, d.data FROM jobs j LEFT JOIN job_descriptions d ON d.seq = j.seq "
+                f"WHERE {where} ORDER BY j.id LIMIT ?"
+            )
+
+            def query(conn, after=last_id):
+                return [_to_document(row) for row in conn.execute(sql, (*params, after, batch_size))]
+
+            batch = await self.pool.run(query)
+            for job in batch:
+                yield job
+            if len(batch) < batch_size:
+                return
+            last_id = str(batch[-1]["_id"])
+
+    # --- bulk operations: one transaction per chunk ---
+
+    async def bulk_insert(self, items: List[dict], chunk_size: int) -> List[dict]:
+        results, valid = prepare_inserts(items)
+
+        def insert(conn, chunk):
+            with _write(conn):
+                for index, job_dict in chunk:
+                    try:
+                        job = self._insert(conn, job_dict)
+                    except DuplicateJobError:
+                        results[index] = item_result(index, error="A job with this URL already exists")
+                    else:
+                        results[index] = item_result(index, job_id=str(job["_id"]))
+
+        for _, chunk in chunks(valid, chunk_size):
+            await self.pool.run(insert, chunk)
+        return results
+
+    async def bulk_update(self, items: List[dict], chunk_size: int) -> List[dict]:
+        results, valid = prepare_updates(items)
+
+        def update(conn, chunk):
+            with _write(conn):
+                for index, oid, fields in chunk:
+                    try:
+                        job = self._apply_update(conn, oid, fields)
+                    except DuplicateJobError:
+                        results[index] = item_result(index, job_id=str(oid), error="A job with this URL already exists")
+                        continue
+                    results[index] = item_result(index, job_id=str(oid), error=None if job else "Job not found")
+
+        for _, chunk in chunks(valid, chunk_size):
+            await self.pool.run(update, chunk)
+        return results
+
+    async def bulk_delete(self, ids: List[str], chunk_size: int) -> List[dict]:
+        results, valid = prepare_deletes(ids)
+
+        def delete(conn, chunk):
+            with _write(conn):
+                for index, oid in chunk:
+                    error = None if self._remove(conn, oid) else "Job not found"
+                    results[index] = item_result(index, job_id=str(oid), error=error)
+
+        for _, chunk in chunks(valid, chunk_size):
+            await self.pool.run(delete, chunk)
+        return results
+
+    # --- stats ---
+
+    async def get_counters(self, recompute: bool = False) -> dict:
+        # Counting over the status index is cheap here, so the counters are always exact
+        def counters(conn):
+            by_status = {status.value: 0 for status in JobStatus}
+            for row in conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"):
+                by_status[row["status"]] = row["count"]
+            transitions = {row["key"]: row["count"] for row in conn.execute("SELECT key, count FROM job_transitions")}
+            created = {row["status"]: row["count"] for row in conn.execute("SELECT status, count FROM job_created")}
+            return {
+                "total": sum(by_status.values()),
+                "by_status": by_status,
+                "transitions": transitions,
+                "created": created,
+                "recomputed_at": datetime.utcnow(),
+            }
+
+        return await self.pool.run(counters)
+
+    async def get_breakdown(self, top_companies: int = 20, weeks: int = 12) -> dict:
+        def breakdown(conn):
+            by_company = conn.execute(
+                "SELECT company AS key, COUNT(*) AS count FROM jobs GROUP BY company ORDER BY count DESC, company LIMIT ?",
+                (top_companies,),
+            ).fetchall()
+            # The Monday on or before date_applied, like Mongo's $dateTrunc with startOfWeek monday
+            by_week = conn.execute(
+                "SELECT date(date_applied, '-6 days', 'weekday 1') AS key, COUNT(*) AS count FROM jobs "
+                "GROUP BY key HAVING key IS NOT NULL ORDER BY key DESC LIMIT ?",
+                (weeks,),
+            ).fetchall()
+            return {
+                "by_company": [dict(row) for row in by_company],
+                "by_week": [dict(row) for row in reversed(by_week)],
+            }
+
+        return await self.pool.run(breakdown)
+
+    async def index_usage(self) -> List[dict]:
+        def indexes(conn):
+            usage = []
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'jobs'"):
+                key = {info["name"]: 1 for info in conn.execute(f"PRAGMA index_info('{row['name']}')")}
+                # SQLite keeps no per-index access counters
+                usage.append({"name": row["name"], "key": key, "declared": row["name"] in DECLARED_INDEXES})
+            return sorted(usage, key=lambda u: u["name"])
+
+        return await self.pool.run(indexes)
@@ -0,0 +1,130 @@
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Tuple
+
+from db import jobs_collection, stats_collection
+from models import JobStatus
+
+# _id of the single materialized counters document in stats_collection
+COUNTERS_ID = "jobs"
+
+
+def transition_key(old: str, new: str) -> str:
+    return f"{old}_to_{new}"
+
+
+async def apply_counter_deltas(
+    created: Iterable[str] = (),
+    deleted: Iterable[str] = (),
+    transitions: Iterable[Tuple[str, str]] = (),
+):
+    """
+    Folds status changes from a write into the counters document with a single
+    atomic $inc. `created`/`deleted` are statuses, `transitions` (old, new) pairs.
+    Like transitions, `created.<status>` is history: deletions don't undo it.
+    """
+    inc = Counter()
+    for status in created:
+        inc["total"] += 1
+        inc[f"by_status.{status}"] += 1
+        inc[f"created.{status}"] += 1
+    for status in deleted:
+        inc["total"] -= 1
+        inc[f"by_status.{status}"] -= 1
+    for old, new in transitions:
+        if old == new:
+            continue
+        inc[f"by_status.{old}"] -= 1
+        inc[f"by_status.{new}"] += 1
+        inc[f"transitions.{transition_key(old, new)}"] += 1
+
+    inc = {field: delta for field, delta in inc.items() if delta}
+    if inc:
+        await stats_collection.update_one({"_id": COUNTERS_ID}, {"$inc": inc}, upsert=True)
+
+
+async def recompute_counters() -> dict:
+    """Rebuilds the status counters from the jobs collection. Transition and creation history is kept."""
+    by_status = {status.value: 0 for status in JobStatus}
+    async for row in jobs_collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+        if row["_id"] is not None:
+            by_status[row["_id"]] = row["count"]
+    counters = {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "recomputed_at": datetime.utcnow(),
+    }
+    existing = await stats_collection.find_one({"_id": COUNTERS_ID}, {"created": 1})
+    if existing is None or "created" not in existing:
+        # Jobs from before creations were counted: taken as created in their current status
+        counters["created"] = dict(by_status)
+    await stats_collection.update_one({"_id": COUNTERS_ID}, {"$set": counters}, upsert=True)
+    return await stats_collection.find_one({"_id": COUNTERS_ID})
+
+
+async def get_counters(recompute: bool = False) -> dict:
+    counters = None if recompute else await stats_collection.find_one({"_id": COUNTERS_ID})
+    # No counters yet (fresh install, or jobs that predate them): build them once
+    if counters is None or "recomputed_at" not in counters or "created" not in counters:
+        counters = await recompute_counters()
+    return counters
+
+
+async def get_breakdown(top_companies: int = 20, weeks: int = 12) -> dict:
+    """Per-company and per-week application counts from one $facet aggregation."""
+    pipeline = [
+        {
+            "$facet": {
+                "by_company": [
+                    {"$group": {"_id": "$company", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                    {"$limit": top_companies},
+                ],
+                "by_week": [
+                    {"$match": {"date_applied": {"$type": "string"}}},
+                    {
+                        "$group": {
+                            "_id": {
+                                "$dateTrunc": {
+                                    "date": {"$dateFromString": {"dateString": "$date_applied"}},
+                                    "unit": "week",
+                                    "startOfWeek": "monday",
+                                }
+                            },
+                            "count": {"$sum": 1},
+                        }
+                    },
+                    {"$sort": {"_id": -1}},
+                    {"$limit": weeks},
+                ],
+            }
+        }
+    ]
+    result = {"by_company": [], "by_week": []}
+    async for row in jobs_collection.aggregate(pipeline):
+        result["by_company"] = [{"key": r["_id"], "count": r["count"]} for r in row["by_company"]]
+        result["by_week"] = [
+            {"key": r["_id"].date().isoformat(), "count": r["count"]} for r in reversed(row["by_week"])
+        ]
+    return result
+
+
+def summarize_counters(counters: dict) -> dict:
+    by_status = {status.value: 0 for status in JobStatus}
+    by_status.update(counters.get("by_status", {}))
+    total = counters.get("total", 0)
+    transitions = counters.get("transitions", {})
+    # Jobs can be created in any status and move on from Interview, so the rate comes from
+    # history: moves Applied -> Interview over every time a job was created as or moved to Applied
+    applied = JobStatus.applied.value
+    ever_applied = counters.get("created", {}).get(applied, 0) + sum(
+        transitions.get(transition_key(status.value, applied), 0) for status in JobStatus if status.value != applied
+    )
+    converted = transitions.get(transition_key(applied, JobStatus.interview.value), 0)
+    return {
+        "total": total,
+        "by_status": by_status,
+        "transitions": transitions,
+        "applied_to_interview_rate": converted / ever_applied if ever_applied else 0.0,
+        "recomputed_at": counters.get("recomputed_at"),
+    }
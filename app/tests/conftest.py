@@ -0,0 +1,39 @@
+"""
+Tests for the API and the resume pipeline.
+
+    cd app && python -m pytest tests
+
+Besides requirements.txt they need pytest, httpx and mongomock-motor: the MongoDB
+backend runs in memory, as with benchmarks/bench_api.py --in-memory.
+"""
+import asyncio
+import os
+import sys
+
+import motor.motor_asyncio
+import mongomock_motor
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [APP_DIR, os.path.join(APP_DIR, "Resume", "Latex")]
+
+# No change streams, background queue or index refresh: tests drive those directly
+os.environ.setdefault("EVENTS_USE_CHANGE_STREAM", "0")
+os.environ.setdefault("RESUME_QUEUE_ENABLED", "0")
+os.environ.setdefault("NEAR_DUP_REFRESH_SECONDS", "0")
+
+# db.py builds its client at import time, so this has to happen before importing the app
+motor.motor_asyncio.AsyncIOMotorClient = lambda *args, **kwargs: mongomock_motor.AsyncMongoMockClient()
+
+
+@pytest.fixture
+def mongo():
+    """The in-memory MongoDB database, emptied: it lives as long as the test session."""
+    from db import db
+
+    async def clear():
+        for name in await db.list_collection_names():
+            await db[name].delete_many({})
+
+    asyncio.run(clear())
+    return db
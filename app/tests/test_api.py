@@ -0,0 +1,30 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from db import signatures_collection
+
+DESCRIPTION = " ".join(f"word{i % 40} skill{i % 7}" for i in range(120))
+
+
+def job(i, **fields):
+    return {"title": f"Engineer {i}", "description": DESCRIPTION, "url": f"https://example.com/jobs/{i}",
+            "company": "Acme", "status": "Applied", "date_applied": "2024-01-02", **fields}
+
+
+@pytest.fixture
+def client(mongo):
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_create_job_in_memory_mongo(client):
+    first = client.post("/jobs", json=job(1))
+    assert first.status_code == 200, first.text
+    assert client.get(f"/jobs/{first.json()['id']}").json()["description"] == DESCRIPTION
+    assert client.portal.call(signatures_collection.count_documents, {}) >= 1
+
+    # The repost is flagged as a near duplicate of the first posting
+    second = client.post("/jobs", json=job(2, description=DESCRIPTION + " remote"))
+    assert second.status_code == 200, second.text
+    assert first.json()["id"] in [match["id"] for match in second.json()["near_duplicates"]]
@@ -0,0 +1,76 @@
+import mongomock
+import pymongo
+import pytest
+from bson import ObjectId
+
+import artifacts
+import batch
+
+
+class Crash(BaseException):
+    """Stands in for the process dying: not caught like a job's own failure."""
+
+
+@pytest.fixture
+def jobs_collection(monkeypatch, tmp_path):
+    client = mongomock.MongoClient()
+    client.close = lambda: None  # shared by every run of the test
+    monkeypatch.setattr(pymongo, "MongoClient", lambda *args, **kwargs: client)
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", str(tmp_path / "artifacts"))
+    return client["job_tracker"]["jobs"]
+
+
+def fake_generate(tmp_path, crash_on=None):
+    def generate(description, output_base_folder, **kwargs):
+        if description == crash_on:
+            raise Crash()
+        folder = tmp_path / "out" / description
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "resume.tex").write_text(description)
+        (folder / "resume.pdf").write_bytes(f"%PDF {description}".encode())
+        return {"output_folder": str(folder), "pdf_path": str(folder / "resume.pdf"), "sections": {},
+                "timings": {}, "prompt_tokens": {}}
+    return generate
+
+
+def run(jobs, state_path):
+    state = batch.BatchState(state_path)
+    write_back = batch.ResumeWriteBack(state)
+    write_back.replay()
+    return batch.run_batch(jobs, "kb.json", ".", "out", llm_client=None, state=state, workers=1,
+                           on_done=write_back.write)
+
+
+def test_write_back_survives_crash(jobs_collection, monkeypatch, tmp_path):
+    ids = [ObjectId() for _ in range(5)]
+    jobs_collection.insert_many([{"_id": job_id} for job_id in ids])
+    jobs = [{"id": str(job_id), "description": f"job{i}"} for i, job_id in enumerate(ids)]
+    state_path = str(tmp_path / "state.jsonl")
+
+    # The first run dies after journaling job1 as done, before writing it back; the
+    # second replays job1 and dies while generating job3
+    monkeypatch.setattr(batch.generate, "generate_custom_resume_from_knowledge_bank",
+                        fake_generate(tmp_path, crash_on="job3"))
+    store_pdf = artifacts.store_pdf
+
+    def store_or_crash(path):
+        if "job1" in path:
+            raise Crash()
+        return store_pdf(path)
+
+    monkeypatch.setattr(artifacts, "store_pdf", store_or_crash)
+    with pytest.raises(Crash):
+        run(jobs[:2], state_path)
+    monkeypatch.setattr(artifacts, "store_pdf", store_pdf)
+    with pytest.raises(Crash):
+        run(jobs, state_path)
+    # job0, job1 (replayed at the start of the second run) and job2
+    assert jobs_collection.count_documents({"resume_path": {"$exists": True}}) == 3
+
+    # The re-run generates the rest; every job ends up pointing at a stored artifact
+    monkeypatch.setattr(batch.generate, "generate_custom_resume_from_knowledge_bank", fake_generate(tmp_path))
+    results, _ = run(jobs, state_path)
+    assert sorted(r["id"] for r in results) == [str(ids[3]), str(ids[4])]
+    for job in jobs_collection.find():
+        assert artifacts.artifact_digest(job["resume_path"]) is not None
+    assert all(record["written_back"] for record in batch.BatchState(state_path).records.values())
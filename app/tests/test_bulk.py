@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+
+from bulk import prepare_updates
+from repository import create_repository
+from stats import summarize_counters
+
+JOB_ID = "665f1c2e9b1d8c0a1b2c3d4e"
+
+
+def test_prepare_updates_rejects_repeated_ids():
+    results, valid = prepare_updates([
+        {"id": JOB_ID, "status": "Interview"},
+        {"id": JOB_ID, "status": "Rejected"},
+        {"id": JOB_ID.upper(), "notes": "same job"},
+    ])
+    assert [index for index, _, _ in valid] == [0]
+    assert results[0] is None
+    assert [r["error"] for r in results[1:]] == ["Job already updated earlier in this request"] * 2
+
+
+def test_bulk_update_counts_one_transition_per_job(tmp_path):
+    repository = create_repository(f"sqlite:///{tmp_path / 'jobs.db'}")
+
+    async def scenario():
+        await repository.connect()
+        try:
+            job = await repository.create({
+                "title": "Engineer", "description": "", "url": "https://example.com/jobs/1",
+                "url_normalized": "example.com/jobs/1", "company": "Acme", "status": "Applied",
+                "date_applied": "2024-01-02", "created_at": datetime.utcnow(),
+            })
+            job_id = str(job["_id"])
+            results = await repository.bulk_update(
+                [{"id": job_id, "status": "Interview"}, {"id": job_id, "status": "Rejected"}], chunk_size=100
+            )
+            return results, summarize_counters(await repository.get_counters()), await repository.get(job["_id"])
+        finally:
+            await repository.close()
+
+    results, stats, job = asyncio.run(scenario())
+    assert [r["ok"] for r in results] == [True, False]
+    assert job["status"] == "Interview"
+    assert stats["by_status"] == {"Applied": 0, "Interview": 1, "Rejected": 0}
+    assert stats["transitions"] == {"Applied_to_Interview": 1}
@@ -0,0 +1,37 @@
+import os
+import subprocess
+
+import latex_build
+
+
+def fake_pdflatex(fail):
+    calls = []
+
+    def run(args, cwd, **kwargs):
+        calls.append(args)
+        if not fail():
+            open(os.path.join(cwd, "preamble.fmt"), "w").close()
+        return subprocess.CompletedProcess(args, 1 if fail() else 0, stdout="log", stderr="")
+    return run, calls
+
+
+def test_failed_format_build_is_retried(monkeypatch, tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "resume.tex").write_text("\\documentclass{article}\n\\begin{document}\nHi\n\\end{document}\n")
+    engine = latex_build.LatexBuildEngine(build_dir=str(tmp_path / "build"))
+    failing = [True]
+    run, calls = fake_pdflatex(lambda: failing[0])
+    monkeypatch.setattr(latex_build.subprocess, "run", run)
+
+    # A failure is remembered, so builds don't pay for it again straight away
+    assert engine.ensure_format(str(source)) is None
+    assert engine.ensure_format(str(source)) is None
+    assert len(calls) == 1
+
+    # Once the retry delay has passed (e.g. the missing package got installed) it is built
+    failing[0] = False
+    monkeypatch.setattr(latex_build, "FORMAT_RETRY_SECONDS", 0)
+    fmt_base = engine.ensure_format(str(source))
+    assert fmt_base is not None and os.path.exists(fmt_base + ".fmt")
+    assert len(calls) == 2
@@ -0,0 +1,40 @@
+import asyncio
+from datetime import datetime
+
+from near_duplicates import NearDuplicateIndex, signature
+from repository import create_repository
+
+DESCRIPTION = " ".join(f"word{i % 40} skill{i % 7}" for i in range(120))
+
+
+def test_refresh_applies_deletions_from_other_processes(mongo):
+    repository = create_repository("mongodb://localhost:27017/job_tracker")
+    # Two API processes, each with its own in-memory index
+    ours, theirs = NearDuplicateIndex(), NearDuplicateIndex()
+
+    async def scenario():
+        await repository.connect()
+        try:
+            kept, deleted = [
+                await repository.create({
+                    "title": f"Engineer {i}", "description": DESCRIPTION, "url": f"https://example.com/jobs/{i}",
+                    "url_normalized": f"example.com/jobs/{i}", "company": "Acme", "status": "Applied",
+                    "date_applied": "2024-01-02", "created_at": datetime.utcnow(),
+                })
+                for i in (1, 2)
+            ]
+            sig = signature(DESCRIPTION)
+            for job in (kept, deleted):
+                await theirs.index_job(repository, job["_id"], sig)
+            await ours.load(repository)
+            before = {job_id for job_id, _ in ours.query(sig)}
+
+            await repository.delete(deleted["_id"])
+            await ours.load(repository)
+            return before, {job_id for job_id, _ in ours.query(sig)}, str(kept["_id"]), str(deleted["_id"])
+        finally:
+            await repository.close()
+
+    before, after, kept_id, deleted_id = asyncio.run(scenario())
+    assert before == {kept_id, deleted_id}
+    assert after == {kept_id}
@@ -0,0 +1,20 @@
+import ranking
+
+PROJECTS = [{"name": f"Project {i}", "description": f"Built {topic} tooling"}
+            for i, topic in enumerate(["compiler", "kubernetes", "payments", "python", "graphics", "search"])]
+
+
+def test_rank_projects_keeps_bank_order_without_matches(tmp_path):
+    ranker = ranking.KnowledgeBankRanker(cache_dir=str(tmp_path))
+    assert ranker.rank_projects(PROJECTS, "Gardener wanted", top_k=3) == PROJECTS[:3]
+    # With matches, the best-scoring projects are kept, still in bank order
+    assert ranker.rank_projects(PROJECTS, "Python search engineer", top_k=2) == [PROJECTS[3], PROJECTS[5]]
+
+
+def test_token_report_compares_same_serialization(tmp_path):
+    ranker = ranking.KnowledgeBankRanker(cache_dir=str(tmp_path))
+    bank = {"skills": {"languages": ["Python", "Go"]}, "experience": [], "projects": PROJECTS[:2]}
+    # Nothing is trimmed, so nothing is reported as saved
+    _, report = ranker.rank(bank, "Python and Go engineer")
+    for section in report.values():
+        assert section["tokens_before"] == section["tokens_after"]
@@ -0,0 +1,42 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from repository import create_repository
+from stats import summarize_counters
+
+
+def job(i, status):
+    return {"title": f"Engineer {i}", "description": "", "url": f"https://example.com/jobs/{i}",
+            "url_normalized": f"example.com/jobs/{i}", "company": "Acme", "status": status,
+            "date_applied": "2024-01-02", "created_at": datetime.utcnow()}
+
+
+@pytest.fixture(params=["mongo", "sqlite"])
+def repository(request, tmp_path):
+    if request.param == "sqlite":
+        return create_repository(f"sqlite:///{tmp_path / 'jobs.db'}")
+    request.getfixturevalue("mongo")
+    return create_repository("mongodb://localhost:27017/job_tracker")
+
+
+def test_applied_to_interview_rate_counts_conversions(repository):
+    async def scenario():
+        await repository.connect()
+        try:
+            converted = await repository.create(job(1, "Applied"))
+            await repository.create(job(2, "Applied"))
+            # Created straight into Interview: not an Applied job that converted
+            await repository.create(job(3, "Interview"))
+            await repository.update(converted["_id"], {"status": "Interview"})
+            # Still converted after moving on to Rejected
+            await repository.update(converted["_id"], {"status": "Rejected"})
+            return summarize_counters(await repository.get_counters())
+        finally:
+            await repository.close()
+
+    stats = asyncio.run(scenario())
+    assert stats["by_status"] == {"Applied": 1, "Interview": 1, "Rejected": 1}
+    assert stats["transitions"]["Applied_to_Interview"] == 1
+    assert stats["applied_to_interview_rate"] == 0.5
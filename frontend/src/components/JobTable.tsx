@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react"
+import { useEffect, useRef, useState } from "react"
 import StatusDropdown from "./StatusDropdown"
 
 export interface Job {
@@ -9,38 +9,109 @@ export interface Job {
     date_applied: string
 }
 
+interface JobPage {
+    items: Job[]
+    next_cursor: string | null
+}
+
+// A change pushed by GET /jobs/events. `job` is null when the server only knows the id.
+interface JobEvent {
+    op: "insert" | "update" | "delete"
+    id: string
+    job: Job | null
+}
+
+const PAGE_SIZE = 50
+
+async function fetchJobPage(after: string | null): Promise<JobPage> {
+    const params = new URLSearchParams({ limit: PAGE_SIZE.toString() })
+    if (after) params.set("after", after)
+    const res = await fetch(`http://localhost:8000/jobs?${params}`)
+    return res.json()
+}
+
+async function fetchJob(id: string): Promise<Job | null> {
+    const res = await fetch(`http://localhost:8000/jobs/${id}`)
+    return res.ok ? res.json() : null
+}
+
 export default function JobTable() {
     const [jobs, setJobs] = useState<Job[]>([])
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
     const [loading, setLoading] = useState(true)
+    // The event handlers outlive renders, so they read the cursor through a ref
+    const nextCursorRef = useRef<string | null>(null)
+    nextCursorRef.current = nextCursor
+
+    const loadFirstPage = () =>
+        fetchJobPage(null).then(page => {
+            setJobs(page.items)
+            setNextCursor(page.next_cursor)
+        })
 
     useEffect(() => {
-        fetch("http://localhost:8000/jobs")
-            .then(res => res.json())
-            .then(data => {
-                setJobs(data)
-                setLoading(false)
-            })
-            .catch(() => {
-                setLoading(false)
+        loadFirstPage()
+            .catch(() => {})
+            .finally(() => setLoading(false))
+    }, [])
+
+    // Apply changes from the server as they happen instead of refetching the list.
+    // EventSource reconnects by itself and sends Last-Event-ID, so missed events are replayed.
+    useEffect(() => {
+        const source = new EventSource("http://localhost:8000/jobs/events")
+
+        const upsert = (job: Job, insert: boolean) =>
+            setJobs(prev => {
+                if (prev.some(j => j.id === job.id)) {
+                    return prev.map(j => (j.id === job.id ? job : j))
+                }
+                // New jobs sort last (by id); show them only once the last page is loaded
+                return insert && nextCursorRef.current === null ? [...prev, job] : prev
             })
+
+        const apply = async (e: MessageEvent) => {
+            const event: JobEvent = JSON.parse(e.data)
+            if (event.op === "delete") {
+                setJobs(prev => prev.filter(j => j.id !== event.id))
+                return
+            }
+            const job = event.job ?? (await fetchJob(event.id))
+            if (job) upsert(job, event.op === "insert")
+        }
+
+        source.addEventListener("insert", apply)
+        source.addEventListener("update", apply)
+        source.addEventListener("delete", apply)
+        // Sent when the server can't replay what we missed
+        source.addEventListener("reset", () => {
+            loadFirstPage().catch(() => {})
+        })
+        return () => source.close()
     }, [])
 
     if (loading) return <p>Loading jobs...</p>
 
 
+    const loadMore = async () => {
+        if (!nextCursor) return
+        const page = await fetchJobPage(nextCursor)
+        setJobs(prev => [...prev, ...page.items])
+        setNextCursor(page.next_cursor)
+    }
+
     const handleDelete = async (id: string) => {
         await fetch(`http://localhost:8000/jobs/${id}`, {
             method: "DELETE",
         })
 
-        const res = await fetch("http://localhost:8000/jobs")
-        const data = await res.json()
-        setJobs(data)
+        // The delete event would remove the row too; don't wait for it
+        setJobs(prev => prev.filter(j => j.id !== id))
     }
 
 
 
     return (
+        <>
         <table border={1} cellPadding={8} cellSpacing={0}>
             <thead>
                 <tr>
@@ -59,10 +130,8 @@ export default function JobTable() {
                             <StatusDropdown
                                 jobId={job.id}
                                 currentStatus={job.status}
-                                onStatusChange={() => {
-                                    fetch("http://localhost:8000/jobs")
-                                        .then(res => res.json())
-                                        .then(setJobs)
+                                onStatusChange={status => {
+                                    setJobs(prev => prev.map(j => (j.id === job.id ? { ...j, status } : j)))
                                 }}
                             />
                         </td>
@@ -77,5 +146,11 @@ export default function JobTable() {
             </tbody>
 
         </table>
+        {nextCursor && (
+            <button onClick={loadMore}>
+                Load more
+            </button>
+        )}
+        </>
     )
 }
@@ -3,7 +3,7 @@ import { useState } from "react"
 interface Props {
   jobId: string
   currentStatus: string
-  onStatusChange: () => void
+  onStatusChange: (status: string) => void
 }
 
 export default function StatusDropdown({ jobId, currentStatus, onStatusChange }: Props) {
@@ -19,7 +19,7 @@ export default function StatusDropdown({ jobId, currentStatus, onStatusChange }:
       body: JSON.stringify({ status: newStatus }),
     })
 
-    onStatusChange()  // optional: refresh full table
+    onStatusChange(newStatus)
   }
 
   return (